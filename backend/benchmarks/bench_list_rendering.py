@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the /api/projects response path.
+Compares FastAPI's per-request validate-and-encode path against serving
+pre-rendered bytes from the rendered response cache.
+
+Run from backend/: python benchmarks/bench_list_rendering.py [num_projects]
+"""
+
+import sys
+import os
+import json
+import time
+from datetime import datetime
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from models import ProjectResponse
+from responses import render_json
+
+def make_projects(count: int) -> List[dict]:
+    """Build project documents shaped like the projects collection"""
+    return [
+        {
+            '_id': f"object-id-{i}",
+            'id': f"project-{i}",
+            'github_id': i,
+            'name': f"repo-{i}",
+            'description': "A Python project " * 5,
+            'language': 'Python',
+            'html_url': f"https://github.com/Kenan-Alnaser/repo-{i}",
+            'created_at': datetime(2024, 1, 1),
+            'updated_at': datetime(2025, 1, 1, 12, 30),
+            'stargazers_count': i % 50,
+            'forks_count': i % 7,
+            'topics': ['ai', 'python', 'cyberpunk'],
+            'is_featured': i % 3 == 0,
+            'content_hash': 'f' * 40,
+        }
+        for i in range(count)
+    ]
+
+def bench(label: str, func, iterations: int):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {iterations / elapsed:>10.0f} req/s  {elapsed / iterations * 1e6:>9.1f} us/req")
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    iterations = max(10, 20000 // count)
+    projects = make_projects(count)
+    adapter = TypeAdapter(List[ProjectResponse])
+
+    def validate_and_encode():
+        # Equivalent of response_model=List[ProjectResponse] on every request
+        validated = adapter.validate_python(projects)
+        json.dumps(jsonable_encoder(validated)).encode('utf-8')
+
+    rendered = render_json(projects, ProjectResponse)
+
+    print(f"Rendering {count} projects ({len(rendered)} bytes)")
+    bench("pydantic validate + encode", validate_and_encode, iterations)
+    bench("render_json (per version)", lambda: render_json(projects, ProjectResponse), iterations)
+    bench("cached bytes (cache hit)", lambda: bytes(rendered), iterations)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the project ranking pass.
+Compares scoring projects one at a time in Python, as the per-repo
+featured check did, against the vectorized RankingEngine.
+
+Run from backend/: python benchmarks/bench_ranking.py [num_projects]
+"""
+
+import sys
+import os
+import math
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.ranking import RankingEngine
+
+WORDS = ['neural', 'cyberpunk', 'portfolio', 'renderer', 'compiler', 'dashboard', 'scraper',
+         'shader', 'toolkit', 'realtime', 'vision', 'agent', 'terminal', 'synth', 'email']
+TOPICS = ['ai', 'quantum', 'web', 'cli', 'machine-learning', 'games', 'blockchain', 'tools']
+
+def make_projects(count: int) -> List[dict]:
+    """Build project documents shaped like the projects collection"""
+    now = datetime(2025, 7, 1)
+    return [
+        {
+            'github_id': i,
+            'name': f"{WORDS[i % len(WORDS)]}-{WORDS[(i * 7) % len(WORDS)]}-{i}",
+            'stargazers_count': (i * 37) % 2000,
+            'forks_count': (i * 13) % 150,
+            'topics': [TOPICS[(i * 3) % len(TOPICS)], TOPICS[(i * 5) % len(TOPICS)]],
+            'updated_at': now - timedelta(hours=i * 7 % 20000),
+        }
+        for i in range(count)
+    ]
+
+def rank_per_project(engine: RankingEngine, projects: List[dict]):
+    """The same scores and featured set, computed one project at a time"""
+    newest = max(p['updated_at'] for p in projects)
+    weights = engine.weights.tolist()
+    scores = []
+    for p in projects:
+        age_days = (newest - p['updated_at']).total_seconds() / 86400
+        matches = sum(1 for topic in p['topics'] if topic.lower() in engine.topics)
+        signals = [
+            min(math.log1p(p['stargazers_count']) / math.log1p(engine.stars_saturation), 1.0),
+            min(math.log1p(p['forks_count']) / math.log1p(engine.forks_saturation), 1.0),
+            2 ** (-age_days / engine.recency_half_life_days),
+            min(matches / engine.topic_saturation, 1.0),
+            1.0 if engine.name_pattern.search(p['name']) else 0.0,
+        ]
+        scores.append(round(sum(w * s for w, s in zip(weights, signals)), 6))
+    top = sorted(range(len(projects)), key=lambda i: -scores[i])[:engine.featured_count]
+    featured = [False] * len(projects)
+    for i in top:
+        featured[i] = scores[i] > engine.featured_min_score
+    return scores, featured
+
+def bench(label: str, func, iterations: int):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed / iterations * 1000:>9.2f} ms/pass")
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    iterations = max(5, 200000 // count)
+    projects = make_projects(count)
+    engine = RankingEngine()
+
+    scores, featured = engine.rank(projects)
+    expected_scores, expected_featured = rank_per_project(engine, projects)
+    assert max(abs(a - b) for a, b in zip(scores.tolist(), expected_scores)) < 1e-5
+    assert featured.sum() == sum(expected_featured)
+
+    print(f"Ranking {count} projects")
+    bench("per-project Python", lambda: rank_per_project(engine, projects), iterations)
+    bench("vectorized engine", lambda: engine.rank(projects), iterations)
+
+if __name__ == "__main__":
+    main()
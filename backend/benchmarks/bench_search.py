@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark for /api/search.
+Compares a regex scan over every project, as a $regex query would do,
+against the inverted index, and times incremental updates.
+
+Run from backend/: python benchmarks/bench_search.py [num_projects]
+"""
+
+import sys
+import os
+import re
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search import InvertedIndex, tokenize
+
+WORDS = ['neural', 'cyberpunk', 'portfolio', 'renderer', 'compiler', 'dashboard', 'scraper',
+         'shader', 'toolkit', 'realtime', 'vision', 'agent', 'terminal', 'synth', 'graph']
+LANGUAGES = ['Python', 'JavaScript', 'TypeScript', 'Rust', 'Go', 'C++']
+
+def make_projects(count: int) -> List[dict]:
+    """Build project documents shaped like the projects collection"""
+    return [
+        {
+            'id': f"project-{i}",
+            'github_id': i,
+            'name': f"{WORDS[i % len(WORDS)]}-{WORDS[(i * 7) % len(WORDS)]}-{i}",
+            'description': f"A {WORDS[(i * 3) % len(WORDS)]} for {WORDS[(i * 5) % len(WORDS)]} work",
+            'language': LANGUAGES[i % len(LANGUAGES)],
+            'html_url': f"https://github.com/Kenan-Alnaser/repo-{i}",
+            'topics': [WORDS[(i * 11) % len(WORDS)], 'ai'],
+        }
+        for i in range(count)
+    ]
+
+def bench(label: str, func, iterations: int):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {iterations / elapsed:>10.0f} q/s  {elapsed / iterations * 1e6:>9.1f} us/q")
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    iterations = max(20, 200000 // count)
+    projects = make_projects(count)
+
+    start = time.perf_counter()
+    index = InvertedIndex('projects', version=0)
+    for project in projects:
+        index.put(project)
+    print(f"Indexed {count} projects ({len(index.terms)} terms) in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    def regex_scan(query: str):
+        pattern = re.compile(re.escape(query), re.IGNORECASE)
+        return [
+            p for p in projects
+            if pattern.search(p['name']) or pattern.search(p['description'] or '')
+            or any(pattern.search(t) for t in p['topics'])
+        ][:10]
+
+    for query in ['ren', 'neural shad', 'python vision']:
+        print(f"\nquery {query!r}")
+        bench("regex scan", lambda: regex_scan(query), iterations)
+        bench("inverted index", lambda: index.search(tokenize(query), 10), iterations * 10)
+
+    updates = projects[:100]
+    print()
+    bench("re-index 100 changed projects", lambda: [index.put(p) for p in updates], iterations)
+
+if __name__ == "__main__":
+    main()
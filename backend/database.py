@@ -1,50 +1,127 @@
-from motor.motor_asyncio import AsyncIOMotorClient
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator, Callable, Tuple
 import os
+import uuid
+import asyncio
+import json
+import socket
+import time
+import hashlib
 import logging
 from datetime import datetime, timedelta
+from cache import cache
+from search import search_index
+from storage import Storage, create_storage
 
 logger = logging.getLogger(__name__)
 
+# Identifies this worker process as the owner of cross-worker lock documents
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+# Read-cache TTLs in seconds; write paths invalidate the affected keys
+PROFILE_CACHE_TTL = float(os.environ.get('PROFILE_CACHE_TTL', 300))
+SOCIAL_LINKS_CACHE_TTL = float(os.environ.get('SOCIAL_LINKS_CACHE_TTL', 300))
+PROJECTS_CACHE_TTL = float(os.environ.get('PROJECTS_CACHE_TTL', 60))
+VIDEOS_CACHE_TTL = float(os.environ.get('VIDEOS_CACHE_TTL', 60))
+# How long a worker trusts its copy of a data version written by other workers
+DATA_VERSION_CACHE_TTL = float(os.environ.get('DATA_VERSION_CACHE_TTL', 5))
+SYNC_METADATA_CACHE_TTL = float(os.environ.get('SYNC_METADATA_CACHE_TTL', 5))
+STATS_CACHE_TTL = float(os.environ.get('STATS_CACHE_TTL', 10))
+
+# An active sync job whose owner stopped heartbeating for this long is abandoned
+SYNC_JOB_STALE_SECONDS = int(os.environ.get('SYNC_JOB_STALE_SECONDS', 600))
+
+# Counters kept in the stats document, per collection: counter name -> filter
+COUNTERS = {
+    'projects': {'projects': {}, 'featured_projects': {'is_featured': True}},
+    'videos': {'videos': {}, 'featured_videos': {'is_featured': True}},
+    'social_links': {'social_links': {'is_active': True}},
+}
+
+# Project fields counted per value in the facet summary, and the min_stars steps counted
+PROJECT_FACETS = ('language', 'topics')
+STAR_THRESHOLDS = (1, 10, 50, 100, 500, 1000)
+
+# Fields that change on every sync without the content changing
+VOLATILE_FIELDS = ('_id', 'id', 'content_hash')
+# Fields set by the ranking pass: a sync writes them on insert only and they are not content
+RANKED_FIELDS = {'projects': ('score', 'is_featured')}
+
+def content_fingerprint(document: Dict[str, Any], ignored: Tuple[str, ...] = ()) -> str:
+    """Stable hash of a synced document's content, ignoring volatile and the given fields"""
+    content = {k: v for k, v in document.items() if k not in VOLATILE_FIELDS and k not in ignored}
+    encoded = json.dumps(content, sort_keys=True, default=str)
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+# Keyset sort orders; the trailing unique key makes every position distinct
+PROJECTS_SORT = [('updated_at', -1), ('github_id', -1)]
+PROJECT_SORTS = {'updated': PROJECTS_SORT, 'score': [('score', -1), ('github_id', -1)]}
+VIDEOS_SORT = [('published_at', -1), ('youtube_id', -1)]
+
+def _match_key(match: Dict[str, Any]) -> str:
+    """Stable cache key part of a find match"""
+    return json.dumps(match, sort_keys=True, default=str)
+
+def _facet_list(counts: Dict[Any, int]) -> List[Dict[str, Any]]:
+    """Facet values with their counts, most common first"""
+    ordered = sorted(counts.items(), key=lambda item: (-item[1], str(item[0])))
+    return [{'value': value, 'count': count} for value, count in ordered]
+
+def _fields_key(fields: Optional[List[str]]) -> str:
+    return ','.join(fields) if fields else '*'
+
 class Database:
-    client: Optional[AsyncIOMotorClient] = None
-    database = None
+    """Application data access: read caching, data versions and counters over a storage engine"""
+    storage: Optional[Storage] = None
 
-    async def connect_to_mongo(self):
-        """Create database connection"""
+    async def connect(self):
+        """Open the storage engine selected by STORAGE_ENGINE"""
         try:
-            self.client = AsyncIOMotorClient(os.environ['MONGO_URL'])
-            self.database = self.client[os.environ['DB_NAME']]
-            
-            # Test connection
-            await self.client.admin.command('ping')
-            logger.info("Successfully connected to MongoDB")
+            self.storage = create_storage()
+            await self.storage.connect()
+            logger.info(f"Successfully connected to {self.storage.name} storage")
             
         except Exception as e:
-            logger.error(f"Error connecting to MongoDB: {str(e)}")
+            logger.error(f"Error connecting to storage: {str(e)}")
             raise
 
-    async def close_mongo_connection(self):
-        """Close database connection"""
-        if self.client:
-            self.client.close()
-            logger.info("MongoDB connection closed")
+    async def ping(self) -> float:
+        """Ping the storage engine, returning the round trip in milliseconds"""
+        start = time.perf_counter()
+        await self.storage.ping()
+        return (time.perf_counter() - start) * 1000
+
+    async def close(self):
+        """Close the storage engine"""
+        if self.storage:
+            await self.storage.close()
+            logger.info(f"{self.storage.name} storage closed")
+
+    async def ensure_indexes(self) -> Dict[str, Dict[str, List[str]]]:
+        """Create missing indexes and rebuild drifted ones"""
+        return await self.storage.ensure_indexes()
+
+    async def explain_query_shapes(self) -> List[Dict[str, Any]]:
+        """Explain each registered query shape and flag collection scans"""
+        return await self.storage.explain_query_shapes()
 
     # Profile operations
     async def get_profile(self) -> Optional[Dict[str, Any]]:
         """Get user profile"""
         try:
-            profile = await self.database.profiles.find_one()
-            return profile
+            version = await self.get_data_version('profile')
+            return await cache.get_or_load(
+                f"profile:v{version['version']}", self.storage.get_profile, PROFILE_CACHE_TTL
+            )
         except Exception as e:
             logger.error(f"Error fetching profile: {str(e)}")
-            return None
+            raise
 
     async def create_profile(self, profile_data: Dict[str, Any]) -> str:
         """Create user profile"""
         try:
-            result = await self.database.profiles.insert_one(profile_data)
-            return str(result.inserted_id)
+            profile_id = await self.storage.insert_profile(profile_data)
+            await self._bump_data_version('profile')
+            return profile_id
         except Exception as e:
             logger.error(f"Error creating profile: {str(e)}")
             raise
@@ -53,82 +130,140 @@ class Database:
         """Update user profile"""
         try:
             profile_data['updated_at'] = datetime.utcnow()
-            result = await self.database.profiles.replace_one(
-                {}, profile_data, upsert=True
-            )
-            return result.modified_count > 0 or result.upserted_id is not None
+            updated = await self.storage.replace_profile(profile_data)
+            await self._bump_data_version('profile')
+            return updated
         except Exception as e:
             logger.error(f"Error updating profile: {str(e)}")
             return False
 
     # Project operations
-    async def get_projects(self, featured_only: bool = False) -> List[Dict[str, Any]]:
-        """Get projects from database"""
+    async def get_projects(self, featured_only: bool = False,
+                           fields: Optional[List[str]] = None, limit: Optional[int] = None,
+                           after: Optional[List[Any]] = None,
+                           filters: Optional[Dict[str, Any]] = None,
+                           sort: str = 'updated') -> List[Dict[str, Any]]:
+        """Get projects from database, optionally only the given fields
+
+        limit and after select one keyset page; after holds the sort-key
+        values of the last project on the previous page. filters is a
+        storage match on language, topics, stargazers_count or is_featured;
+        sort names one of PROJECT_SORTS.
+        """
         try:
-            query = {}
+            match = dict(filters or {})
             if featured_only:
-                query['is_featured'] = True
-                
-            cursor = self.database.projects.find(query).sort('updated_at', -1)
-            projects = await cursor.to_list(length=None)
-            return projects
+                match['is_featured'] = True
+
+            async def load():
+                return await self.storage.find_items('projects', PROJECT_SORTS[sort], match, fields, limit, after)
+
+            version = await self.get_data_version('projects')
+            return await cache.get_or_load(
+                f"projects:v{version['version']}:sort={sort}:match={_match_key(match)}:fields={_fields_key(fields)}"
+                f":limit={limit}:after={after}",
+                load, PROJECTS_CACHE_TTL
+            )
         except Exception as e:
             logger.error(f"Error fetching projects: {str(e)}")
-            return []
-
-    async def upsert_projects(self, projects: List[Dict[str, Any]]) -> int:
-        """Insert or update projects"""
-        try:
-            if not projects:
-                return 0
-                
-            from pymongo import UpdateOne
-            operations = []
-            for project in projects:
-                operations.append(
-                    UpdateOne(
-                        {'github_id': project['github_id']},
-                        {'$set': project},
-                        upsert=True
-                    )
-                )
-            
-            if operations:
-                result = await self.database.projects.bulk_write(operations)
-                return result.upserted_count + result.modified_count
-            return 0
+            raise
+
+    async def rank_projects(self, rank: Callable[[List[Dict[str, Any]]], Tuple[Any, Any]]) -> int:
+        """Score every stored project in one batch, writing the ones whose score or featured flag moved
+
+        rank returns the scores and featured flags in input order. The
+        content hash is kept, so ranking never counts as a content change
+        to the next sync. Returns the number of projects rewritten. Like
+        the upserts, it leaves the summaries to refresh_summaries.
+        """
+        try:
+            projects = [project async for project in self.iter_collection('projects', PROJECTS_SORT)]
+            scores, featured = rank(projects)
+            changed = [
+                {**project, 'score': score, 'is_featured': is_featured}
+                for project, score, is_featured in zip(projects, scores.tolist(), featured.tolist())
+                if project.get('score') != score or project.get('is_featured') != is_featured
+            ]
+            if changed:
+                version = await self.get_data_version('projects')
+                await self.storage.upsert_items('projects', changed)
+                await self._record_change('projects', summarize=False)
+                search_index.apply('projects', changed, version['version'])
+            return len(changed)
         except Exception as e:
-            logger.error(f"Error upserting projects: {str(e)}")
+            logger.error(f"Error ranking projects: {str(e)}")
             return 0
 
-    async def get_project_cache_age(self) -> Optional[datetime]:
-        """Get the age of the most recent project cache"""
+    async def get_project_facets(self) -> Dict[str, Any]:
+        """Get the project facet summary computed at the last write"""
+        async def load():
+            facets = await self.storage.get_document('stats', 'project_facets')
+            if facets is None:
+                # Projects written before the summary existed
+                facets = await self._refresh_facets()
+            facets.pop('_id', None)
+            return facets
+
+        version = await self.get_data_version('projects')
+        return await cache.get_or_load(f"projects:facets:v{version['version']}", load, STATS_CACHE_TTL)
+
+    async def _refresh_facets(self) -> Dict[str, Any]:
+        """Recount the project facets and store them as one summary document"""
+        total, featured, stars, *counts = await asyncio.gather(
+            self.storage.count('projects', {}),
+            self.storage.count('projects', {'is_featured': True}),
+            self.storage.facet_counts('projects', 'stargazers_count'),
+            *(self.storage.facet_counts('projects', field) for field in PROJECT_FACETS)
+        )
+        facets = {
+            'total': total,
+            'featured': featured,
+            **{field: _facet_list(values) for field, values in zip(PROJECT_FACETS, counts)},
+            'min_stars': [
+                {'value': threshold, 'count': sum(n for value, n in stars.items() if value >= threshold)}
+                for threshold in STAR_THRESHOLDS
+            ],
+            'computed_at': datetime.utcnow()
+        }
+        await self.storage.set_fields('stats', 'project_facets', facets)
+        return facets
+
+    async def upsert_projects(self, projects: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Insert or update projects whose content changed
+
+        Called once per fetched page, so it leaves counters and facets to
+        refresh_summaries once the sync is done.
+        """
         try:
-            latest_project = await self.database.projects.find_one(
-                sort=[('cached_at', -1)]
-            )
-            return latest_project.get('cached_at') if latest_project else None
+            version = await self.get_data_version('projects')
+            stats, written = await self._delta_upsert('projects', 'github_id', projects)
+            if written:
+                await self._record_change('projects', summarize=False)
+                search_index.apply('projects', written, version['version'])
+            return stats
         except Exception as e:
-            logger.error(f"Error getting cache age: {str(e)}")
-            return None
+            logger.error(f"Error upserting projects: {str(e)}")
+            raise
 
     # Social links operations
     async def get_social_links(self) -> List[Dict[str, Any]]:
         """Get social links"""
         try:
-            cursor = self.database.social_links.find(
-                {'is_active': True}
-            ).sort('order', 1)
-            return await cursor.to_list(length=None)
+            version = await self.get_data_version('social_links')
+            return await cache.get_or_load(
+                f"social_links:v{version['version']}", self.storage.get_active_social_links,
+                SOCIAL_LINKS_CACHE_TTL
+            )
         except Exception as e:
             logger.error(f"Error fetching social links: {str(e)}")
-            return []
+            raise
 
     async def create_social_link(self, link_data: Dict[str, Any]) -> str:
         """Create social link"""
         try:
-            result = await self.database.social_links.insert_one(link_data)
-            return str(result.inserted_id)
+            link_id = await self.storage.insert_social_link(link_data)
+            await self._record_change('social_links')
+            return link_id
         except Exception as e:
             logger.error(f"Error creating social link: {str(e)}")
             raise
@@ -136,81 +271,301 @@ class Database:
     async def update_social_link(self, link_id: str, link_data: Dict[str, Any]) -> bool:
         """Update social link"""
         try:
-            result = await self.database.social_links.update_one(
-                {'id': link_id}, {'$set': link_data}
-            )
-            return result.modified_count > 0
+            updated = await self.storage.update_social_link(link_id, link_data)
+            await self._record_change('social_links')
+            return updated
         except Exception as e:
             logger.error(f"Error updating social link: {str(e)}")
             return False
 
     # Video operations
-    async def get_videos(self, featured_only: bool = False) -> List[Dict[str, Any]]:
-        """Get videos from database"""
+    async def get_videos(self, featured_only: bool = False,
+                         fields: Optional[List[str]] = None, limit: Optional[int] = None,
+                         after: Optional[List[Any]] = None) -> List[Dict[str, Any]]:
+        """Get videos from database, optionally only the given fields
+
+        limit and after select one keyset page; after holds the sort-key
+        values of the last video on the previous page.
+        """
         try:
-            query = {}
-            if featured_only:
-                query['is_featured'] = True
-                
-            cursor = self.database.videos.find(query).sort('published_at', -1)
-            return await cursor.to_list(length=None)
+            match = {'is_featured': True} if featured_only else {}
+
+            async def load():
+                return await self.storage.find_items('videos', VIDEOS_SORT, match, fields, limit, after)
+
+            version = await self.get_data_version('videos')
+            return await cache.get_or_load(
+                f"videos:v{version['version']}:featured={featured_only}:fields={_fields_key(fields)}"
+                f":limit={limit}:after={after}",
+                load, VIDEOS_CACHE_TTL
+            )
         except Exception as e:
             logger.error(f"Error fetching videos: {str(e)}")
-            return []
-
-    async def upsert_videos(self, videos: List[Dict[str, Any]]) -> int:
-        """Insert or update videos"""
-        try:
-            if not videos:
-                return 0
-                
-            from pymongo import UpdateOne
-            operations = []
-            for video in videos:
-                operations.append(
-                    UpdateOne(
-                        {'youtube_id': video['youtube_id']},
-                        {'$set': video},
-                        upsert=True
-                    )
-                )
-            
-            if operations:
-                result = await self.database.videos.bulk_write(operations)
-                return result.upserted_count + result.modified_count
-            return 0
+            raise
+
+    async def upsert_videos(self, videos: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Insert or update videos whose content changed, leaving counters to refresh_summaries"""
+        try:
+            version = await self.get_data_version('videos')
+            stats, written = await self._delta_upsert('videos', 'youtube_id', videos)
+            if written:
+                await self._record_change('videos', summarize=False)
+                search_index.apply('videos', written, version['version'])
+            return stats
         except Exception as e:
             logger.error(f"Error upserting videos: {str(e)}")
-            return 0
+            raise
 
-    # Utility functions
-    async def should_sync_projects(self, max_age_hours: int = 6) -> bool:
-        """Check if projects need to be synced"""
+    async def _delta_upsert(self, collection: str, key: str,
+                            items: List[Dict[str, Any]]) -> Tuple[Dict[str, int], List[Dict[str, Any]]]:
+        """Write only the items whose content fingerprint differs from the stored one
+
+        Ranked fields keep their stored values, so a sync never undoes the
+        last ranking pass. Returns the counts and the documents written.
+        """
+        stats = {'inserted': 0, 'changed': 0, 'unchanged': 0}
+        if not items:
+            return stats, []
+        
+        stored_hashes = await self.storage.get_content_hashes(collection, [item[key] for item in items])
+        ranked = RANKED_FIELDS.get(collection, ())
+        
+        documents = []
+        for item in items:
+            content_hash = content_fingerprint(item, ranked)
+            if item[key] in stored_hashes:
+                if stored_hashes[item[key]] == content_hash:
+                    stats['unchanged'] += 1
+                    continue
+                stats['changed'] += 1
+            else:
+                stats['inserted'] += 1
+            
+            document = {k: v for k, v in item.items() if k not in VOLATILE_FIELDS}
+            document['content_hash'] = content_hash
+            # Only used on insert: the public id stays stable across syncs
+            document['id'] = item.get('id') or str(uuid.uuid4())
+            documents.append(document)
+        
+        if documents:
+            await self.storage.upsert_items(collection, documents, keep=ranked)
+        return stats, documents
+
+    # Export operations
+    async def iter_collection(self, name: str, sort: List[tuple],
+                              batch_size: int = 500) -> AsyncIterator[Dict[str, Any]]:
+        """Stream every document of a collection without buffering it, bypassing the read cache"""
+        async for document in self.storage.iter_items(name, sort, batch_size):
+            yield document
+
+    # Data version operations
+    async def get_data_version(self, resource: str) -> Dict[str, Any]:
+        """Get the version counter and modification time of a resource"""
+        async def load():
+            document = await self.storage.get_document('data_versions', resource)
+            return document or {'_id': resource, 'version': 0, 'modified_at': None}
+
+        return await cache.get_or_load(f"version:{resource}", load, DATA_VERSION_CACHE_TTL)
+
+    async def _bump_data_version(self, resource: str) -> None:
+        """Record that a resource changed; called after the write succeeded"""
         try:
-            cache_age = await self.get_project_cache_age()
-            if not cache_age:
-                return True
-                
-            max_age = datetime.utcnow() - timedelta(hours=max_age_hours)
-            return cache_age < max_age
+            await self.storage.increment(
+                'data_versions', resource, 'version', {'modified_at': datetime.utcnow()}
+            )
         except Exception as e:
-            logger.error(f"Error checking sync status: {str(e)}")
+            logger.error(f"Error bumping data version of {resource}: {str(e)}")
+        finally:
+            cache.invalidate(f"{resource}:")
+            cache.invalidate(f"version:{resource}")
+
+    # Sync metadata operations
+    async def get_sync_metadata(self, source: str) -> Optional[Dict[str, Any]]:
+        """Get the sync metadata document of a data source"""
+        try:
+            return await cache.get_or_load(
+                f"sync_metadata:{source}",
+                lambda: self.storage.get_document('sync_metadata', source),
+                SYNC_METADATA_CACHE_TTL
+            )
+        except Exception as e:
+            logger.error(f"Error fetching sync metadata for {source}: {str(e)}")
+            return None
+
+    async def mark_synced(self, source: str, **fields) -> None:
+        """Record a successful sync of a data source"""
+        await self.update_sync_metadata(source, last_synced_at=datetime.utcnow(), **fields)
+
+    async def update_sync_metadata(self, source: str, **fields) -> None:
+        """Set fields on the sync metadata document of a data source"""
+        try:
+            await self.storage.set_fields('sync_metadata', source, fields)
+            cache.invalidate(f"sync_metadata:{source}")
+        except Exception as e:
+            logger.error(f"Error updating {source} sync metadata: {str(e)}")
+
+    # Utility functions
+    @staticmethod
+    def is_cache_stale(metadata: Optional[Dict[str, Any]]) -> bool:
+        """Check whether a source was never synced or is past its next scheduled sync"""
+        if not metadata or not metadata.get('last_synced_at'):
             return True
+        # Metadata written before adaptive intervals has no next_sync_at
+        next_sync_at = metadata.get('next_sync_at') or metadata['last_synced_at'] + timedelta(hours=6)
+        return next_sync_at < datetime.utcnow()
 
-    async def get_stats(self) -> Dict[str, int]:
-        """Get database statistics"""
-        try:
-            stats = {
-                'projects': await self.database.projects.count_documents({}),
-                'social_links': await self.database.social_links.count_documents({'is_active': True}),
-                'videos': await self.database.videos.count_documents({}),
-                'featured_projects': await self.database.projects.count_documents({'is_featured': True}),
-                'featured_videos': await self.database.videos.count_documents({'is_featured': True})
+    # Lock operations
+    async def acquire_lock(self, name: str, ttl_seconds: int = 300) -> bool:
+        """Acquire a named lock shared by all workers, expiring after ttl_seconds"""
+        now = datetime.utcnow()
+        try:
+            return await self.storage.acquire_lock(
+                name, INSTANCE_ID, now, now + timedelta(seconds=ttl_seconds)
+            )
+        except Exception as e:
+            logger.error(f"Error acquiring lock {name}: {str(e)}")
+            return False
+
+    async def release_lock(self, name: str) -> None:
+        """Release a named lock held by this worker"""
+        try:
+            await self.storage.release_lock(name, INSTANCE_ID)
+        except Exception as e:
+            logger.error(f"Error releasing lock {name}: {str(e)}")
+
+    # Rate limit operations
+    async def get_rate_limit(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get the shared rate limit budget of an upstream API"""
+        return await self.storage.get_document('rate_limits', name)
+
+    async def reserve_rate_limit(self, name: str, reserve: int) -> Optional[Dict[str, Any]]:
+        """Take one call from a budget that has more than reserve calls left
+
+        Returns the budget before the call was taken, or None if nothing was
+        taken (unknown, exhausted or blocked budget).
+        """
+        return await self.storage.reserve_rate_limit(name, reserve, datetime.utcnow())
+
+    async def update_rate_limit(self, name: str, **fields) -> None:
+        """Store what the upstream API reported about its rate limit"""
+        await self.storage.set_fields('rate_limits', name, {**fields, 'updated_at': datetime.utcnow()})
+
+    # Sync job operations
+    async def create_sync_job(self, source: str) -> Tuple[Dict[str, Any], bool]:
+        """Start a job for a source, or return the job already active for it
+
+        Returns (job, created). The engine rejects a second active job per
+        source, so the insert fails when another worker won the race.
+        """
+        for _ in range(3):
+            existing = await self.storage.find_active_job(source)
+            if existing:
+                stale_before = datetime.utcnow() - timedelta(seconds=SYNC_JOB_STALE_SECONDS)
+                if existing['heartbeat_at'] >= stale_before:
+                    return existing, False
+                await self.finish_sync_job(existing['_id'], 'failed', error="Abandoned by its worker")
+            
+            now = datetime.utcnow()
+            job = {
+                '_id': str(uuid.uuid4()),
+                'source': source,
+                'status': 'running',
+                'active': True,
+                'owner': INSTANCE_ID,
+                'progress': {},
+                'result': {},
+                'error': None,
+                'created_at': now,
+                'started_at': now,
+                'heartbeat_at': now
             }
-            return stats
+            if await self.storage.insert_job(job):
+                return job, True
+        raise RuntimeError(f"Could not create or attach to a {source} sync job")
+
+    async def update_sync_job(self, job_id: str, **fields) -> None:
+        """Record progress on a running job, which also refreshes its heartbeat"""
+        try:
+            await self.storage.update_job(job_id, {**fields, 'heartbeat_at': datetime.utcnow()})
+        except Exception as e:
+            logger.error(f"Error updating sync job {job_id}: {str(e)}")
+
+    async def finish_sync_job(self, job_id: str, status: str, result: Optional[Dict[str, Any]] = None,
+                              error: Optional[str] = None) -> None:
+        """Mark a job finished and release its source for the next job"""
+        now = datetime.utcnow()
+        job = await self.storage.get_job(job_id)
+        duration_ms = (now - job['started_at']).total_seconds() * 1000 if job else None
+        await self.storage.finish_job(job_id, {
+            'status': status,
+            'result': result or {},
+            'error': error,
+            'finished_at': now,
+            'heartbeat_at': now,
+            'duration_ms': round(duration_ms, 1) if duration_ms is not None else None
+        })
+
+    async def get_sync_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a sync job by id"""
+        try:
+            return await self.storage.get_job(job_id)
+        except Exception as e:
+            logger.error(f"Error fetching sync job {job_id}: {str(e)}")
+            return None
+
+    async def get_stats(self) -> Dict[str, int]:
+        """Get database statistics from the counters document"""
+        async def load():
+            counters = await self.storage.get_document('stats', 'counters') or {}
+            counters.pop('_id', None)
+            # On a fresh database, or after a write refreshed only its own
+            # collection, count the collections never counted yet
+            missing = [c for c, names in COUNTERS.items() if not set(names) <= set(counters)]
+            if missing:
+                counters.update(await self._refresh_counters(*missing))
+            return counters
+
+        try:
+            return await cache.get_or_load('stats', load, STATS_CACHE_TTL)
         except Exception as e:
             logger.error(f"Error getting stats: {str(e)}")
             return {}
 
+    async def _refresh_counters(self, *collections: str) -> Dict[str, int]:
+        """Recount the given collections concurrently and store the result"""
+        names, counts = [], []
+        for collection in collections:
+            for name, query in COUNTERS[collection].items():
+                names.append(name)
+                counts.append(self.storage.count(collection, query))
+        counters = dict(zip(names, await asyncio.gather(*counts)))
+        await self.storage.set_fields('stats', 'counters', counters)
+        cache.invalidate('stats')
+        return counters
+
+    async def refresh_summaries(self, resource: str) -> None:
+        """Recount a resource's counters and facets once a batch of writes is done"""
+        if resource == 'projects':
+            try:
+                await self._refresh_facets()
+            except Exception as e:
+                logger.error(f"Error refreshing project facets: {str(e)}")
+            finally:
+                cache.invalidate('projects:facets:')
+        try:
+            await self._refresh_counters(resource)
+        except Exception as e:
+            logger.error(f"Error refreshing {resource} counters: {str(e)}")
+
+    async def _record_change(self, resource: str, summarize: bool = True) -> None:
+        """Bump a resource's data version after a write, refreshing its summaries unless deferred
+
+        Sync writes defer: they store a page at a time, and recounting after
+        every page would rerun the count and facet queries per page.
+        """
+        await self._bump_data_version(resource)
+        if summarize:
+            await self.refresh_summaries(resource)
+
 # Global database instance
 database = Database()
\ No newline at end of file
@@ -0,0 +1,62 @@
+from fastapi import Request, Response
+from email.utils import format_datetime, parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Union
+import hashlib
+
+# Cache-Control policies per resource
+CACHE_CONTROL = {
+    'profile': 'public, max-age=300, stale-while-revalidate=3600',
+    'social_links': 'public, max-age=300, stale-while-revalidate=3600',
+    'projects': 'public, max-age=60, stale-while-revalidate=600',
+    'videos': 'public, max-age=60, stale-while-revalidate=600',
+    'bootstrap': 'public, max-age=60, stale-while-revalidate=600',
+}
+
+def make_etag(resource: str, version: Union[int, str], variant: str = "") -> str:
+    """Strong ETag for one representation of a resource at a data version"""
+    digest = hashlib.sha1(f"{resource}:{version}:{variant}".encode('utf-8')).hexdigest()
+    return f'"{digest[:20]}"'
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == '*':
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    # If-None-Match uses weak comparison
+    return any(tag.removeprefix('W/') == etag for tag in candidates)
+
+def _not_modified_since(if_modified_since: str, modified_at: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return modified_at.replace(microsecond=0) <= since
+
+def check_not_modified(request: Request, response: Response, resource: str,
+                       data_version: Dict[str, Any], variant: str = "") -> Optional[Response]:
+    """Set validator headers, returning a 304 response if the client copy is current"""
+    headers = {
+        'ETag': make_etag(resource, data_version['version'], variant),
+        'Cache-Control': CACHE_CONTROL.get(resource, 'no-cache')
+    }
+    modified_at = data_version.get('modified_at')
+    if modified_at is not None:
+        if modified_at.tzinfo is None:
+            modified_at = modified_at.replace(tzinfo=timezone.utc)
+        headers['Last-Modified'] = format_datetime(modified_at, usegmt=True)
+
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        # If-Modified-Since is ignored when If-None-Match is present
+        not_modified = _etag_matches(if_none_match, headers['ETag'])
+    else:
+        if_modified_since = request.headers.get('if-modified-since')
+        not_modified = bool(if_modified_since and modified_at
+                            and _not_modified_since(if_modified_since, modified_at))
+
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,172 @@
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from typing import Any, Dict, List
+from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Indexes declared per collection, reconciled at startup
+INDEXES: Dict[str, List[IndexModel]] = {
+    'projects': [
+        IndexModel([('github_id', ASCENDING)], name='github_id_unique', unique=True),
+        IndexModel([('id', ASCENDING)], name='id'),
+        IndexModel([('updated_at', DESCENDING), ('github_id', DESCENDING)], name='updated_at_github_id'),
+        IndexModel(
+            [('is_featured', ASCENDING), ('updated_at', DESCENDING), ('github_id', DESCENDING)],
+            name='is_featured_updated_at_github_id'
+        ),
+        # sort=score, alone and on the featured list
+        IndexModel([('score', DESCENDING), ('github_id', DESCENDING)], name='score_github_id'),
+        IndexModel(
+            [('is_featured', ASCENDING), ('score', DESCENDING), ('github_id', DESCENDING)],
+            name='is_featured_score_github_id'
+        ),
+        # Facet filters: equality, then the sort, then the min_stars range (ESR order)
+        IndexModel(
+            [('language', ASCENDING), ('updated_at', DESCENDING), ('github_id', DESCENDING),
+             ('stargazers_count', ASCENDING)],
+            name='language_updated_at_github_id_stargazers_count'
+        ),
+        IndexModel(
+            [('topics', ASCENDING), ('updated_at', DESCENDING), ('github_id', DESCENDING),
+             ('stargazers_count', ASCENDING)],
+            name='topics_updated_at_github_id_stargazers_count'
+        ),
+    ],
+    'videos': [
+        IndexModel([('youtube_id', ASCENDING)], name='youtube_id_unique', unique=True),
+        IndexModel([('id', ASCENDING)], name='id'),
+        IndexModel([('published_at', DESCENDING), ('youtube_id', DESCENDING)], name='published_at_youtube_id'),
+        IndexModel(
+            [('is_featured', ASCENDING), ('published_at', DESCENDING), ('youtube_id', DESCENDING)],
+            name='is_featured_published_at_youtube_id'
+        ),
+    ],
+    'sync_jobs': [
+        # At most one active job per source across all workers
+        IndexModel(
+            [('source', ASCENDING)], name='source_active_unique', unique=True,
+            partialFilterExpression={'active': True}
+        ),
+        IndexModel([('created_at', DESCENDING)], name='created_at'),
+    ],
+    'social_links': [
+        IndexModel([('id', ASCENDING)], name='id_unique', unique=True),
+        IndexModel([('is_active', ASCENDING), ('order', ASCENDING)], name='is_active_order'),
+    ],
+}
+
+# Indexes replaced by the ones above, dropped during reconciliation
+OBSOLETE_INDEXES: Dict[str, List[str]] = {
+    'projects': ['updated_at', 'is_featured_updated_at'],
+    'videos': ['published_at', 'is_featured_published_at'],
+}
+
+# Query shapes issued by the Database read and write paths: (name, collection, filter, sort)
+QUERY_SHAPES = [
+    ('projects.all', 'projects', {}, [('updated_at', DESCENDING), ('github_id', DESCENDING)]),
+    ('projects.featured', 'projects', {'is_featured': True}, [('updated_at', DESCENDING), ('github_id', DESCENDING)]),
+    ('projects.page', 'projects',
+     {'$or': [
+         {'updated_at': {'$lt': datetime(2100, 1, 1)}},
+         {'updated_at': datetime(2100, 1, 1), 'github_id': {'$lt': 0}}
+     ]},
+     [('updated_at', DESCENDING), ('github_id', DESCENDING)]),
+    ('projects.score', 'projects', {}, [('score', DESCENDING), ('github_id', DESCENDING)]),
+    ('projects.featured_score', 'projects', {'is_featured': True}, [('score', DESCENDING), ('github_id', DESCENDING)]),
+    ('projects.language', 'projects', {'language': '', 'stargazers_count': {'$gte': 0}},
+     [('updated_at', DESCENDING), ('github_id', DESCENDING)]),
+    ('projects.topic', 'projects', {'topics': '', 'stargazers_count': {'$gte': 0}},
+     [('updated_at', DESCENDING), ('github_id', DESCENDING)]),
+    ('projects.upsert', 'projects', {'github_id': 0}, None),
+    ('videos.all', 'videos', {}, [('published_at', DESCENDING), ('youtube_id', DESCENDING)]),
+    ('videos.featured', 'videos', {'is_featured': True}, [('published_at', DESCENDING), ('youtube_id', DESCENDING)]),
+    ('videos.upsert', 'videos', {'youtube_id': ''}, None),
+    ('social_links.active', 'social_links', {'is_active': True}, [('order', ASCENDING)]),
+    ('social_links.update', 'social_links', {'id': ''}, None),
+]
+
+# Options compared when deciding whether an existing index matches its declaration
+_COMPARED_OPTIONS = ('unique', 'sparse', 'expireAfterSeconds', 'partialFilterExpression')
+
+def _matches(existing: Dict[str, Any], declared: Dict[str, Any]) -> bool:
+    if list(existing['key']) != list(declared['key'].items()):
+        return False
+    return all(existing.get(option) == declared.get(option) for option in _COMPARED_OPTIONS)
+
+async def ensure_indexes(db) -> Dict[str, Dict[str, List[str]]]:
+    """Create missing indexes and rebuild drifted ones; safe to run on every startup"""
+    report = {}
+    for collection_name, models in INDEXES.items():
+        collection = db[collection_name]
+        existing = await collection.index_information()
+        result = {'created': [], 'rebuilt': [], 'unchanged': [], 'dropped': [], 'failed': []}
+
+        for name in OBSOLETE_INDEXES.get(collection_name, []):
+            if name in existing:
+                try:
+                    await collection.drop_index(name)
+                    result['dropped'].append(name)
+                except Exception as e:
+                    logger.error(f"Error dropping index {collection_name}.{name}: {str(e)}")
+                    result['failed'].append(name)
+
+        for model in models:
+            declared = model.document
+            name = declared['name']
+            try:
+                if name in existing:
+                    if _matches(existing[name], declared):
+                        result['unchanged'].append(name)
+                        continue
+                    await collection.drop_index(name)
+                    await collection.create_indexes([model])
+                    result['rebuilt'].append(name)
+                else:
+                    await collection.create_indexes([model])
+                    result['created'].append(name)
+            except Exception as e:
+                # e.g. duplicate keys blocking a unique index; reads still work without it
+                logger.error(f"Error creating index {collection_name}.{name}: {str(e)}")
+                result['failed'].append(name)
+
+        report[collection_name] = result
+    return report
+
+def _plan_stages(plan: Dict[str, Any]) -> List[str]:
+    """Flatten the stage names of an explain plan tree"""
+    stages = [plan.get('stage')]
+    if 'inputStage' in plan:
+        stages += _plan_stages(plan['inputStage'])
+    for child in plan.get('inputStages', []):
+        stages += _plan_stages(child)
+    return [stage for stage in stages if stage]
+
+async def explain_query_shapes(db) -> List[Dict[str, Any]]:
+    """Explain each registered query shape and flag collection scans"""
+    results = []
+    for name, collection_name, query, sort in QUERY_SHAPES:
+        cursor = db[collection_name].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        try:
+            explanation = await cursor.explain()
+            winning_plan = explanation.get('queryPlanner', {}).get('winningPlan', {})
+            stages = _plan_stages(winning_plan)
+            index_names = []
+            plan = winning_plan
+            while plan:
+                if plan.get('indexName'):
+                    index_names.append(plan['indexName'])
+                plan = plan.get('inputStage')
+            results.append({
+                'query': name,
+                'collection': collection_name,
+                'stages': stages,
+                'indexes': index_names,
+                'collection_scan': 'COLLSCAN' in stages
+            })
+        except Exception as e:
+            logger.error(f"Error explaining query {name}: {str(e)}")
+            results.append({'query': name, 'collection': collection_name, 'error': str(e)})
+    return results
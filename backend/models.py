@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 import uuid
 
@@ -45,7 +45,6 @@ class ProjectBase(BaseModel):
 
 class Project(ProjectBase):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    cached_at: datetime = Field(default_factory=datetime.utcnow)
 
 class ProjectResponse(BaseModel):
     id: str
@@ -60,6 +59,19 @@ class ProjectResponse(BaseModel):
     forks_count: int
     topics: List[str]
     is_featured: bool
+    score: float = 0.0
+
+class FacetCount(BaseModel):
+    value: Any
+    count: int
+
+class ProjectFacets(BaseModel):
+    total: int
+    featured: int
+    language: List[FacetCount] = []
+    topics: List[FacetCount] = []
+    min_stars: List[FacetCount] = []
+    computed_at: Optional[datetime] = None
 
 # Social Link Models
 class SocialLinkBase(BaseModel):
@@ -98,7 +110,6 @@ class VideoBase(BaseModel):
 
 class Video(VideoBase):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    cached_at: datetime = Field(default_factory=datetime.utcnow)
 
 class VideoResponse(BaseModel):
     id: str
@@ -111,15 +122,42 @@ class VideoResponse(BaseModel):
     duration: str
     is_featured: bool
 
-# API Response Models
-class ApiResponse(BaseModel):
+# Sync Job Models
+class SyncJob(BaseModel):
+    id: str
+    source: str
+    status: str
+    progress: Dict[str, Any] = {}
+    result: Dict[str, Any] = {}
+    error: Optional[str] = None
+    deadline_missed: bool = False
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    duration_ms: Optional[float] = None
+
+class SyncJobResponse(BaseModel):
     success: bool
     message: str
-    data: Optional[dict] = None
+    jobs: List[SyncJob] = []
 
-class SyncResponse(BaseModel):
+# Search Models
+class SearchHit(BaseModel):
+    type: str
+    id: Optional[str] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    url: Optional[str] = None
+    thumbnail: Optional[str] = None
+    score: float
+
+class SearchResponse(BaseModel):
+    query: str
+    results: List[SearchHit] = []
+    took_ms: float
+
+# API Response Models
+class ApiResponse(BaseModel):
     success: bool
     message: str
-    projects_synced: int = 0
-    videos_synced: int = 0
-    errors: List[str] = []
\ No newline at end of file
+    data: Optional[dict] = None
@@ -0,0 +1,85 @@
+from fastapi import HTTPException, Query, Request, Response
+from pydantic import BaseModel
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type
+from datetime import datetime
+from responses import cached_render, json_response, render_json
+import base64
+import json
+import os
+
+MAX_PAGE_SIZE = int(os.environ.get('MAX_PAGE_SIZE', 100))
+
+LIMIT_QUERY = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of items to return")
+CURSOR_QUERY = Query(None, description="Continuation token from the previous page's X-Next-Cursor header")
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {'$date': value.isoformat()}
+    return value
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and '$date' in value:
+        return datetime.fromisoformat(value['$date'])
+    return value
+
+def encode_cursor(values: List[Any]) -> str:
+    """Opaque continuation token for the sort-key values of the last item on a page"""
+    payload = json.dumps([_encode_value(value) for value in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def _is_instance(value: Any, types: Tuple[type, ...]) -> bool:
+    # JSON true/false decode to bool, which is an int subclass but never a sort key
+    return isinstance(value, types) and not isinstance(value, bool)
+
+def decode_cursor(token: Optional[str], types: List[Tuple[type, ...]]) -> Optional[List[Any]]:
+    """Decode a continuation token back into sort-key values
+
+    types holds the accepted types of each sort key; a token of any other
+    shape (another sort order's, or crafted) is rejected before it can
+    reach a query.
+    """
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if not isinstance(values, list):
+            raise ValueError("cursor payload is not a list")
+        values = [_decode_value(value) for value in values]
+    except (ValueError, TypeError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if len(values) != len(types) or not all(map(_is_instance, values, types)):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+def page_variant(name: str, fields: Optional[List[str]], limit: int, cursor: Optional[str]) -> str:
+    """Identify one page of a list representation, for ETags and cache keys"""
+    return f"{name}:fields={','.join(fields) if fields else '*'}:limit={limit}:cursor={cursor or ''}"
+
+async def render_page_cached(resource: str, data_version: Dict[str, Any], variant: str,
+                             loader: Callable[[], Awaitable[List[Dict[str, Any]]]],
+                             model: Type[BaseModel], fields: Optional[List[str]],
+                             limit: int, cursor_fields: List[str]) -> Tuple[bytes, Optional[str]]:
+    """Render one keyset page, returning its body and the next page's cursor
+
+    loader must return up to limit + 1 documents; the extra one only signals
+    that another page exists.
+    """
+    async def render():
+        documents = await loader()
+        next_cursor = None
+        if len(documents) > limit:
+            documents = documents[:limit]
+            next_cursor = encode_cursor([documents[-1][field] for field in cursor_fields])
+        return render_json(documents, model, fields), next_cursor
+
+    return await cached_render(resource, data_version, variant, render)
+
+def page_response(body: bytes, next_cursor: Optional[str], request: Request,
+                  response: Response) -> Response:
+    """Serve a rendered page, advertising the next page when there is one"""
+    if next_cursor:
+        next_url = request.url.include_query_params(cursor=next_cursor)
+        response.headers['X-Next-Cursor'] = next_cursor
+        response.headers['Link'] = f'<{next_url}>; rel="next"'
+    return json_response(body, response)
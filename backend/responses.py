@@ -0,0 +1,91 @@
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Type
+from datetime import datetime
+from cache import cache
+import json
+import os
+import logging
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+RENDERED_CACHE_TTL = float(os.environ.get('RENDERED_CACHE_TTL', 300))
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def parse_fieldset(fields: Optional[str], model: Type[BaseModel]) -> Optional[List[str]]:
+    """Validate a comma-separated fields= parameter against a response model
+
+    Returns the requested fields in model order, or None for all fields.
+    """
+    if not fields:
+        return None
+    requested = {field.strip() for field in fields.split(',') if field.strip()}
+    unknown = requested - set(model.model_fields)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    return [field for field in model.model_fields if field in requested] or None
+
+def encode_json(value: Any) -> bytes:
+    """Encode one value with the fastest available encoder"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, default=_default, separators=(',', ':')).encode('utf-8')
+
+def render_json(documents: List[Dict[str, Any]], model: Type[BaseModel],
+                fields: Optional[List[str]] = None) -> bytes:
+    """Encode documents as a JSON array holding only the model's (or the selected) fields
+
+    A field a document lacks gets the model's default, or null.
+    """
+    fields = fields or list(model.model_fields)
+    defaults = {
+        name: info.default for name, info in model.model_fields.items()
+        if not info.is_required() and info.default_factory is None
+    }
+    return encode_json([
+        {field: document.get(field, defaults.get(field)) for field in fields} for document in documents
+    ])
+
+async def cached_render(resource: str, data_version: Dict[str, Any], variant: str,
+                        render: Callable[[], Awaitable[Any]]) -> Any:
+    """Return what render produces for one variant of a data version, rendering it once per worker"""
+    # Keyed under the resource prefix so data version bumps drop it
+    key = f"{resource}:json:v{data_version['version']}:{variant}"
+    return await cache.get_or_load(key, render, RENDERED_CACHE_TTL)
+
+async def render_cached(resource: str, data_version: Dict[str, Any], variant: str,
+                        loader: Callable[[], Awaitable[List[Dict[str, Any]]]],
+                        model: Type[BaseModel], fields: Optional[List[str]] = None) -> bytes:
+    """Return the encoded list for a data version, rendering it once per worker"""
+    async def render():
+        return render_json(await loader(), model, fields)
+
+    return await cached_render(resource, data_version, variant, render)
+
+async def render_document_cached(resource: str, data_version: Dict[str, Any],
+                                 loader: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+                                 variant: str = 'document') -> Optional[bytes]:
+    """Return one encoded document (without _id) for a data version, or None if it is missing"""
+    async def render():
+        document = await loader()
+        if document is None:
+            return None
+        return encode_json({k: v for k, v in document.items() if k != '_id'})
+
+    return await cached_render(resource, data_version, variant, render)
+
+def json_response(body: bytes, response: Response) -> Response:
+    """Serve pre-encoded JSON, keeping headers already set on the route's response"""
+    return Response(content=body, media_type='application/json', headers=dict(response.headers))
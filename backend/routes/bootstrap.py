@@ -0,0 +1,95 @@
+from fastapi import APIRouter, HTTPException, Request, Response
+from typing import Any, Dict, Optional, Tuple
+from models import ProjectResponse, SocialLink, VideoResponse
+from database import database
+from http_cache import check_not_modified
+from responses import encode_json, json_response, render_cached, render_document_cached
+from pagination import MAX_PAGE_SIZE, page_variant, render_page_cached
+from routes.projects import PROJECT_CURSOR_FIELDS, project_list_name
+from routes.videos import VIDEO_CURSOR_FIELDS
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/bootstrap", tags=["bootstrap"])
+
+SECTIONS = ('profile', 'projects', 'social_links', 'videos')
+
+# Same variants as the first page of /projects and /videos, so the rendered pages are shared
+PROJECTS_FIRST_PAGE = page_variant(project_list_name('updated', {}), None, MAX_PAGE_SIZE, None)
+VIDEOS_FIRST_PAGE = page_variant('all', None, MAX_PAGE_SIZE, None)
+
+async def _render_section(section: str, version: Dict[str, Any]) -> Tuple[Optional[bytes], Optional[str]]:
+    """Render one section from its own per-version cache entry"""
+    if section == 'profile':
+        return await render_document_cached('profile', version, database.get_profile), None
+    if section == 'social_links':
+        body = await render_cached('social_links', version, 'active', database.get_social_links, SocialLink)
+        return body, None
+    if section == 'projects':
+        return await render_page_cached(
+            'projects', version, PROJECTS_FIRST_PAGE,
+            lambda: database.get_projects(limit=MAX_PAGE_SIZE + 1),
+            ProjectResponse, None, MAX_PAGE_SIZE, PROJECT_CURSOR_FIELDS['updated']
+        )
+    return await render_page_cached(
+        'videos', version, VIDEOS_FIRST_PAGE,
+        lambda: database.get_videos(limit=MAX_PAGE_SIZE + 1),
+        VideoResponse, None, MAX_PAGE_SIZE, VIDEO_CURSOR_FIELDS
+    )
+
+@router.get("/")
+async def get_bootstrap(request: Request, response: Response):
+    """Profile, projects, social links and videos for first paint in one response
+
+    Sections load concurrently; a failing section is returned as null and
+    listed under errors instead of failing the whole response.
+    """
+    try:
+        versions = await asyncio.gather(
+            *(database.get_data_version(section) for section in SECTIONS)
+        )
+        
+        # The composite changes whenever any section's data version does
+        modified = [v['modified_at'] for v in versions if v.get('modified_at')]
+        composite = {
+            'version': '.'.join(str(v['version']) for v in versions),
+            'modified_at': max(modified) if modified else None
+        }
+        not_modified = check_not_modified(request, response, 'bootstrap', composite)
+        if not_modified:
+            return not_modified
+        
+        results = await asyncio.gather(
+            *(_render_section(section, version) for section, version in zip(SECTIONS, versions)),
+            return_exceptions=True
+        )
+        
+        parts = []
+        errors = {}
+        next_cursors = {}
+        for section, result in zip(SECTIONS, results):
+            body = None
+            if isinstance(result, Exception):
+                logger.error(f"Bootstrap section {section} failed: {str(result)}")
+                errors[section] = "Failed to load"
+            else:
+                body, next_cursor = result
+                if body is None:
+                    errors[section] = "Not found"
+                if next_cursor:
+                    next_cursors[section] = next_cursor
+            parts.append(b'"' + section.encode('ascii') + b'":' + (body or b'null'))
+        
+        parts.append(b'"next_cursors":' + encode_json(next_cursors))
+        parts.append(b'"errors":' + encode_json(errors))
+        if errors:
+            # A partial payload must not be cached as the complete one
+            response.headers['Cache-Control'] = 'no-store'
+            for header in ('ETag', 'Last-Modified'):
+                if header in response.headers:
+                    del response.headers[header]
+        return json_response(b'{' + b','.join(parts) + b'}', response)
+    except Exception as e:
+        logger.error(f"Error building bootstrap payload: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to load bootstrap data")
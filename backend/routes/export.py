@@ -0,0 +1,74 @@
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Dict, List
+from database import database, PROJECTS_SORT, VIDEOS_SORT
+from responses import encode_json
+import zlib
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/export", tags=["export"])
+
+FORMAT_QUERY = Query("ndjson", alias="format", pattern="^(ndjson|json)$", description="ndjson (one document per line) or json (array)")
+BATCH_SIZE_QUERY = Query(500, ge=1, le=10000, description="Documents fetched per cursor batch and written per chunk")
+GZIP_QUERY = Query(False, description="Compress the stream on the fly with gzip")
+
+def _join_batch(batch: List[bytes], ndjson: bool, first: bool) -> bytes:
+    if ndjson:
+        return b"\n".join(batch) + b"\n"
+    return (b"" if first else b",") + b",".join(batch)
+
+async def _encode_documents(documents: AsyncIterator[Dict[str, Any]], export_format: str,
+                            batch_size: int) -> AsyncIterator[bytes]:
+    """Encode documents as NDJSON lines or a JSON array, one chunk per batch"""
+    ndjson = export_format == "ndjson"
+    if not ndjson:
+        yield b"["
+    
+    batch: List[bytes] = []
+    first = True
+    async for document in documents:
+        batch.append(encode_json(document))
+        if len(batch) >= batch_size:
+            yield _join_batch(batch, ndjson, first)
+            batch = []
+            first = False
+    
+    if batch:
+        yield _join_batch(batch, ndjson, first)
+    if not ndjson:
+        yield b"]"
+
+async def _gzip_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Compress a byte stream incrementally"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def _export_response(collection: str, sort: List[tuple], export_format: str,
+                     batch_size: int, gzip: bool) -> StreamingResponse:
+    documents = database.iter_collection(collection, sort, batch_size)
+    stream = _encode_documents(documents, export_format, batch_size)
+    media_type = "application/x-ndjson" if export_format == "ndjson" else "application/json"
+    headers = {'Content-Disposition': f'attachment; filename="{collection}.{export_format}"'}
+    if gzip:
+        stream = _gzip_stream(stream)
+        headers['Content-Encoding'] = 'gzip'
+        headers['Vary'] = 'Accept-Encoding'
+    logger.info(f"Exporting {collection} as {export_format} (batch_size={batch_size}, gzip={gzip})")
+    return StreamingResponse(stream, media_type=media_type, headers=headers)
+
+@router.get("/projects")
+async def export_projects(export_format: str = FORMAT_QUERY, batch_size: int = BATCH_SIZE_QUERY,
+                          gzip: bool = GZIP_QUERY):
+    """Stream every project for backups and data feeds"""
+    return _export_response('projects', PROJECTS_SORT, export_format, batch_size, gzip)
+
+@router.get("/videos")
+async def export_videos(export_format: str = FORMAT_QUERY, batch_size: int = BATCH_SIZE_QUERY,
+                        gzip: bool = GZIP_QUERY):
+    """Stream every video for backups and data feeds"""
+    return _export_response('videos', VIDEOS_SORT, export_format, batch_size, gzip)
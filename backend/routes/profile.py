@@ -1,15 +1,21 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from models import Profile, ProfileUpdate, ApiResponse
 from database import database
+from http_cache import check_not_modified
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/profile", tags=["profile"])
 
 @router.get("/")
-async def get_profile():
+async def get_profile(request: Request, response: Response):
     """Get user profile information"""
     try:
+        version = await database.get_data_version('profile')
+        not_modified = check_not_modified(request, response, 'profile', version)
+        if not_modified:
+            return not_modified
+        
         profile = await database.get_profile()
         if not profile:
             raise HTTPException(status_code=404, detail="Profile not found")
@@ -1,129 +1,151 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from typing import List
-from models import ProjectResponse, ApiResponse, SyncResponse
-from database import database
-from services.github_service import GitHubService
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from typing import Any, Dict, List, Literal, Optional
+from models import ProjectResponse, ProjectFacets, ApiResponse, SyncJob, SyncJobResponse
+from database import database, PROJECT_SORTS
+from http_cache import check_not_modified
+from responses import parse_fieldset, render_document_cached, json_response
+from pagination import (
+    LIMIT_QUERY, CURSOR_QUERY, decode_cursor, page_variant, page_response, render_page_cached
+)
+from services.sync_service import get_github_username
+from services.job_service import job_service
+from datetime import datetime
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/projects", tags=["projects"])
-github_service = GitHubService()
+
+FIELDS_QUERY = Query(None, description="Comma-separated response fields to return, e.g. name,html_url")
+PROJECT_CURSOR_FIELDS = {name: [field for field, _ in sort] for name, sort in PROJECT_SORTS.items()}
+# Accepted types of each cursor value, per sort order
+PROJECT_CURSOR_TYPES = {'updated': [(datetime,), (int,)], 'score': [(int, float), (int,)]}
+
+def project_filters(language: Optional[str], topic: Optional[str], min_stars: Optional[int],
+                    featured: Optional[bool]) -> Dict[str, Any]:
+    """Storage match for the facet filters of the project list"""
+    filters: Dict[str, Any] = {}
+    if language:
+        filters['language'] = language
+    if topic:
+        filters['topics'] = topic
+    if min_stars:
+        filters['stargazers_count'] = {'$gte': min_stars}
+    if featured is not None:
+        filters['is_featured'] = featured
+    return filters
+
+def project_list_name(sort: str, filters: Dict[str, Any]) -> str:
+    """Variant name of the project list for a sort order and filters, shared with bootstrap"""
+    name = f"sort={sort}"
+    if filters:
+        name += ':' + '&'.join(f"{k}={v}" for k, v in sorted(filters.items()))
+    return name
 
 @router.get("/", response_model=List[ProjectResponse])
-async def get_projects():
-    """Get all projects with automatic sync if cache is old"""
+async def get_projects(request: Request, response: Response, fields: Optional[str] = FIELDS_QUERY,
+                       limit: int = LIMIT_QUERY, cursor: Optional[str] = CURSOR_QUERY,
+                       language: Optional[str] = Query(None, description="Only projects in this language"),
+                       topic: Optional[str] = Query(None, description="Only projects with this topic"),
+                       min_stars: Optional[int] = Query(None, ge=0, description="Only projects with at least this many stars"),
+                       featured: Optional[bool] = Query(None, description="Only featured, or only non-featured, projects"),
+                       sort: Literal['updated', 'score'] = Query('updated', description="Most recently updated or highest ranked first")):
+    """Get all projects, one keyset page at a time, optionally filtered by facet"""
+    selected = parse_fieldset(fields, ProjectResponse)
+    after = decode_cursor(cursor, PROJECT_CURSOR_TYPES[sort])
+    filters = project_filters(language, topic, min_stars, featured)
+    variant = page_variant(project_list_name(sort, filters), selected, limit, cursor)
     try:
-        # Check if we need to sync
-        should_sync = await database.should_sync_projects()
-        if should_sync:
-            logger.info("Project cache is stale, triggering background sync")
-            # Trigger background sync but don't wait for it
-            await sync_projects_background()
+        version = await database.get_data_version('projects')
+        not_modified = check_not_modified(request, response, 'projects', version, variant)
+        if not_modified:
+            return not_modified
         
-        projects = await database.get_projects()
-        return projects
+        body, next_cursor = await render_page_cached(
+            'projects', version, variant,
+            lambda: database.get_projects(fields=selected, limit=limit + 1, after=after, filters=filters, sort=sort),
+            ProjectResponse, selected, limit, PROJECT_CURSOR_FIELDS[sort]
+        )
+        return page_response(body, next_cursor, request, response)
     except Exception as e:
         logger.error(f"Error fetching projects: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch projects")
 
 @router.get("/featured", response_model=List[ProjectResponse])
-async def get_featured_projects():
-    """Get only featured projects"""
+async def get_featured_projects(request: Request, response: Response, fields: Optional[str] = FIELDS_QUERY,
+                                limit: int = LIMIT_QUERY, cursor: Optional[str] = CURSOR_QUERY):
+    """Get only featured projects, one keyset page at a time"""
+    selected = parse_fieldset(fields, ProjectResponse)
+    after = decode_cursor(cursor, PROJECT_CURSOR_TYPES['updated'])
+    variant = page_variant('featured', selected, limit, cursor)
     try:
-        projects = await database.get_projects(featured_only=True)
-        return projects
+        version = await database.get_data_version('projects')
+        not_modified = check_not_modified(request, response, 'projects', version, variant)
+        if not_modified:
+            return not_modified
+        
+        body, next_cursor = await render_page_cached(
+            'projects', version, variant,
+            lambda: database.get_projects(featured_only=True, fields=selected, limit=limit + 1, after=after),
+            ProjectResponse, selected, limit, PROJECT_CURSOR_FIELDS['updated']
+        )
+        return page_response(body, next_cursor, request, response)
     except Exception as e:
         logger.error(f"Error fetching featured projects: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch featured projects")
 
-@router.post("/sync", response_model=SyncResponse)
-async def sync_projects():
-    """Manually sync projects with GitHub API"""
+@router.get("/facets", response_model=ProjectFacets)
+async def get_project_facets(request: Request, response: Response):
+    """Get the project count per language, topic, min_stars step and featured flag"""
     try:
-        # Get profile to get GitHub username
-        profile = await database.get_profile()
-        if not profile:
-            raise HTTPException(status_code=404, detail="Profile not found")
-        
-        github_username = profile.get('github_username')
-        if not github_username:
-            raise HTTPException(status_code=400, detail="GitHub username not configured")
-        
-        # Fetch projects from GitHub
-        github_repos = await github_service.get_user_repos(github_username)
-        
-        if not github_repos:
-            return SyncResponse(
-                success=False,
-                message="Failed to fetch repositories from GitHub",
-                projects_synced=0,
-                errors=["GitHub API returned no data or failed"]
-            )
-        
-        # Add cache timestamp
-        from datetime import datetime
-        for repo in github_repos:
-            repo['cached_at'] = datetime.utcnow()
-        
-        # Upsert projects
-        synced_count = await database.upsert_projects(github_repos)
+        version = await database.get_data_version('projects')
+        not_modified = check_not_modified(request, response, 'projects', version, 'facets')
+        if not_modified:
+            return not_modified
         
-        return SyncResponse(
-            success=True,
-            message=f"Successfully synced {synced_count} projects",
-            projects_synced=synced_count
-        )
-        
-    except HTTPException:
-        raise
+        body = await render_document_cached('projects', version, database.get_project_facets, 'facets')
+        return json_response(body, response)
     except Exception as e:
-        logger.error(f"Error syncing projects: {str(e)}")
-        return SyncResponse(
-            success=False,
-            message="Failed to sync projects",
-            projects_synced=0,
-            errors=[str(e)]
-        )
+        logger.error(f"Error fetching project facets: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch project facets")
 
-async def sync_projects_background():
-    """Background task to sync projects"""
+@router.post("/sync", response_model=SyncJobResponse, status_code=202)
+async def sync_projects():
+    """Start (or attach to) a background project sync with the GitHub API"""
     try:
-        profile = await database.get_profile()
-        if not profile:
-            logger.error("No profile found for background sync")
-            return
-        
-        github_username = profile.get('github_username')
-        if not github_username:
-            logger.error("No GitHub username configured")
-            return
-        
-        github_repos = await github_service.get_user_repos(github_username)
-        if github_repos:
-            from datetime import datetime
-            for repo in github_repos:
-                repo['cached_at'] = datetime.utcnow()
-            
-            synced_count = await database.upsert_projects(github_repos)
-            logger.info(f"Background sync completed: {synced_count} projects updated")
-        else:
-            logger.warning("Background sync: No repositories fetched from GitHub")
-            
+        # Fail fast on configuration errors instead of inside the job
+        await get_github_username()
+    except LookupError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        job, attached = await job_service.enqueue('projects')
+        return SyncJobResponse(
+            success=True,
+            message="Project sync already running" if attached else "Project sync started",
+            jobs=[SyncJob(**job)]
+        )
     except Exception as e:
-        logger.error(f"Background sync failed: {str(e)}")
+        logger.error(f"Error starting project sync: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to start project sync")
 
 @router.get("/stats")
 async def get_project_stats():
     """Get project statistics"""
     try:
-        stats = await database.get_stats()
-        cache_age = await database.get_project_cache_age()
+        stats, metadata = await asyncio.gather(
+            database.get_stats(), database.get_sync_metadata('projects')
+        )
+        metadata = metadata or {}
+        cache_age = metadata.get('last_synced_at')
         
         return {
             "total_projects": stats.get('projects', 0),
             "featured_projects": stats.get('featured_projects', 0),
             "last_sync": cache_age.isoformat() if cache_age else None,
-            "cache_fresh": not await database.should_sync_projects()
+            "cache_fresh": not database.is_cache_stale(metadata),
+            "sync_interval_seconds": metadata.get('interval_seconds'),
+            "sync_interval_reason": metadata.get('interval_reason')
         }
     except Exception as e:
         logger.error(f"Error fetching project stats: {str(e)}")
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+from models import SearchResponse
+from search import SEARCHABLE
+from services.search_service import search_service
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/search", tags=["search"])
+
+@router.get("/", response_model=SearchResponse)
+async def search(q: str = Query(..., min_length=1, max_length=100, description="Search text; the last word matches as a prefix"),
+                 type: Optional[str] = Query(None, description="Restrict to projects or videos"),
+                 limit: int = Query(10, ge=1, le=50)):
+    """Search projects and videos by name, title, description, topics and language"""
+    if type is not None and type not in SEARCHABLE:
+        raise HTTPException(status_code=400, detail=f"Unknown type, expected one of {', '.join(SEARCHABLE)}")
+    try:
+        start = time.perf_counter()
+        results = await search_service.search(q, [type] if type else None, limit)
+        return {
+            "query": q,
+            "results": results,
+            "took_ms": round((time.perf_counter() - start) * 1000, 3)
+        }
+    except Exception as e:
+        logger.error(f"Error searching for {q!r}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to search")
@@ -1,24 +1,25 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from typing import List
 from models import SocialLink, SocialLinkCreate, SocialLinkUpdate, ApiResponse
 from database import database
+from http_cache import check_not_modified
+from responses import render_cached, json_response
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/social-links", tags=["social-links"])
 
 @router.get("/", response_model=List[SocialLink])
-async def get_social_links():
+async def get_social_links(request: Request, response: Response):
     """Get all active social links"""
     try:
-        links = await database.get_social_links()
+        version = await database.get_data_version('social_links')
+        not_modified = check_not_modified(request, response, 'social_links', version)
+        if not_modified:
+            return not_modified
         
-        # Remove MongoDB _id field for response
-        for link in links:
-            if '_id' in link:
-                del link['_id']
-                
-        return links
+        body = await render_cached('social_links', version, 'active', database.get_social_links, SocialLink)
+        return json_response(body, response)
     except Exception as e:
         logger.error(f"Error fetching social links: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch social links")
@@ -1,143 +1,124 @@
 from fastapi import APIRouter, HTTPException
-from models import ApiResponse, SyncResponse
+from fastapi.responses import JSONResponse
+from models import ApiResponse, SyncJob, SyncJobResponse
 from database import database
-from services.github_service import GitHubService
+from cache import cache
+from search import search_index
+from services.health_service import health_monitor
+from services.job_service import job_service
+from services.scheduler_service import sync_scheduler
+from services.github_service import github_service
+from services.ranking import project_ranking
 from datetime import datetime
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/system", tags=["system"])
-github_service = GitHubService()
 
 @router.get("/health")
 async def health_check():
     """Health check endpoint"""
     try:
-        # Test database connection
+        # Connection state comes from the background monitor, stats from cached counters
+        if not health_monitor.readiness()['database']['ok']:
+            raise HTTPException(status_code=503, detail="Database unavailable")
         stats = await database.get_stats()
         
         return {
             "status": "healthy",
             "timestamp": datetime.utcnow().isoformat(),
             "database": "connected",
+            "storage": database.storage.name,
+            "github": github_service.breaker.status(),
             "stats": stats
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Health check failed: {str(e)}")
         raise HTTPException(status_code=503, detail="Service unhealthy")
 
-@router.post("/sync-all", response_model=SyncResponse)
+@router.get("/live")
+async def liveness_probe():
+    """Liveness probe: the process is up and serving, no I/O"""
+    return {"status": "alive"}
+
+@router.get("/ready")
+async def readiness_probe():
+    """Readiness probe: dependency status refreshed in the background"""
+    readiness = health_monitor.readiness()
+    return JSONResponse(
+        status_code=200 if readiness['ready'] else 503,
+        content={"status": "ready" if readiness['ready'] else "not_ready", **readiness}
+    )
+
+@router.post("/sync-all", response_model=SyncJobResponse, status_code=202)
 async def sync_all_data():
-    """Sync all external data sources"""
+    """Start (or attach to) a background sync of every external data source
+
+    Each source runs as its own job under its own deadline, the same job
+    a per-source sync or the scheduler starts, so sources sync concurrently
+    and never twice at once.
+    """
     try:
-        projects_synced = 0
-        videos_synced = 0
-        errors = []
-        
-        # Get profile for GitHub username
-        profile = await database.get_profile()
-        if not profile:
-            errors.append("Profile not found")
-        else:
-            github_username = profile.get('github_username')
-            if github_username:
-                try:
-                    # Sync GitHub projects
-                    github_repos = await github_service.get_user_repos(github_username)
-                    if github_repos:
-                        for repo in github_repos:
-                            repo['cached_at'] = datetime.utcnow()
-                        projects_synced = await database.upsert_projects(github_repos)
-                    else:
-                        errors.append("No GitHub repositories found")
-                except Exception as e:
-                    errors.append(f"GitHub sync failed: {str(e)}")
-            else:
-                errors.append("GitHub username not configured")
-        
-        # Sync videos (mock data for now)
-        try:
-            mock_videos = [
-                {
-                    "id": "1",
-                    "youtube_id": "dQw4w9WgXcQ",
-                    "title": "Building AI-Powered Applications",
-                    "description": "Deep dive into creating intelligent software solutions",
-                    "thumbnail": "https://images.unsplash.com/photo-1555949963-aa79dcee981c?w=600&h=400&fit=crop",
-                    "published_at": datetime.utcnow(),
-                    "view_count": 25000,
-                    "duration": "15:32",
-                    "is_featured": True,
-                    "cached_at": datetime.utcnow()
-                },
-                {
-                    "id": "2",
-                    "youtube_id": "dQw4w9WgXcQ2", 
-                    "title": "Future of Cybersecurity",
-                    "description": "Exploring emerging threats and defense mechanisms",
-                    "thumbnail": "https://images.unsplash.com/photo-1563206767-5b18f218e8de?w=600&h=400&fit=crop",
-                    "published_at": datetime.utcnow(),
-                    "view_count": 18000,
-                    "duration": "22:45",
-                    "is_featured": True,
-                    "cached_at": datetime.utcnow()
-                },
-                {
-                    "id": "3",
-                    "youtube_id": "dQw4w9WgXcQ3",
-                    "title": "Quantum Computing Explained", 
-                    "description": "Making quantum concepts accessible to developers",
-                    "thumbnail": "https://images.unsplash.com/photo-1635070041078-e363dbe005cb?w=600&h=400&fit=crop",
-                    "published_at": datetime.utcnow(),
-                    "view_count": 32000,
-                    "duration": "18:20",
-                    "is_featured": True,
-                    "cached_at": datetime.utcnow()
-                }
-            ]
-            videos_synced = await database.upsert_videos(mock_videos)
-        except Exception as e:
-            errors.append(f"Video sync failed: {str(e)}")
-        
-        success = projects_synced > 0 or videos_synced > 0
-        message = f"Sync completed: {projects_synced} projects, {videos_synced} videos"
-        
-        if errors:
-            message += f" (with {len(errors)} errors)"
-        
-        return SyncResponse(
-            success=success,
-            message=message,
-            projects_synced=projects_synced,
-            videos_synced=videos_synced,
-            errors=errors
+        started = await job_service.enqueue_all()
+        return SyncJobResponse(
+            success=True,
+            message="Sync already running" if all(attached for _, attached in started) else "Sync started",
+            jobs=[SyncJob(**job) for job, _ in started]
         )
-        
     except Exception as e:
         logger.error(f"Error in sync-all: {str(e)}")
-        return SyncResponse(
-            success=False,
-            message="Failed to sync data",
-            projects_synced=0,
-            videos_synced=0,
-            errors=[str(e)]
-        )
+        raise HTTPException(status_code=500, detail="Failed to start sync")
+
+@router.get("/jobs/{job_id}", response_model=SyncJob)
+async def get_sync_job(job_id: str):
+    """Get the status, progress and counts of a sync job"""
+    job = await job_service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Sync job not found")
+    return job
 
 @router.get("/stats")
 async def get_system_stats():
     """Get comprehensive system statistics"""
     try:
-        stats = await database.get_stats()
-        cache_age = await database.get_project_cache_age()
+        stats, metadata, rate_limit = await asyncio.gather(
+            database.get_stats(), database.get_sync_metadata('projects'), github_service.rate_limit.status()
+        )
+        cache_age = metadata.get('last_synced_at') if metadata else None
         
         return {
             "database": stats,
             "cache": {
                 "projects_last_sync": cache_age.isoformat() if cache_age else None,
-                "projects_cache_fresh": not await database.should_sync_projects()
+                "projects_cache_fresh": not database.is_cache_stale(metadata),
+                "response_cache": cache.stats(),
+                "search_index": search_index.stats()
+            },
+            "scheduler": sync_scheduler.status(),
+            "ranking": project_ranking.status(),
+            "github": {
+                "circuit_breaker": github_service.breaker.status(),
+                "rate_limit": rate_limit
             },
             "timestamp": datetime.utcnow().isoformat()
         }
     except Exception as e:
         logger.error(f"Error fetching system stats: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to fetch system statistics")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to fetch system statistics")
+
+@router.get("/indexes")
+async def get_index_diagnostics():
+    """Explain registered query shapes and flag collection scans"""
+    try:
+        queries = await database.explain_query_shapes()
+        return {
+            "queries": queries,
+            "collection_scans": [q['query'] for q in queries if q.get('collection_scan')],
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    except Exception as e:
+        logger.error(f"Error explaining queries: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to explain queries")
\ No newline at end of file
@@ -1,108 +1,82 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
-from models import VideoResponse, ApiResponse, SyncResponse
-from database import database
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from typing import List, Optional
+from models import VideoResponse, ApiResponse, SyncJob, SyncJobResponse
+from database import database, VIDEOS_SORT
+from http_cache import check_not_modified
+from responses import parse_fieldset
+from pagination import (
+    LIMIT_QUERY, CURSOR_QUERY, decode_cursor, page_variant, page_response, render_page_cached
+)
+from services.job_service import job_service
+from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/videos", tags=["videos"])
 
+FIELDS_QUERY = Query(None, description="Comma-separated response fields to return, e.g. title,thumbnail")
+VIDEO_CURSOR_FIELDS = [field for field, _ in VIDEOS_SORT]
+VIDEO_CURSOR_TYPES = [(datetime,), (str,)]
+
 @router.get("/", response_model=List[VideoResponse])
-async def get_videos():
-    """Get all videos"""
+async def get_videos(request: Request, response: Response, fields: Optional[str] = FIELDS_QUERY,
+                     limit: int = LIMIT_QUERY, cursor: Optional[str] = CURSOR_QUERY):
+    """Get all videos, one keyset page at a time"""
+    selected = parse_fieldset(fields, VideoResponse)
+    after = decode_cursor(cursor, VIDEO_CURSOR_TYPES)
+    variant = page_variant('all', selected, limit, cursor)
     try:
-        videos = await database.get_videos()
+        version = await database.get_data_version('videos')
+        not_modified = check_not_modified(request, response, 'videos', version, variant)
+        if not_modified:
+            return not_modified
         
-        # Remove MongoDB _id field for response
-        for video in videos:
-            if '_id' in video:
-                del video['_id']
-                
-        return videos
+        body, next_cursor = await render_page_cached(
+            'videos', version, variant,
+            lambda: database.get_videos(fields=selected, limit=limit + 1, after=after),
+            VideoResponse, selected, limit, VIDEO_CURSOR_FIELDS
+        )
+        return page_response(body, next_cursor, request, response)
     except Exception as e:
         logger.error(f"Error fetching videos: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch videos")
 
 @router.get("/featured", response_model=List[VideoResponse])
-async def get_featured_videos():
-    """Get only featured videos"""
+async def get_featured_videos(request: Request, response: Response, fields: Optional[str] = FIELDS_QUERY,
+                              limit: int = LIMIT_QUERY, cursor: Optional[str] = CURSOR_QUERY):
+    """Get only featured videos, one keyset page at a time"""
+    selected = parse_fieldset(fields, VideoResponse)
+    after = decode_cursor(cursor, VIDEO_CURSOR_TYPES)
+    variant = page_variant('featured', selected, limit, cursor)
     try:
-        videos = await database.get_videos(featured_only=True)
+        version = await database.get_data_version('videos')
+        not_modified = check_not_modified(request, response, 'videos', version, variant)
+        if not_modified:
+            return not_modified
         
-        # Remove MongoDB _id field for response
-        for video in videos:
-            if '_id' in video:
-                del video['_id']
-                
-        return videos
+        body, next_cursor = await render_page_cached(
+            'videos', version, variant,
+            lambda: database.get_videos(featured_only=True, fields=selected, limit=limit + 1, after=after),
+            VideoResponse, selected, limit, VIDEO_CURSOR_FIELDS
+        )
+        return page_response(body, next_cursor, request, response)
     except Exception as e:
         logger.error(f"Error fetching featured videos: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch featured videos")
 
-@router.post("/sync", response_model=SyncResponse)
+@router.post("/sync", response_model=SyncJobResponse, status_code=202)
 async def sync_videos():
-    """Manually sync videos (placeholder for YouTube API integration)"""
+    """Start (or attach to) a background video sync (placeholder for YouTube API integration)"""
     try:
-        # For now, return mock data since YouTube API integration is optional
-        # In production, this would integrate with YouTube Data API v3
-        
-        from datetime import datetime
-        mock_videos = [
-            {
-                "id": "1",
-                "youtube_id": "dQw4w9WgXcQ",
-                "title": "Building AI-Powered Applications",
-                "description": "Deep dive into creating intelligent software solutions",
-                "thumbnail": "https://images.unsplash.com/photo-1555949963-aa79dcee981c?w=600&h=400&fit=crop",
-                "published_at": datetime.utcnow(),
-                "view_count": 25000,
-                "duration": "15:32",
-                "is_featured": True,
-                "cached_at": datetime.utcnow()
-            },
-            {
-                "id": "2", 
-                "youtube_id": "dQw4w9WgXcQ2",
-                "title": "Future of Cybersecurity",
-                "description": "Exploring emerging threats and defense mechanisms",
-                "thumbnail": "https://images.unsplash.com/photo-1563206767-5b18f218e8de?w=600&h=400&fit=crop",
-                "published_at": datetime.utcnow(),
-                "view_count": 18000,
-                "duration": "22:45",
-                "is_featured": True,
-                "cached_at": datetime.utcnow()
-            },
-            {
-                "id": "3",
-                "youtube_id": "dQw4w9WgXcQ3", 
-                "title": "Quantum Computing Explained",
-                "description": "Making quantum concepts accessible to developers",
-                "thumbnail": "https://images.unsplash.com/photo-1635070041078-e363dbe005cb?w=600&h=400&fit=crop",
-                "published_at": datetime.utcnow(),
-                "view_count": 32000, 
-                "duration": "18:20",
-                "is_featured": True,
-                "cached_at": datetime.utcnow()
-            }
-        ]
-        
-        # Upsert videos to database
-        synced_count = await database.upsert_videos(mock_videos)
-        
-        return SyncResponse(
+        job, attached = await job_service.enqueue('videos')
+        return SyncJobResponse(
             success=True,
-            message=f"Successfully synced {synced_count} videos",
-            videos_synced=synced_count
+            message="Video sync already running" if attached else "Video sync started",
+            jobs=[SyncJob(**job)]
         )
-        
     except Exception as e:
-        logger.error(f"Error syncing videos: {str(e)}")
-        return SyncResponse(
-            success=False,
-            message="Failed to sync videos",
-            videos_synced=0,
-            errors=[str(e)]
-        )
+        logger.error(f"Error starting video sync: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to start video sync")
 
 @router.get("/stats")
 async def get_video_stats():
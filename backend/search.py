@@ -0,0 +1,271 @@
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import heapq
+import math
+import re
+
+# Words are runs of letters and digits; camelCase names also index their parts
+WORD_PATTERN = re.compile(r"[^\W_]+")
+CAMEL_PATTERN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+# BM25 saturation and length normalisation
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Terms matched only by prefix score below an exact match
+PREFIX_WEIGHT = 0.7
+# Most terms one query prefix may expand to
+MAX_PREFIX_TERMS = 64
+# Most prefixes whose weights and ranking are kept between writes
+MAX_CACHED_PREFIXES = 1024
+
+# Searchable collections: field weights, public result type and the fields kept for results
+SEARCHABLE = {
+    'projects': {
+        'type': 'project',
+        'key': 'github_id',
+        'fields': {'name': 3.0, 'topics': 2.0, 'language': 1.5, 'description': 1.0},
+        'result': lambda doc: {
+            'title': doc.get('name'),
+            'description': doc.get('description'),
+            'url': doc.get('html_url'),
+            'thumbnail': None,
+        },
+    },
+    'videos': {
+        'type': 'video',
+        'key': 'youtube_id',
+        'fields': {'title': 3.0, 'description': 1.0},
+        'result': lambda doc: {
+            'title': doc.get('title'),
+            'description': doc.get('description'),
+            'url': f"https://www.youtube.com/watch?v={doc['youtube_id']}",
+            'thumbnail': doc.get('thumbnail'),
+        },
+    },
+}
+
+def tokenize(text: Any) -> List[str]:
+    """Lowercase word tokens of a string or list of strings"""
+    if not text:
+        return []
+    if isinstance(text, (list, tuple)):
+        return [token for item in text for token in tokenize(item)]
+    tokens = []
+    for word in WORD_PATTERN.findall(str(text)):
+        tokens.append(word.lower())
+        parts = CAMEL_PATTERN.findall(word)
+        if len(parts) > 1:
+            tokens.extend(part.lower() for part in parts)
+    return tokens
+
+class InvertedIndex:
+    """Postings of one collection with field-weighted BM25 scoring
+
+    Terms are kept sorted so a prefix expands with two bisects. Documents
+    are replaced in place on update, so the index never needs a rebuild
+    to take a write.
+    """
+
+    def __init__(self, collection: str, version: Optional[int] = None):
+        spec = SEARCHABLE[collection]
+        self.collection = collection
+        self.key = spec['key']
+        self.fields: Dict[str, float] = spec['fields']
+        self.result = spec['result']
+        # Data version the contents reflect; None until loaded
+        self.version = version
+        self.postings: Dict[str, Dict[Any, float]] = {}
+        self.terms: List[str] = []
+        self.lengths: Dict[Any, float] = {}
+        self.document_terms: Dict[Any, List[str]] = {}
+        self.documents: Dict[Any, Dict[str, Any]] = {}
+        self.total_length = 0.0
+        # BM25 weight per document of each queried term and prefix, until the next write
+        self._weights: Dict[str, Dict[Any, float]] = {}
+        self._prefixes: Dict[str, Dict[Any, float]] = {}
+        self._ranked: Dict[str, List[Tuple[float, Any]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def put(self, document: Dict[str, Any]):
+        """Index a document, replacing any earlier version with the same key"""
+        key = document[self.key]
+        previous = self.documents.get(key)
+        if previous is not None:
+            self.remove(key)
+        self._weights.clear()
+        self._prefixes.clear()
+        self._ranked.clear()
+
+        frequencies: Counter = Counter()
+        for field, weight in self.fields.items():
+            for token in tokenize(document.get(field)):
+                frequencies[token] += weight
+        for term, frequency in frequencies.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                insort(self.terms, term)
+            postings[key] = frequency
+
+        self.document_terms[key] = list(frequencies)
+        length = sum(frequencies.values())
+        self.lengths[key] = length
+        self.total_length += length
+        # Upserts keep the stored public id of an existing document
+        public_id = previous['id'] if previous and previous.get('id') else document.get('id')
+        self.documents[key] = {'id': public_id, **self.result(document)}
+
+    def remove(self, key: Any):
+        """Drop a document and any terms only it used"""
+        if key not in self.documents:
+            return
+        del self.documents[key]
+        self._weights.clear()
+        self._prefixes.clear()
+        self._ranked.clear()
+        self.total_length -= self.lengths.pop(key)
+        for term in self.document_terms.pop(key):
+            postings = self.postings[term]
+            del postings[key]
+            if not postings:
+                del self.postings[term]
+                del self.terms[bisect_left(self.terms, term)]
+
+    def expand(self, prefix: str) -> List[str]:
+        """Indexed terms starting with prefix, the exact term first"""
+        start = bisect_left(self.terms, prefix)
+        end = bisect_left(self.terms, prefix + '\uffff', start)
+        return self.terms[start:min(end, start + MAX_PREFIX_TERMS)]
+
+    def weights(self, term: str) -> Dict[Any, float]:
+        """BM25 weight of a term in each document containing it"""
+        weights = self._weights.get(term)
+        if weights is None:
+            postings = self.postings[term]
+            count = len(self.documents)
+            average_length = self.total_length / count or 1.0
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            weights = {}
+            for key, frequency in postings.items():
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[key] / average_length)
+                weights[key] = idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+            self._weights[term] = weights
+        return weights
+
+    def prefix_weights(self, prefix: str) -> Dict[Any, float]:
+        """Best weight each document gets from any term starting with prefix"""
+        scores = self._prefixes.get(prefix)
+        if scores is None:
+            terms = self.expand(prefix)
+            if terms == [prefix]:
+                return self.weights(prefix)
+            scores = {}
+            for term in terms:
+                boost = 1.0 if term == prefix else PREFIX_WEIGHT
+                for key, weight in self.weights(term).items():
+                    score = boost * weight
+                    if score > scores.get(key, 0.0):
+                        scores[key] = score
+            if len(self._prefixes) >= MAX_CACHED_PREFIXES:
+                self._prefixes.clear()
+            self._prefixes[prefix] = scores
+        return scores
+
+    def search(self, tokens: List[str], limit: int) -> List[Tuple[float, Any]]:
+        """Top (score, key) pairs of documents matching every token
+
+        The last token is a prefix, as typed so far; the others must match
+        whole terms.
+        """
+        if not tokens or not self.documents:
+            return []
+        if len(tokens) == 1:
+            # Typeahead's common case: one ranking per prefix, sliced per query
+            ranked = self._ranked.get(tokens[0])
+            if ranked is None:
+                if len(self._ranked) >= MAX_CACHED_PREFIXES:
+                    self._ranked.clear()
+                scores = self.prefix_weights(tokens[0])
+                ranked = self._ranked[tokens[0]] = sorted(
+                    ((score, key) for key, score in scores.items()), reverse=True
+                )
+            return ranked[:limit]
+
+        clauses = []
+        for token in tokens[:-1]:
+            if token not in self.postings:
+                return []
+            clauses.append(self.weights(token))
+        clause = self.prefix_weights(tokens[-1])
+        if not clause:
+            return []
+        clauses.append(clause)
+
+        # Intersect from the most selective clause
+        clauses.sort(key=len)
+        totals = clauses[0]
+        for clause in clauses[1:]:
+            totals = {key: score + clause[key] for key, score in totals.items() if key in clause}
+        return heapq.nlargest(limit, ((score, key) for key, score in totals.items()))
+
+class SearchIndex:
+    """Process-local full-text index over the searchable collections
+
+    Database feeds it the documents each upsert wrote; anything written
+    by another worker is caught by comparing data versions (see
+    services.search_service).
+    """
+
+    def __init__(self):
+        self.indexes: Dict[str, InvertedIndex] = {
+            collection: InvertedIndex(collection) for collection in SEARCHABLE
+        }
+
+    def load(self, collection: str, documents: Iterable[Dict[str, Any]], version: int):
+        """Swap in a freshly built index of a whole collection"""
+        index = InvertedIndex(collection, version)
+        for document in documents:
+            index.put(document)
+        self.indexes[collection] = index
+
+    def apply(self, collection: str, documents: List[Dict[str, Any]], version: int):
+        """Index documents written by an upsert that moved the data version past version
+
+        Only an index that was current before the write can take it
+        incrementally; any other stays stale and is reloaded on the next
+        search.
+        """
+        index = self.indexes.get(collection)
+        if index is None or index.version != version:
+            return
+        for document in documents:
+            index.put(document)
+        index.version = version + 1
+
+    def search(self, query: str, collections: List[str], limit: int) -> List[Dict[str, Any]]:
+        """Best hits across collections, highest score first"""
+        tokens = tokenize(query)
+        hits = []
+        for collection in collections:
+            index = self.indexes[collection]
+            for score, key in index.search(tokens, limit):
+                hits.append({
+                    'type': SEARCHABLE[collection]['type'],
+                    **index.documents[key],
+                    'score': round(score, 4),
+                })
+        hits.sort(key=lambda hit: hit['score'], reverse=True)
+        return hits[:limit]
+
+    def stats(self) -> Dict[str, Any]:
+        """Document and term counts per collection"""
+        return {
+            collection: {'documents': len(index), 'terms': len(index.terms), 'version': index.version}
+            for collection, index in self.indexes.items()
+        }
+
+# Global search index instance
+search_index = SearchIndex()
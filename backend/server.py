@@ -4,10 +4,20 @@ from contextlib import asynccontextmanager
 import os
 import logging
 from pathlib import Path
+from dotenv import load_dotenv
+
+# Load environment variables before the modules below read their settings
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
 
 # Import database and models
 from database import database
 from seed_data import seed_initial_data
+from services.github_service import github_service
+from services.health_service import health_monitor
+from services.job_service import job_service
+from services.scheduler_service import sync_scheduler
+from services.search_service import search_service
 
 # Import routes
 from routes.profile import router as profile_router
@@ -15,6 +25,9 @@ from routes.projects import router as projects_router
 from routes.social_links import router as social_links_router
 from routes.videos import router as videos_router
 from routes.system import router as system_router
+from routes.export import router as export_router
+from routes.bootstrap import router as bootstrap_router
+from routes.search import router as search_router
 
 # Setup logging
 logging.basicConfig(
@@ -23,11 +36,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-ROOT_DIR = Path(__file__).parent
-from dotenv import load_dotenv
-load_dotenv(ROOT_DIR / '.env')
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
@@ -36,8 +44,19 @@ async def lifespan(app: FastAPI):
         logger.info("🚀 Starting Kenan's Cyberpunk Portfolio Backend...")
         
         # Connect to database
-        await database.connect_to_mongo()
-        logger.info("✅ Connected to MongoDB")
+        await database.connect()
+        logger.info(f"✅ Connected to {database.storage.name} storage")
+        
+        # Reconcile declared indexes
+        try:
+            index_report = await database.ensure_indexes()
+            created = sum(len(r['created']) + len(r['rebuilt']) for r in index_report.values())
+            logger.info(f"✅ Indexes reconciled ({created} created or rebuilt)")
+        except Exception as e:
+            logger.warning(f"⚠️  Index reconciliation warning: {str(e)}")
+        
+        # Open the shared GitHub HTTP client
+        await github_service.start()
         
         # Seed initial data
         try:
@@ -46,6 +65,18 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.warning(f"⚠️  Seeding warning: {str(e)}")
         
+        # Build the search index before taking traffic
+        try:
+            await search_service.warm()
+        except Exception as e:
+            logger.warning(f"⚠️  Search index warning: {str(e)}")
+        
+        # Start background dependency checks for the readiness probe
+        await health_monitor.start()
+        
+        # Refresh external sources periodically from the elected leader worker
+        await sync_scheduler.start()
+        
         logger.info("🎯 Backend startup completed successfully")
         yield
         
@@ -55,7 +86,11 @@ async def lifespan(app: FastAPI):
     finally:
         # Shutdown
         logger.info("🔄 Shutting down...")
-        await database.close_mongo_connection()
+        await sync_scheduler.stop()
+        await health_monitor.stop()
+        await job_service.shutdown()
+        await github_service.close()
+        await database.close()
         logger.info("✅ Database connection closed")
 
 # Create the main app with lifespan manager
@@ -95,6 +130,9 @@ api_router.include_router(projects_router)
 api_router.include_router(social_links_router)
 api_router.include_router(videos_router)
 api_router.include_router(system_router)
+api_router.include_router(export_router)
+api_router.include_router(bootstrap_router)
+api_router.include_router(search_router)
 
 # Include the API router in the main app
 app.include_router(api_router)
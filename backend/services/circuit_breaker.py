@@ -0,0 +1,96 @@
+from typing import Any, Deque, Dict, Optional
+from collections import deque
+from datetime import datetime, timedelta
+import os
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class CircuitBreaker:
+    """Fails calls fast while an upstream dependency keeps failing
+
+    Closed: calls go through and their outcomes fill a rolling window. Once
+    the window holds at least min_calls outcomes and the failure rate
+    reaches the threshold, the breaker opens. Open: calls are refused until
+    the cooldown has passed. Half-open: a few probe calls go through; a
+    success closes the breaker, a failure opens it for another cooldown.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.failure_threshold = float(os.environ.get('GITHUB_BREAKER_FAILURE_RATE', 0.5))
+        self.min_calls = int(os.environ.get('GITHUB_BREAKER_MIN_CALLS', 5))
+        self.cooldown = float(os.environ.get('GITHUB_BREAKER_COOLDOWN', 30))
+        self.half_open_probes = int(os.environ.get('GITHUB_BREAKER_HALF_OPEN_PROBES', 1))
+        self.state = CLOSED
+        self._outcomes: Deque[bool] = deque(maxlen=int(os.environ.get('GITHUB_BREAKER_WINDOW', 20)))
+        # Monotonic time of the last state change
+        self._changed_at = 0.0
+        self._probes = 0
+        self.last_failure: Optional[str] = None
+        self.last_change: Optional[datetime] = None
+
+    def allow(self) -> bool:
+        """Whether a call may be sent now"""
+        if self.state == OPEN:
+            if time.monotonic() - self._changed_at < self.cooldown:
+                return False
+            self._transition(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._probes >= self.half_open_probes:
+                # A probe that never reported back (e.g. cancelled) must not wedge the breaker
+                if time.monotonic() - self._changed_at < self.cooldown:
+                    return False
+                self._changed_at = time.monotonic()
+                self._probes = 0
+            self._probes += 1
+        return True
+
+    def retry_at(self) -> datetime:
+        """When an open breaker will let a probe through"""
+        remaining = self.cooldown - (time.monotonic() - self._changed_at)
+        return datetime.utcnow() + timedelta(seconds=max(0.0, remaining))
+
+    def record_success(self):
+        if self.state == HALF_OPEN:
+            self._transition(CLOSED)
+            return
+        self._outcomes.append(True)
+
+    def record_failure(self, reason: str):
+        self.last_failure = reason
+        if self.state == HALF_OPEN:
+            self._transition(OPEN)
+            return
+        self._outcomes.append(False)
+        failures = self._outcomes.count(False)
+        if (self.state == CLOSED and len(self._outcomes) >= self.min_calls
+                and failures / len(self._outcomes) >= self.failure_threshold):
+            self._transition(OPEN)
+
+    def _transition(self, state: str):
+        logger.warning(f"{self.name} circuit breaker {self.state} -> {state}"
+                       + (f" ({self.last_failure})" if state == OPEN else ""))
+        self.state = state
+        self.last_change = datetime.utcnow()
+        self._changed_at = time.monotonic()
+        self._probes = 0
+        if state == CLOSED:
+            self._outcomes.clear()
+
+    def status(self) -> Dict[str, Any]:
+        """Breaker state of this worker"""
+        failures = self._outcomes.count(False)
+        return {
+            'state': self.state,
+            'failure_rate': round(failures / len(self._outcomes), 2) if self._outcomes else 0.0,
+            'window': len(self._outcomes),
+            'last_failure': self.last_failure,
+            'last_change': self.last_change.isoformat() if self.last_change else None,
+            'retry_at': self.retry_at().isoformat() if self.state == OPEN else None
+        }
@@ -1,15 +1,33 @@
 import httpx
+import asyncio
 import os
 import uuid
-from typing import List, Optional
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlencode
 from datetime import datetime, timezone
+from services.rate_limit import RateLimitBudget, Throttled
+from services.circuit_breaker import CircuitBreaker
 import logging
 
 logger = logging.getLogger(__name__)
 
+RepoPageHandler = Callable[[List[dict]], Awaitable[None]]
+
+class GitHubError(RuntimeError):
+    """GitHub answered with an error or could not be reached"""
+
+class IncompleteFetch(GitHubError):
+    """A page after the first failed; the pages before it were already handled"""
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 class GitHubService:
     def __init__(self):
-        self.base_url = "https://api.github.com"
+        self.base_url = os.environ.get('GITHUB_API_URL', "https://api.github.com")
         self.token = os.environ.get('GITHUB_TOKEN')
         self.headers = {
             'Accept': 'application/vnd.github.v3+json',
@@ -17,41 +35,223 @@ class GitHubService:
         }
         if self.token:
             self.headers['Authorization'] = f'token {self.token}'
+        self.client: Optional[httpx.AsyncClient] = None
+        # ETag / Last-Modified validators of the last fully handled 200 response, per URL
+        self.validators: Dict[str, Dict[str, str]] = {}
+        self.page_concurrency = int(os.environ.get('GITHUB_PAGE_CONCURRENCY', 4))
+        self.rate_limit = RateLimitBudget('github')
+        # Sends after a short in-line rate limit wait before deferring
+        self.rate_limit_retries = int(os.environ.get('GITHUB_RATE_LIMIT_RETRIES', 2))
+        self.breaker = CircuitBreaker('github')
+
+    async def start(self):
+        """Open the pooled HTTP client shared by all GitHub calls in this process"""
+        if self.client is not None:
+            return
+        
+        http2 = os.environ.get('GITHUB_HTTP2', 'true').lower() == 'true'
+        if http2 and not HTTP2_AVAILABLE:
+            logger.warning("HTTP/2 requested but 'h2' is not installed, using HTTP/1.1")
+            http2 = False
+        
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=int(os.environ.get('GITHUB_MAX_CONNECTIONS', 20)),
+                max_keepalive_connections=int(os.environ.get('GITHUB_MAX_KEEPALIVE', 10)),
+                keepalive_expiry=float(os.environ.get('GITHUB_KEEPALIVE_EXPIRY', 60.0))
+            ),
+            timeout=httpx.Timeout(
+                float(os.environ.get('GITHUB_READ_TIMEOUT', 10.0)),
+                connect=float(os.environ.get('GITHUB_CONNECT_TIMEOUT', 3.0)),
+                pool=float(os.environ.get('GITHUB_POOL_TIMEOUT', 5.0))
+            )
+        )
+        logger.info(f"GitHub HTTP client opened (http2={http2})")
+
+    async def close(self):
+        """Close the pooled HTTP client"""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+            logger.info("GitHub HTTP client closed")
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Return the pooled client, opening it lazily outside the app lifespan"""
+        if self.client is None:
+            await self.start()
+        return self.client
+
+    async def _get(self, path: str, params: Optional[dict] = None,
+                   headers: Optional[dict] = None) -> Union[httpx.Response, Throttled]:
+        """GET within the shared rate limit budget, or Throttled if the call had to be deferred
+
+        Connection errors, timeouts and 5xx responses count as failures for the
+        circuit breaker; while it is open calls are deferred without being sent.
+        """
+        if not self.breaker.allow():
+            return Throttled(self.breaker.retry_at(), "GitHub circuit breaker open")
+        client = await self._get_client()
+        throttled = None
+        for _ in range(self.rate_limit_retries + 1):
+            throttled = await self.rate_limit.acquire()
+            if throttled:
+                return throttled
+            try:
+                response = await client.get(path, params=params, headers=headers)
+            except httpx.RequestError as e:
+                self.breaker.record_failure(f"{type(e).__name__}: {str(e)}")
+                raise
+            if response.status_code >= 500:
+                self.breaker.record_failure(f"HTTP {response.status_code}")
+            else:
+                self.breaker.record_success()
+            throttled = await self.rate_limit.record(response)
+            if throttled is None:
+                return response
+            # A short block is waited out by the next acquire(), a long one defers the call
+            if (throttled.retry_at - datetime.utcnow()).total_seconds() > self.rate_limit.max_wait:
+                return throttled
+        return throttled
 
-    async def get_user_repos(self, username: str) -> List[dict]:
-        """Fetch user repositories from GitHub API"""
+    @staticmethod
+    def _validator_key(path: str, params: Optional[dict]) -> str:
+        return f"{path}?{urlencode(params or {})}"
+
+    async def _conditional_get(self, path: str, params: Optional[dict] = None
+                               ) -> Tuple[Union[httpx.Response, Throttled], Optional[Dict[str, str]]]:
+        """GET a URL, revalidating against the validators stored for it
+
+        Returns the response and, for a 200, its validators. The caller stores
+        them once it has handled the response, so a failure before that
+        never turns the next fetch into a 304.
+        """
+        key = self._validator_key(path, params)
+        headers = {}
+        cached = self.validators.get(key)
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        
+        response = await self._get(path, params=params, headers=headers)
+        
+        validators = None
+        if isinstance(response, httpx.Response) and response.status_code == 200:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                validators = {'etag': etag, 'last_modified': last_modified}
+        return response, validators
+
+    async def get_user_repos(self, username: str,
+                             on_page: Optional[RepoPageHandler] = None) -> Union[List[dict], Throttled, None]:
+        """Fetch all user repositories from GitHub API, or None if unchanged since the last fetch
+
+        Pages after the first are fetched concurrently once the Link header gives the
+        last page number. Each processed page is passed to on_page as soon as it arrives.
+        Returns Throttled if rate limiting deferred any page; pages already passed to
+        on_page are kept. Raises GitHubError if GitHub answered with an error or
+        could not be reached, IncompleteFetch if only a later page failed.
+        """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/users/{username}/repos",
-                    headers=self.headers,
-                    params={
-                        'sort': 'updated',
-                        'direction': 'desc',
-                        'per_page': 100,
-                        'type': 'owner'
-                    }
-                )
+            path = f"/users/{username}/repos"
+            params = {
+                'sort': 'updated',
+                'direction': 'desc',
+                'per_page': 100,
+                'type': 'owner'
+            }
+            # Repos are sorted by update time, so an unchanged first page means
+            # nothing was pushed since the last fetch
+            response, validators = await self._conditional_get(path, params=params)
+            if isinstance(response, Throttled):
+                logger.warning(f"GitHub repositories for {username} deferred: {response!r}")
+                return response
+            
+            if response.status_code == 200:
+                # Until every page is handled, the next fetch gets every page
+                # instead of revalidating the first
+                key = self._validator_key(path, params)
+                self.validators.pop(key, None)
+                repos = self._process_repositories(response.json())
+                if on_page:
+                    await on_page(repos)
+                
+                last_page = self._get_last_page(response)
+                if last_page > 1:
+                    try:
+                        remaining = await self._fetch_remaining_pages(path, params, last_page, on_page)
+                    except httpx.HTTPError as e:
+                        raise IncompleteFetch(f"GitHub repositories for {username} incomplete: {str(e)}") from e
+                    if isinstance(remaining, Throttled):
+                        logger.warning(f"GitHub repositories for {username} deferred: {remaining!r}")
+                        return remaining
+                    repos.extend(remaining)
+                if validators:
+                    self.validators[key] = validators
+                return repos
+            elif response.status_code == 304:
+                logger.info(f"GitHub repositories for {username} not modified")
+                return None
+            elif response.status_code == 404:
+                raise GitHubError(f"GitHub user {username} not found")
+            elif response.status_code == 403:
+                raise GitHubError(f"GitHub API access forbidden: {response.text}")
+            else:
+                raise GitHubError(f"GitHub API error: {response.status_code} - {response.text}")
                 
-                if response.status_code == 200:
-                    repos = response.json()
-                    return self._process_repositories(repos)
-                elif response.status_code == 404:
-                    logger.error(f"GitHub user {username} not found")
-                    return []
-                elif response.status_code == 403:
-                    logger.error("GitHub API rate limit exceeded")
-                    return []
-                else:
-                    logger.error(f"GitHub API error: {response.status_code} - {response.text}")
-                    return []
-                    
         except httpx.RequestError as e:
-            logger.error(f"GitHub API request failed: {str(e)}")
-            return []
-        except Exception as e:
-            logger.error(f"Unexpected error in GitHub service: {str(e)}")
-            return []
+            raise GitHubError(f"GitHub API request failed: {type(e).__name__}: {str(e)}") from e
+
+    def _get_last_page(self, response: httpx.Response) -> int:
+        """Read the last page number from the Link header"""
+        last = response.links.get('last')
+        if not last:
+            return 1
+        try:
+            return int(httpx.URL(last['url']).params.get('page', 1))
+        except ValueError:
+            return 1
+
+    async def _fetch_remaining_pages(self, path: str, params: dict, last_page: int,
+                                     on_page: Optional[RepoPageHandler]) -> Union[List[dict], Throttled]:
+        """Fetch pages 2..last_page with bounded concurrency, handling each as it completes
+
+        Stops at the first deferred page and returns its Throttled result;
+        a page that fails raises httpx.HTTPError.
+        """
+        semaphore = asyncio.Semaphore(self.page_concurrency)
+
+        async def fetch_page(page: int) -> Union[List[dict], Throttled]:
+            async with semaphore:
+                response = await self._get(path, params={**params, 'page': page})
+            if isinstance(response, Throttled):
+                return response
+            if response.status_code != 200:
+                # Not an empty page: the fetch is incomplete
+                raise httpx.HTTPStatusError(
+                    f"page {page} returned {response.status_code}", request=response.request, response=response
+                )
+            return self._process_repositories(response.json())
+
+        tasks = [asyncio.create_task(fetch_page(page)) for page in range(2, last_page + 1)]
+        repos = []
+        try:
+            for next_page in asyncio.as_completed(tasks):
+                page_repos = await next_page
+                if isinstance(page_repos, Throttled):
+                    return page_repos
+                if on_page and page_repos:
+                    await on_page(page_repos)
+                repos.extend(page_repos)
+        finally:
+            for task in tasks:
+                task.cancel()
+        return repos
 
     def _process_repositories(self, repos: List[dict]) -> List[dict]:
         """Process and clean repository data"""
@@ -78,7 +278,9 @@ class GitHubService:
                 'stargazers_count': repo.get('stargazers_count', 0),
                 'forks_count': repo.get('forks_count', 0),
                 'topics': repo.get('topics', []),
-                'is_featured': self._determine_featured_status(repo)
+                # Defaults for new projects; after that only the ranking pass writes them (services.ranking)
+                'score': 0.0,
+                'is_featured': False
             }
             processed_repos.append(processed_repo)
             
@@ -91,44 +293,20 @@ class GitHubService:
         except Exception:
             return datetime.now(timezone.utc)
 
-    def _determine_featured_status(self, repo: dict) -> bool:
-        """Determine if a repository should be featured"""
-        stars = repo.get('stargazers_count', 0)
-        forks = repo.get('forks_count', 0)
-        topics = repo.get('topics', [])
-        
-        # Feature criteria
-        if stars >= 10 or forks >= 5:
-            return True
-            
-        # Feature based on topics (AI, ML, etc.)
-        featured_topics = ['ai', 'machine-learning', 'neural-network', 'quantum', 'blockchain', 'cyberpunk']
-        if any(topic in featured_topics for topic in topics):
-            return True
-            
-        # Feature based on name patterns
-        featured_patterns = ['ai', 'quantum', 'neural', 'cyber', 'bot', 'ml']
-        repo_name_lower = repo['name'].lower()
-        if any(pattern in repo_name_lower for pattern in featured_patterns):
-            return True
-            
-        return False
-
     async def get_repository_details(self, username: str, repo_name: str) -> Optional[dict]:
         """Get detailed information about a specific repository"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/repos/{username}/{repo_name}",
-                    headers=self.headers
-                )
+            response = await self._get(f"/repos/{username}/{repo_name}")
+            
+            if isinstance(response, Throttled):
+                logger.warning(f"GitHub repository details deferred: {response!r}")
+                return None
+            elif response.status_code == 200:
+                return response.json()
+            else:
+                logger.error(f"Failed to fetch repo {repo_name}: {response.status_code}")
+                return None
                 
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    logger.error(f"Failed to fetch repo {repo_name}: {response.status_code}")
-                    return None
-                    
         except Exception as e:
             logger.error(f"Error fetching repository details: {str(e)}")
             return None
@@ -136,18 +314,20 @@ class GitHubService:
     async def get_user_profile(self, username: str) -> Optional[dict]:
         """Get user profile information from GitHub"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/users/{username}",
-                    headers=self.headers
-                )
+            response = await self._get(f"/users/{username}")
+            
+            if isinstance(response, Throttled):
+                logger.warning(f"GitHub user profile deferred: {response!r}")
+                return None
+            elif response.status_code == 200:
+                return response.json()
+            else:
+                logger.error(f"Failed to fetch user profile: {response.status_code}")
+                return None
                 
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    logger.error(f"Failed to fetch user profile: {response.status_code}")
-                    return None
-                    
         except Exception as e:
             logger.error(f"Error fetching user profile: {str(e)}")
-            return None
\ No newline at end of file
+            return None
+
+# Global GitHub service instance
+github_service = GitHubService()
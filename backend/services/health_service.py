@@ -0,0 +1,87 @@
+from database import database
+from typing import Any, Dict, Optional
+from datetime import datetime
+import asyncio
+import os
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class HealthMonitor:
+    """Refreshes dependency status in the background so probes never do I/O"""
+
+    def __init__(self):
+        self.interval = float(os.environ.get('HEALTH_CHECK_INTERVAL', 10))
+        self.max_loop_lag_ms = float(os.environ.get('HEALTH_MAX_LOOP_LAG_MS', 500))
+        self.status: Dict[str, Any] = {
+            'database': {'ok': False, 'latency_ms': None, 'error': 'not checked yet'},
+            'github_sync': {'last_synced_at': None},
+            'event_loop': {'lag_ms': 0.0},
+            'checked_at': None
+        }
+        self._checked_monotonic: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Run one check immediately, then keep refreshing in the background"""
+        await self.check()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the background refresh"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # How late the loop wakes us up is the event-loop lag
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, (loop.time() - started - self.interval) * 1000)
+            self.status['event_loop'] = {'lag_ms': round(lag_ms, 2)}
+            await self.check()
+
+    async def check(self):
+        """Refresh the dependency status"""
+        try:
+            latency_ms = await database.ping()
+            self.status['database'] = {'ok': True, 'latency_ms': round(latency_ms, 2), 'error': None}
+        except Exception as e:
+            logger.warning(f"Health check: database ping failed: {str(e)}")
+            self.status['database'] = {'ok': False, 'latency_ms': None, 'error': str(e)}
+
+        try:
+            metadata = await database.get_sync_metadata('projects') or {}
+            last_synced_at = metadata.get('last_synced_at')
+            self.status['github_sync'] = {
+                'last_synced_at': last_synced_at.isoformat() if last_synced_at else None,
+                'fresh': not database.is_cache_stale(metadata)
+            }
+        except Exception as e:
+            logger.warning(f"Health check: sync metadata unavailable: {str(e)}")
+
+        self.status['checked_at'] = datetime.utcnow().isoformat()
+        self._checked_monotonic = time.monotonic()
+
+    def readiness(self) -> Dict[str, Any]:
+        """Current readiness verdict from the last background check"""
+        stale = (
+            self._checked_monotonic is None
+            or time.monotonic() - self._checked_monotonic > self.interval * 3
+        )
+        ready = (
+            self.status['database']['ok']
+            and not stale
+            and self.status['event_loop']['lag_ms'] <= self.max_loop_lag_ms
+        )
+        return {'ready': ready, 'stale': stale, **self.status}
+
+# Global health monitor instance
+health_monitor = HealthMonitor()
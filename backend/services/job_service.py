@@ -0,0 +1,111 @@
+from database import database
+from services.sync_service import SYNC_DEADLINES, run_with_deadline, sync_profile_projects, sync_youtube_videos
+from services.rate_limit import Throttled
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from functools import partial
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+def _to_job(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a sync_jobs document for the API"""
+    job = {k: v for k, v in document.items() if k not in ('_id', 'active', 'owner', 'heartbeat_at')}
+    job['id'] = document['_id']
+    return job
+
+class JobService:
+    """Runs sync jobs in the background, one active job per source across workers
+
+    A job stays active until its sync finishes, also past the source's
+    deadline, so a sync is never started twice for the same source.
+    """
+
+    def __init__(self):
+        self._running: Dict[str, Tuple[str, asyncio.Task]] = {}
+
+    async def enqueue(self, source: str) -> Tuple[Dict[str, Any], bool]:
+        """Start a sync job for a source or attach to the active one
+
+        Returns (job, attached).
+        """
+        if source not in SYNC_DEADLINES:
+            raise ValueError(f"Unknown sync source: {source}")
+        running = self._running.get(source)
+        if running and not running[1].done():
+            job = await database.get_sync_job(running[0])
+            if job:
+                return _to_job(job), True
+
+        document, created = await database.create_sync_job(source)
+        if not created:
+            return _to_job(document), True
+
+        task = asyncio.create_task(self._run(document['_id'], source))
+        self._running[source] = (document['_id'], task)
+        return _to_job(document), False
+
+    async def enqueue_all(self) -> List[Tuple[Dict[str, Any], bool]]:
+        """Start or attach to the job of every source, so sync-all never duplicates a source sync
+
+        Returns (job, attached) per source.
+        """
+        return [await self.enqueue(source) for source in SYNC_DEADLINES]
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job's status"""
+        document = await database.get_sync_job(job_id)
+        return _to_job(document) if document else None
+
+    async def shutdown(self):
+        """Cancel jobs still running in this process and mark them failed"""
+        for job_id, task in list(self._running.values()):
+            if task.done():
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._running.clear()
+
+    async def _run(self, job_id: str, source: str):
+        async def report(progress: Dict[str, int]):
+            await database.update_sync_job(job_id, progress=progress)
+
+        async def deadline_missed():
+            logger.warning(f"Sync job {job_id} ({source}) missed its deadline, still running")
+            await database.update_sync_job(job_id, deadline_missed=True)
+
+        try:
+            result = await run_with_deadline(source, partial(self._runner(source), report), deadline_missed)
+            # A deferred sync is neither a success nor a failure; the scheduler retries it
+            status = 'throttled' if result.get('throttled') else 'succeeded'
+            await database.finish_sync_job(job_id, status, result=result)
+            logger.info(f"Sync job {job_id} ({source}) {status}")
+        except asyncio.CancelledError:
+            await database.finish_sync_job(job_id, 'failed', error="Interrupted by shutdown")
+            raise
+        except Exception as e:
+            logger.error(f"Sync job {job_id} ({source}) failed: {str(e)}")
+            await database.finish_sync_job(job_id, 'failed', error=str(e))
+
+    def _runner(self, source: str) -> Callable[[Callable[[Dict[str, int]], Awaitable[None]]], Awaitable[Dict[str, Any]]]:
+        if source == 'projects':
+            async def run_projects(report):
+                stats = await sync_profile_projects(on_progress=report)
+                # None means GitHub reported no changes since the last sync
+                if stats is None:
+                    return {'not_modified': True}
+                return stats.to_dict() if isinstance(stats, Throttled) else stats
+            return run_projects
+
+        if source == 'videos':
+            async def run_videos(report):
+                return await sync_youtube_videos()
+            return run_videos
+
+        raise ValueError(f"Unknown sync source: {source}")
+
+# Global job service instance
+job_service = JobService()
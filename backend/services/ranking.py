@@ -0,0 +1,106 @@
+from typing import Any, Dict, List, Tuple
+import numpy as np
+import os
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+SIGNALS = ('stars', 'forks', 'recency', 'topics', 'name')
+
+DEFAULT_WEIGHTS = {'stars': 0.35, 'forks': 0.15, 'recency': 0.2, 'topics': 0.2, 'name': 0.1}
+DEFAULT_TOPICS = 'ai,machine-learning,neural-network,quantum,blockchain,cyberpunk'
+DEFAULT_NAME_PATTERNS = 'ai,quantum,neural,cyber,bot,ml'
+# Most project names whose pattern match is kept between passes
+MAX_CACHED_NAMES = 100000
+
+def _env_list(name: str, default: str) -> List[str]:
+    return [item.strip().lower() for item in os.environ.get(name, default).split(',') if item.strip()]
+
+class RankingEngine:
+    """Scores a batch of projects with weighted signals and features the top K
+
+    Each signal is scaled to 0..1 over the whole batch with NumPy:
+    stars and forks on a log scale saturating at a configured count,
+    recency as a half-life decay from the most recently updated project,
+    topics as matches against the featured topic list, and name as a
+    word-start match of the name patterns. The score is the weighted sum;
+    recency is relative to the batch, not the clock, so scores only move
+    when the projects do.
+    """
+
+    def __init__(self):
+        self.weights = np.array([
+            float(os.environ.get(f'RANK_WEIGHT_{signal.upper()}', DEFAULT_WEIGHTS[signal]))
+            for signal in SIGNALS
+        ])
+        self.stars_saturation = float(os.environ.get('RANK_STARS_SATURATION', 1000))
+        self.forks_saturation = float(os.environ.get('RANK_FORKS_SATURATION', 100))
+        self.recency_half_life_days = float(os.environ.get('RANK_RECENCY_HALF_LIFE_DAYS', 180))
+        self.topic_saturation = float(os.environ.get('RANK_TOPIC_SATURATION', 2))
+        self.featured_count = int(os.environ.get('RANK_FEATURED_COUNT', 12))
+        self.featured_min_score = float(os.environ.get('RANK_FEATURED_MIN_SCORE', 0.0))
+        self.topics = frozenset(_env_list('RANK_FEATURED_TOPICS', DEFAULT_TOPICS))
+        patterns = _env_list('RANK_NAME_PATTERNS', DEFAULT_NAME_PATTERNS)
+        # One alternation matched at word starts: "ai-chat" and "aiBot" match ai, "email" does not
+        self.name_pattern = re.compile(
+            r'(?<![a-z0-9])(?:' + '|'.join(map(re.escape, patterns)) + ')', re.IGNORECASE
+        ) if patterns else None
+        self._names: Dict[str, bool] = {}
+
+    def _name_matches(self, name: str) -> bool:
+        matches = self._names.get(name)
+        if matches is None:
+            if len(self._names) >= MAX_CACHED_NAMES:
+                self._names.clear()
+            matches = self._names[name] = bool(self.name_pattern and self.name_pattern.search(name))
+        return matches
+
+    def signals(self, projects: List[Dict[str, Any]]) -> np.ndarray:
+        """Signal matrix of a batch: one row per signal, one column per project"""
+        count = len(projects)
+        stars = np.array([p.get('stargazers_count') or 0 for p in projects], float)
+        forks = np.array([p.get('forks_count') or 0 for p in projects], float)
+        updated = np.array([p['updated_at'].timestamp() for p in projects])
+
+        topic_lists = [p.get('topics') or [] for p in projects]
+        owners = np.repeat(np.arange(count), [len(topics) for topics in topic_lists])
+        featured_topics = self.topics
+        matched = np.array([topic.lower() in featured_topics for topics in topic_lists for topic in topics], bool)
+        topic_matches = np.bincount(owners[matched], minlength=count)
+
+        # Names rarely change between passes, so each is matched once
+        names = np.array([self._name_matches(p.get('name') or '') for p in projects], bool)
+
+        age_days = (updated.max() - updated) / 86400
+        return np.vstack([
+            np.minimum(np.log1p(stars) / np.log1p(self.stars_saturation), 1.0),
+            np.minimum(np.log1p(forks) / np.log1p(self.forks_saturation), 1.0),
+            np.exp2(-age_days / self.recency_half_life_days),
+            np.minimum(topic_matches / self.topic_saturation, 1.0),
+            names.astype(float),
+        ])
+
+    def rank(self, projects: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Score of each project and whether it is featured: among the top K, above the minimum"""
+        if not projects:
+            return np.zeros(0), np.zeros(0, bool)
+        # Rounded so float noise never reads as a changed score
+        scores = np.round(self.weights @ self.signals(projects), 6)
+        featured = np.zeros(len(projects), bool)
+        top = np.argsort(-scores, kind='stable')[:self.featured_count]
+        featured[top] = scores[top] > self.featured_min_score
+        return scores, featured
+
+    def status(self) -> Dict[str, Any]:
+        """Ranking configuration"""
+        return {
+            'weights': dict(zip(SIGNALS, self.weights.tolist())),
+            'featured_count': self.featured_count,
+            'featured_min_score': self.featured_min_score,
+            'topics': sorted(self.topics),
+            'name_pattern': self.name_pattern.pattern if self.name_pattern else None
+        }
+
+# Global project ranking engine instance
+project_ranking = RankingEngine()
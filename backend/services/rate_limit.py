@@ -0,0 +1,140 @@
+from database import database
+from typing import Any, Dict, Optional
+from datetime import datetime, timedelta
+import httpx
+import asyncio
+import os
+import random
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Throttled:
+    """Returned in place of data when rate limiting or an open circuit breaker deferred an upstream call"""
+
+    def __init__(self, retry_at: datetime, reason: str):
+        self.retry_at = retry_at
+        self.reason = reason
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'throttled': True, 'retry_at': self.retry_at, 'reason': self.reason}
+
+    def __repr__(self) -> str:
+        return f"Throttled(retry_at={self.retry_at.isoformat()}, reason={self.reason!r})"
+
+def _int_header(response: httpx.Response, name: str) -> Optional[int]:
+    try:
+        return int(response.headers[name])
+    except (KeyError, ValueError):
+        return None
+
+class RateLimitBudget:
+    """Rate limit budget of an upstream API, shared by all workers through the database
+
+    Each call takes one unit from the stored budget before it is sent and
+    each response stores the remaining count and reset time the API
+    reported. Calls slow down as the budget runs low and are deferred
+    (Throttled) rather than sent once it is spent or the API blocked us.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        # Calls kept back for requests made outside the budget (e.g. by hand)
+        self.reserve = int(os.environ.get('GITHUB_RATE_LIMIT_RESERVE', 5))
+        # Below this many calls left, spread the rest over the time until reset
+        self.pace_below = int(os.environ.get('GITHUB_RATE_LIMIT_PACE_BELOW', 100))
+        # Longest wait taken in-line; longer waits defer the call instead
+        self.max_wait = float(os.environ.get('GITHUB_RATE_LIMIT_MAX_WAIT', 10))
+        self.secondary_backoff = float(os.environ.get('GITHUB_SECONDARY_BACKOFF', 60))
+        self.secondary_backoff_max = float(os.environ.get('GITHUB_SECONDARY_BACKOFF_MAX', 900))
+        self._secondary_strikes = 0
+
+    async def acquire(self) -> Optional[Throttled]:
+        """Take budget for one call, waiting briefly if needed; Throttled if it must be deferred"""
+        try:
+            while True:
+                now = datetime.utcnow()
+                budget = await database.reserve_rate_limit(self.name, self.reserve)
+                if budget is not None:
+                    await self._pace(budget, now)
+                    return None
+
+                budget = await database.get_rate_limit(self.name) or {}
+                blocked_until = budget.get('blocked_until')
+                reset_at = budget.get('reset_at')
+                if blocked_until and blocked_until > now:
+                    retry_at, reason = blocked_until, budget.get('blocked_reason') or "rate limited"
+                elif budget.get('remaining') is not None and reset_at and reset_at > now:
+                    retry_at, reason = reset_at, "rate limit budget spent"
+                else:
+                    # Nothing reported yet, or the window reset since the last
+                    # response; the next response fills in the budget
+                    return None
+
+                wait = (retry_at - now).total_seconds()
+                if wait > self.max_wait:
+                    return Throttled(retry_at, reason)
+                await asyncio.sleep(wait)
+        except Exception as e:
+            # A budget we can't read must not stop the call; GitHub still enforces its limit
+            logger.warning(f"{self.name} rate limit budget unavailable: {str(e)}")
+            return None
+
+    async def _pace(self, budget: Dict[str, Any], now: datetime):
+        left = budget['remaining'] - self.reserve
+        reset_at = budget.get('reset_at')
+        if left >= self.pace_below or not reset_at or reset_at <= now:
+            return
+        spacing = (reset_at - now).total_seconds() / max(left, 1)
+        await asyncio.sleep(min(spacing, self.max_wait))
+
+    async def record(self, response: httpx.Response) -> Optional[Throttled]:
+        """Store the rate limit a response reported; Throttled if the response was rate limited"""
+        now = datetime.utcnow()
+        fields: Dict[str, Any] = {}
+        remaining = _int_header(response, 'X-RateLimit-Remaining')
+        limit = _int_header(response, 'X-RateLimit-Limit')
+        reset = _int_header(response, 'X-RateLimit-Reset')
+        if remaining is not None:
+            fields['remaining'] = remaining
+        if limit is not None:
+            fields['limit'] = limit
+        if reset is not None:
+            fields['reset_at'] = datetime.utcfromtimestamp(reset)
+
+        throttled = None
+        if response.status_code in (403, 429):
+            retry_after = _int_header(response, 'Retry-After')
+            if retry_after is not None:
+                throttled = Throttled(now + timedelta(seconds=retry_after), "secondary rate limit")
+            elif remaining == 0 and reset is not None:
+                throttled = Throttled(fields['reset_at'], "primary rate limit exhausted")
+            elif 'rate limit' in response.text.lower():
+                # Secondary limit without Retry-After: exponential backoff with full jitter
+                self._secondary_strikes += 1
+                delay = min(self.secondary_backoff_max,
+                            self.secondary_backoff * 2 ** (self._secondary_strikes - 1))
+                throttled = Throttled(now + timedelta(seconds=random.uniform(delay / 2, delay)),
+                                      "secondary rate limit")
+        elif response.status_code < 400:
+            self._secondary_strikes = 0
+
+        if throttled:
+            logger.warning(f"{self.name} {throttled.reason}, blocked until {throttled.retry_at.isoformat()}")
+            fields['blocked_until'] = throttled.retry_at
+            fields['blocked_reason'] = throttled.reason
+        if fields:
+            try:
+                await database.update_rate_limit(self.name, **fields)
+            except Exception as e:
+                logger.warning(f"Could not store {self.name} rate limit: {str(e)}")
+        return throttled
+
+    async def status(self) -> Optional[Dict[str, Any]]:
+        """Last stored budget"""
+        try:
+            budget = await database.get_rate_limit(self.name)
+        except Exception as e:
+            logger.warning(f"{self.name} rate limit budget unavailable: {str(e)}")
+            return None
+        return {k: v for k, v in budget.items() if k != '_id'} if budget else None
@@ -0,0 +1,105 @@
+from database import database
+from services.job_service import job_service
+from services.sync_service import SYNC_INTERVALS
+from typing import Any, Dict, Optional, Tuple
+from datetime import datetime, timedelta
+import asyncio
+import os
+import random
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Lease shared by all workers; only its holder schedules syncs
+LEADER_LEASE = "sync_scheduler_leader"
+
+class SyncScheduler:
+    """Refreshes each source on its own adaptive, jittered interval from the elected leader worker"""
+
+    def __init__(self):
+        self.enabled = os.environ.get('SYNC_SCHEDULER_ENABLED', 'true').lower() == 'true'
+        self.tick = float(os.environ.get('SYNC_SCHEDULER_TICK', 10))
+        self.lease_ttl = int(os.environ.get('SYNC_LEADER_LEASE_TTL', 30))
+        self.jitter = float(os.environ.get('SYNC_INTERVAL_JITTER', 0.1))
+        self.is_leader = False
+        # Per source: (last_synced_at the plan was made from, next run)
+        self._plan: Dict[str, Tuple[Optional[datetime], datetime]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Start competing for the leader lease in the background"""
+        if not self.enabled:
+            logger.info("Sync scheduler disabled")
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop scheduling and hand the lease over to another worker"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.is_leader:
+            await database.release_lock(LEADER_LEASE)
+            self.is_leader = False
+
+    async def _run(self):
+        while True:
+            try:
+                await self._tick()
+            except Exception as e:
+                logger.error(f"Sync scheduler tick failed: {str(e)}")
+            await asyncio.sleep(self.tick)
+
+    async def _tick(self):
+        # Acquiring the lease again while holding it renews it
+        leader = await database.acquire_lock(LEADER_LEASE, self.lease_ttl)
+        if leader != self.is_leader:
+            logger.info("Sync scheduler: acquired leadership" if leader else "Sync scheduler: lost leadership")
+            self.is_leader = leader
+            # A new leader picks up the schedule from the recorded sync times
+            self._plan.clear()
+        if not leader:
+            return
+
+        now = datetime.utcnow()
+        for source, bounds in SYNC_INTERVALS.items():
+            metadata = await database.get_sync_metadata(source) or {}
+            last_synced_at = metadata.get('last_synced_at')
+            planned = self._plan.get(source)
+            if planned is None or planned[0] != last_synced_at:
+                # Replan after every recorded sync, from the interval it chose
+                interval = metadata.get('interval_seconds') or bounds['initial']
+                next_run = last_synced_at + self._jittered(interval) if last_synced_at else now
+                self._plan[source] = (last_synced_at, next_run)
+            if self._plan[source][1] > now:
+                continue
+            throttled_until = metadata.get('throttled_until')
+            if throttled_until and throttled_until > now:
+                continue
+
+            # The job service also attaches to a sync already started by hand
+            job, attached = await job_service.enqueue(source)
+            logger.info(
+                f"Sync scheduler: {source} sync {'already running' if attached else 'started'} (job {job['id']})"
+            )
+            # Retry at the shortest interval if the sync ends without recording a new sync time
+            self._plan[source] = (last_synced_at, now + self._jittered(bounds['min']))
+
+    def _jittered(self, seconds: float) -> timedelta:
+        # Jitter spreads syncs so sources and deployments don't hit upstream APIs in lockstep
+        return timedelta(seconds=seconds * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    def status(self) -> Dict[str, Any]:
+        """Scheduler state of this worker"""
+        return {
+            'enabled': self.enabled,
+            'leader': self.is_leader,
+            'next_run': {source: next_run.isoformat() for source, (_, next_run) in self._plan.items()}
+        }
+
+# Global sync scheduler instance
+sync_scheduler = SyncScheduler()
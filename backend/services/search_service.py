@@ -0,0 +1,55 @@
+from database import database, PROJECTS_SORT, VIDEOS_SORT
+from search import SEARCHABLE, search_index
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+COLLECTION_SORTS = {'projects': PROJECTS_SORT, 'videos': VIDEOS_SORT}
+
+class SearchService:
+    """Keeps this worker's search index in step with the stored data
+
+    Upserts made here update the index in place. A data version that moved
+    without them (another worker synced, or the index was never loaded)
+    reloads that collection once, shared by concurrent searches.
+    """
+
+    def __init__(self):
+        self._loading: Dict[str, asyncio.Task] = {}
+
+    async def warm(self):
+        """Load every searchable collection"""
+        for collection in SEARCHABLE:
+            await self._ensure_current(collection)
+
+    async def search(self, query: str, collections: Optional[List[str]] = None,
+                     limit: int = 10) -> List[Dict[str, Any]]:
+        """Ranked hits for a query across the given collections"""
+        collections = collections or list(SEARCHABLE)
+        for collection in collections:
+            await self._ensure_current(collection)
+        return search_index.search(query, collections, limit)
+
+    async def _ensure_current(self, collection: str):
+        version = await database.get_data_version(collection)
+        if search_index.indexes[collection].version == version['version']:
+            return
+        task = self._loading.get(collection)
+        if task is None or task.done():
+            task = asyncio.create_task(self._load(collection, version['version']))
+            self._loading[collection] = task
+        await asyncio.shield(task)
+
+    async def _load(self, collection: str, version: int):
+        # Read the version before the documents: a write racing the load
+        # leaves the index behind and it is loaded again
+        documents = [
+            document async for document in database.iter_collection(collection, COLLECTION_SORTS[collection])
+        ]
+        search_index.load(collection, documents, version)
+        logger.info(f"Search index loaded {len(documents)} {collection} at version {version}")
+
+# Global search service instance
+search_service = SearchService()
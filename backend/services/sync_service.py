@@ -0,0 +1,215 @@
+from database import database
+from services.github_service import IncompleteFetch, github_service
+from services.rate_limit import Throttled
+from services.ranking import project_ranking
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from datetime import datetime, timedelta
+import asyncio
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Per-source sync deadlines, in seconds; a sync past its deadline keeps running but is reported late
+SYNC_DEADLINES = {
+    'projects': float(os.environ.get('SYNC_PROJECTS_DEADLINE', 20)),
+    'videos': float(os.environ.get('SYNC_VIDEOS_DEADLINE', 10)),
+}
+DEFAULT_SYNC_DEADLINE = 15.0
+
+# Sync interval per source, in seconds: where it starts and the bounds it adapts within
+SYNC_INTERVALS = {
+    'projects': {
+        'initial': float(os.environ.get('SYNC_PROJECTS_INTERVAL', 6 * 3600)),
+        'min': float(os.environ.get('SYNC_PROJECTS_MIN_INTERVAL', 15 * 60)),
+        'max': float(os.environ.get('SYNC_PROJECTS_MAX_INTERVAL', 24 * 3600)),
+    },
+    'videos': {
+        'initial': float(os.environ.get('SYNC_VIDEOS_INTERVAL', 6 * 3600)),
+        'min': float(os.environ.get('SYNC_VIDEOS_MIN_INTERVAL', 3600)),
+        'max': float(os.environ.get('SYNC_VIDEOS_MAX_INTERVAL', 48 * 3600)),
+    },
+}
+# Interval multipliers after a sync that found changes and one that did not
+SYNC_INTERVAL_SHRINK = float(os.environ.get('SYNC_INTERVAL_SHRINK', 0.5))
+SYNC_INTERVAL_BACKOFF = float(os.environ.get('SYNC_INTERVAL_BACKOFF', 2.0))
+
+def _empty_stats() -> Dict[str, int]:
+    return {'fetched': 0, 'inserted': 0, 'changed': 0, 'unchanged': 0, 'synced': 0}
+
+def _add_write_stats(stats: Dict[str, int], write_stats: Dict[str, int]):
+    for field in ('inserted', 'changed', 'unchanged'):
+        stats[field] += write_stats.get(field, 0)
+    stats['synced'] = stats['inserted'] + stats['changed']
+
+def next_sync_interval(source: str, previous: Optional[float], changes: int) -> Tuple[float, str]:
+    """Adapt a source's sync interval to whether its last sync found changes
+
+    Returns (interval in seconds, reason). Syncs that find changes halve the
+    interval, syncs that don't back off exponentially, within the bounds.
+    """
+    bounds = SYNC_INTERVALS[source]
+    current = min(max(previous or bounds['initial'], bounds['min']), bounds['max'])
+    if changes:
+        interval = max(bounds['min'], current * SYNC_INTERVAL_SHRINK)
+        reason = f"{changes} changes found, shortened"
+    else:
+        interval = min(bounds['max'], current * SYNC_INTERVAL_BACKOFF)
+        reason = "no changes found, backed off"
+    if interval in (bounds['min'], bounds['max']):
+        reason += f" to the {'minimum' if interval == bounds['min'] else 'maximum'}"
+    return interval, reason
+
+async def _record_sync(source: str, stats: Optional[Dict[str, int]]):
+    """Mark a source synced along with the interval chosen for its next sync"""
+    metadata = await database.get_sync_metadata(source) or {}
+    interval, reason = next_sync_interval(
+        source, metadata.get('interval_seconds'), stats['synced'] if stats else 0
+    )
+    fields = {
+        'interval_seconds': interval,
+        'interval_reason': reason,
+        'next_sync_at': datetime.utcnow() + timedelta(seconds=interval)
+    }
+    if stats is not None:
+        fields['last_stats'] = stats
+    await database.mark_synced(source, **fields)
+
+ProgressHandler = Callable[[Dict[str, int]], Awaitable[None]]
+
+async def _stream_projects(username: str, stats: Dict[str, int],
+                           on_progress: Optional[ProgressHandler]) -> Union[Dict[str, int], Throttled, None]:
+    async def store_page(repos: List[dict]):
+        stats['fetched'] += len(repos)
+        _add_write_stats(stats, await database.upsert_projects(repos))
+        if on_progress:
+            await on_progress(dict(stats))
+
+    try:
+        github_repos = await github_service.get_user_repos(username, on_page=store_page)
+    except IncompleteFetch:
+        # A failed sync: pages stored so far stay and get ranked with the rest
+        if stats['synced']:
+            stats['reranked'] = await database.rank_projects(project_ranking.rank)
+        raise
+    if github_repos is None:
+        # 304 from GitHub: nothing to parse or write, the cache is still fresh;
+        # re-ranking only picks up a changed ranking configuration
+        stats['reranked'] = await database.rank_projects(project_ranking.rank)
+        await _record_sync('projects', None)
+        return None
+    # Featured is top K of every stored project, so ranking waits for the last page
+    if isinstance(github_repos, Throttled):
+        # Not a sync: pages stored so far stay and get ranked with the rest,
+        # the scheduler retries after retry_at
+        if stats['synced']:
+            stats['reranked'] = await database.rank_projects(project_ranking.rank)
+        await database.update_sync_metadata('projects', throttled_until=github_repos.retry_at)
+        return github_repos
+    
+    if stats['fetched']:
+        stats['reranked'] = await database.rank_projects(project_ranking.rank)
+        await _record_sync('projects', stats)
+    return stats
+
+async def sync_github_projects(username: str,
+                               on_progress: Optional[ProgressHandler] = None) -> Union[Dict[str, int], Throttled, None]:
+    """Stream GitHub repositories into the projects collection page by page
+
+    Returns fetched/inserted/changed/unchanged/reranked counts, None if GitHub
+    reported no changes, or Throttled if rate limiting deferred the sync.
+    Raises GitHubError if GitHub failed, IncompleteFetch if only a page
+    after the first did. on_progress receives the running counts after each
+    stored page.
+    """
+    stats = _empty_stats()
+    try:
+        return await _stream_projects(username, stats, on_progress)
+    finally:
+        # Counters and facets are recounted once per sync, not per stored page
+        if stats['synced'] or stats.get('reranked'):
+            await database.refresh_summaries('projects')
+
+async def get_github_username() -> str:
+    """GitHub username from the profile; raises LookupError if it is not configured"""
+    profile = await database.get_profile()
+    if not profile:
+        raise LookupError("Profile not found")
+    github_username = profile.get('github_username')
+    if not github_username:
+        raise LookupError("GitHub username not configured")
+    return github_username
+
+async def sync_profile_projects(on_progress: Optional[ProgressHandler] = None) -> Union[Dict[str, int], Throttled, None]:
+    """Sync the projects of the GitHub account configured in the profile"""
+    return await sync_github_projects(await get_github_username(), on_progress)
+
+def get_mock_videos() -> List[Dict[str, Any]]:
+    """Video data served until the YouTube Data API v3 integration lands"""
+    return [
+        {
+            "id": "1",
+            "youtube_id": "dQw4w9WgXcQ",
+            "title": "Building AI-Powered Applications",
+            "description": "Deep dive into creating intelligent software solutions",
+            "thumbnail": "https://images.unsplash.com/photo-1555949963-aa79dcee981c?w=600&h=400&fit=crop",
+            "published_at": datetime(2025, 7, 1),
+            "view_count": 25000,
+            "duration": "15:32",
+            "is_featured": True
+        },
+        {
+            "id": "2",
+            "youtube_id": "dQw4w9WgXcQ2",
+            "title": "Future of Cybersecurity",
+            "description": "Exploring emerging threats and defense mechanisms",
+            "thumbnail": "https://images.unsplash.com/photo-1563206767-5b18f218e8de?w=600&h=400&fit=crop",
+            "published_at": datetime(2025, 6, 15),
+            "view_count": 18000,
+            "duration": "22:45",
+            "is_featured": True
+        },
+        {
+            "id": "3",
+            "youtube_id": "dQw4w9WgXcQ3",
+            "title": "Quantum Computing Explained",
+            "description": "Making quantum concepts accessible to developers",
+            "thumbnail": "https://images.unsplash.com/photo-1635070041078-e363dbe005cb?w=600&h=400&fit=crop",
+            "published_at": datetime(2025, 6, 1),
+            "view_count": 32000,
+            "duration": "18:20",
+            "is_featured": True
+        }
+    ]
+
+async def sync_youtube_videos() -> Dict[str, int]:
+    """Store the latest videos, writing only the ones that changed"""
+    videos = get_mock_videos()
+    stats = _empty_stats()
+    stats['fetched'] = len(videos)
+    _add_write_stats(stats, await database.upsert_videos(videos))
+    if stats['synced']:
+        await database.refresh_summaries('videos')
+    await _record_sync('videos', stats)
+    return stats
+
+async def run_with_deadline(source: str, sync: Callable[[], Awaitable[Any]],
+                            on_deadline: Callable[[], Awaitable[None]]) -> Any:
+    """Run one source sync under its deadline without cutting it short
+
+    A sync that misses its deadline is not cancelled: on_deadline is
+    awaited once and the sync's result is still returned when it
+    finishes, so its job stays active for as long as it runs. Only
+    cancelling the caller (shutdown) cancels the sync.
+    """
+    task = asyncio.create_task(sync())
+    try:
+        deadline = SYNC_DEADLINES.get(source, DEFAULT_SYNC_DEADLINE)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), deadline)
+        except asyncio.TimeoutError:
+            await on_deadline()
+            return await task
+    finally:
+        if not task.done():
+            task.cancel()
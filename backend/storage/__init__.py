@@ -0,0 +1,22 @@
+from typing import Optional
+from storage.base import Storage
+import os
+
+ENGINES = ('mongo', 'sqlite', 'memory')
+
+def create_storage(engine: Optional[str] = None) -> Storage:
+    """Storage engine named by STORAGE_ENGINE: mongo (default), sqlite or memory"""
+    engine = (engine or os.environ.get('STORAGE_ENGINE', 'mongo')).lower()
+    # Imported lazily so an engine's driver is only needed when it is selected
+    if engine == 'mongo':
+        from storage.mongo import MongoStorage
+        return MongoStorage()
+    if engine == 'sqlite':
+        from storage.sqlite import SQLiteStorage
+        return SQLiteStorage()
+    if engine == 'memory':
+        from storage.memory import MemoryStorage
+        return MemoryStorage()
+    raise ValueError(f"Unknown STORAGE_ENGINE {engine!r}, expected one of {', '.join(ENGINES)}")
+
+__all__ = ['ENGINES', 'Storage', 'create_storage']
@@ -0,0 +1,162 @@
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+
+# Key field of each synced collection
+ITEM_KEYS = {'projects': 'github_id', 'videos': 'youtube_id'}
+
+def naive_utc(value: Any) -> Any:
+    """Store datetimes as naive UTC, as MongoDB returns them, so every engine compares them alike"""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    if isinstance(value, dict):
+        return {k: naive_utc(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [naive_utc(v) for v in value]
+    return value
+
+def matches(document: Dict[str, Any], match: Dict[str, Any]) -> bool:
+    """Whether a document satisfies a find_items match, for engines without a query language"""
+    for field, condition in match.items():
+        value = document.get(field)
+        if isinstance(condition, dict):
+            if value is None or value < condition['$gte']:
+                return False
+        elif isinstance(value, list):
+            if condition not in value:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+def select_fields(document: Dict[str, Any], fields: Optional[List[str]], sort: List[tuple]) -> Dict[str, Any]:
+    """Keep only the given fields plus the sort keys, like a Mongo projection"""
+    if not fields:
+        return document
+    keep = set(fields) | {field for field, _ in sort}
+    return {k: v for k, v in document.items() if k in keep}
+
+class Storage(ABC):
+    """Storage engine behind Database
+
+    Engines only store and query. Read caching, data versions, counters and
+    the delta-write policy live in Database, so they behave the same on
+    every engine. Synced collections (projects, videos) are sorted by
+    two-key descending sorts and paged by keyset: after holds the sort-key
+    values of the last document of the previous page.
+
+    A match maps fields to a value, which a list field matches when it
+    contains it, or to {'$gte': value}: the subset of Mongo filters the
+    read paths use.
+    """
+
+    name: str
+
+    # Lifecycle
+    @abstractmethod
+    async def connect(self) -> None: ...
+
+    @abstractmethod
+    async def close(self) -> None: ...
+
+    @abstractmethod
+    async def ping(self) -> None: ...
+
+    @abstractmethod
+    async def ensure_indexes(self) -> Dict[str, Dict[str, List[str]]]: ...
+
+    @abstractmethod
+    async def explain_query_shapes(self) -> List[Dict[str, Any]]: ...
+
+    # Profile
+    @abstractmethod
+    async def get_profile(self) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    async def insert_profile(self, profile: Dict[str, Any]) -> str: ...
+
+    @abstractmethod
+    async def replace_profile(self, profile: Dict[str, Any]) -> bool: ...
+
+    # Synced collections
+    @abstractmethod
+    async def find_items(self, collection: str, sort: List[tuple], match: Dict[str, Any],
+                         fields: Optional[List[str]] = None, limit: Optional[int] = None,
+                         after: Optional[List[Any]] = None) -> List[Dict[str, Any]]:
+        """Documents satisfying match on every given field, in sort order"""
+
+    @abstractmethod
+    async def get_content_hashes(self, collection: str, keys: List[Any]) -> Dict[Any, Optional[str]]:
+        """Stored content hash per key, for the keys that exist"""
+
+    @abstractmethod
+    async def upsert_items(self, collection: str, documents: List[Dict[str, Any]],
+                           keep: Tuple[str, ...] = ()) -> None:
+        """Insert or overwrite documents by key; an existing document keeps its id
+
+        Fields named in keep are only written on insert; an existing
+        document keeps its stored values.
+        """
+
+    @abstractmethod
+    def iter_items(self, collection: str, sort: List[tuple], batch_size: int) -> AsyncIterator[Dict[str, Any]]:
+        """Every document of a collection in sort order, fetched batch_size at a time"""
+
+    @abstractmethod
+    async def count(self, collection: str, match: Dict[str, Any]) -> int: ...
+
+    @abstractmethod
+    async def facet_counts(self, collection: str, field: str) -> Dict[Any, int]:
+        """Documents per distinct value of a field, counting each element of a list field"""
+
+    # Social links
+    @abstractmethod
+    async def get_active_social_links(self) -> List[Dict[str, Any]]: ...
+
+    @abstractmethod
+    async def insert_social_link(self, link: Dict[str, Any]) -> str: ...
+
+    @abstractmethod
+    async def update_social_link(self, link_id: str, fields: Dict[str, Any]) -> bool: ...
+
+    # Small named documents: data_versions, sync_metadata, rate_limits, stats
+    @abstractmethod
+    async def get_document(self, collection: str, name: str) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    async def set_fields(self, collection: str, name: str, fields: Dict[str, Any]) -> None:
+        """Set fields on a named document, creating it if needed"""
+
+    @abstractmethod
+    async def increment(self, collection: str, name: str, field: str, fields: Dict[str, Any]) -> None:
+        """Add one to a counter field and set fields, creating the document if needed"""
+
+    # Locks and rate limits shared by workers
+    @abstractmethod
+    async def acquire_lock(self, name: str, owner: str, now: datetime, expires_at: datetime) -> bool:
+        """Take a lock that is free, expired or already held by owner"""
+
+    @abstractmethod
+    async def release_lock(self, name: str, owner: str) -> None: ...
+
+    @abstractmethod
+    async def reserve_rate_limit(self, name: str, reserve: int, now: datetime) -> Optional[Dict[str, Any]]:
+        """Take one call from an unblocked budget with more than reserve left; the budget before, or None"""
+
+    # Sync jobs
+    @abstractmethod
+    async def find_active_job(self, source: str) -> Optional[Dict[str, Any]]: ...
+
+    @abstractmethod
+    async def insert_job(self, job: Dict[str, Any]) -> bool:
+        """Insert an active job; False if the source already has one"""
+
+    @abstractmethod
+    async def update_job(self, job_id: str, fields: Dict[str, Any]) -> None: ...
+
+    @abstractmethod
+    async def finish_job(self, job_id: str, fields: Dict[str, Any]) -> None:
+        """Set fields and release the job's source for the next active job"""
+
+    @abstractmethod
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]: ...
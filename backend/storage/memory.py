@@ -0,0 +1,283 @@
+from bisect import bisect_left, insort
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+from datetime import datetime
+from storage.base import ITEM_KEYS, Storage, matches, naive_utc, select_fields
+import asyncio
+import copy
+import uuid
+
+class _SortIndex:
+    """Keys of a collection kept in ascending order of a two-key sort, read backwards for descending"""
+
+    def __init__(self, fields: Tuple[str, str], key: str, documents: Dict[Any, Dict[str, Any]]):
+        self.fields = fields
+        self.key = key
+        self.entries: List[tuple] = sorted(self._entry(doc) for doc in documents.values())
+
+    def _entry(self, document: Dict[str, Any]) -> tuple:
+        return (document.get(self.fields[0]), document.get(self.fields[1]), document[self.key])
+
+    def add(self, document: Dict[str, Any]):
+        insort(self.entries, self._entry(document))
+
+    def remove(self, document: Dict[str, Any]):
+        entry = self._entry(document)
+        position = bisect_left(self.entries, entry)
+        if position < len(self.entries) and self.entries[position] == entry:
+            del self.entries[position]
+
+    def descending(self, after: Optional[List[Any]] = None):
+        # Entries before the bisect position sort strictly below after
+        position = bisect_left(self.entries, tuple(after)) if after else len(self.entries)
+        for index in range(position - 1, -1, -1):
+            yield self.entries[index][2]
+
+def _values(document: Dict[str, Any], field: str) -> List[Any]:
+    """Index entries of a field: each element of a list, else the value itself"""
+    value = document.get(field)
+    return value if isinstance(value, list) else [value]
+
+class _ItemCollection:
+    """A synced collection: documents by key, plus sort and equality indexes"""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.documents: Dict[Any, Dict[str, Any]] = {}
+        self.sort_indexes: Dict[Tuple[str, str], _SortIndex] = {}
+        self.value_indexes: Dict[str, Dict[Any, Set[Any]]] = {}
+
+    def sort_index(self, sort: List[tuple]) -> _SortIndex:
+        fields = tuple(field for field, _ in sort)
+        if fields not in self.sort_indexes:
+            self.sort_indexes[fields] = _SortIndex(fields, self.key, self.documents)
+        return self.sort_indexes[fields]
+
+    def value_index(self, field: str) -> Dict[Any, Set[Any]]:
+        if field not in self.value_indexes:
+            index: Dict[Any, Set[Any]] = {}
+            for key, document in self.documents.items():
+                for value in _values(document, field):
+                    index.setdefault(value, set()).add(key)
+            self.value_indexes[field] = index
+        return self.value_indexes[field]
+
+    def matching(self, match: Dict[str, Any]) -> Optional[Set[Any]]:
+        """Keys matching the equality conditions of match, or None for no such condition"""
+        keys = None
+        for field, value in match.items():
+            if isinstance(value, dict):
+                continue
+            found = self.value_index(field).get(value, set())
+            keys = found if keys is None else keys & found
+        return keys
+
+    def put(self, document: Dict[str, Any]):
+        key = document[self.key]
+        previous = self.documents.get(key)
+        if previous is not None:
+            self._unindex(previous)
+        self.documents[key] = document
+        for index in self.sort_indexes.values():
+            index.add(document)
+        for field, index in self.value_indexes.items():
+            for value in _values(document, field):
+                index.setdefault(value, set()).add(key)
+
+    def _unindex(self, document: Dict[str, Any]):
+        key = document[self.key]
+        for index in self.sort_indexes.values():
+            index.remove(document)
+        for field, index in self.value_indexes.items():
+            for value in _values(document, field):
+                index.get(value, set()).discard(key)
+
+class MemoryStorage(Storage):
+    """Process-local storage in indexed dicts; data lasts as long as the process
+
+    Locks and jobs are only shared within the process, so run a single
+    worker on this engine.
+    """
+
+    name = 'memory'
+
+    def __init__(self):
+        self.items = {name: _ItemCollection(key) for name, key in ITEM_KEYS.items()}
+        self.profile: Optional[Dict[str, Any]] = None
+        self.social_links: Dict[str, Dict[str, Any]] = {}
+        self.documents: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.active_jobs: Dict[str, str] = {}
+
+    async def connect(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def ping(self):
+        pass
+
+    async def ensure_indexes(self) -> Dict[str, Dict[str, List[str]]]:
+        # Indexes are built on first use and maintained on every write
+        return {}
+
+    async def explain_query_shapes(self) -> List[Dict[str, Any]]:
+        return []
+
+    # Profile
+    async def get_profile(self) -> Optional[Dict[str, Any]]:
+        return copy.deepcopy(self.profile)
+
+    async def insert_profile(self, profile: Dict[str, Any]) -> str:
+        self.profile = naive_utc(copy.deepcopy(profile))
+        return 'profile'
+
+    async def replace_profile(self, profile: Dict[str, Any]) -> bool:
+        profile = naive_utc(copy.deepcopy(profile))
+        changed = profile != self.profile
+        self.profile = profile
+        return changed
+
+    # Synced collections
+    async def find_items(self, collection: str, sort: List[tuple], match: Dict[str, Any],
+                         fields: Optional[List[str]] = None, limit: Optional[int] = None,
+                         after: Optional[List[Any]] = None) -> List[Dict[str, Any]]:
+        items = self.items[collection]
+        allowed = items.matching(match)
+        ranges = {field: value for field, value in match.items() if isinstance(value, dict)}
+        results = []
+        for key in items.sort_index(sort).descending(after):
+            if allowed is not None and key not in allowed:
+                continue
+            if ranges and not matches(items.documents[key], ranges):
+                continue
+            results.append(select_fields(dict(items.documents[key]), fields, sort))
+            if limit and len(results) >= limit:
+                break
+        return results
+
+    async def get_content_hashes(self, collection: str, keys: List[Any]) -> Dict[Any, Optional[str]]:
+        documents = self.items[collection].documents
+        return {key: documents[key].get('content_hash') for key in keys if key in documents}
+
+    async def upsert_items(self, collection: str, documents: List[Dict[str, Any]],
+                           keep: Tuple[str, ...] = ()) -> None:
+        items = self.items[collection]
+        for document in documents:
+            document = naive_utc(copy.deepcopy(document))
+            existing = items.documents.get(document[items.key])
+            if existing is not None:
+                document['id'] = existing['id']
+                for field in keep:
+                    if field in existing:
+                        document[field] = existing[field]
+            items.put(document)
+
+    async def iter_items(self, collection: str, sort: List[tuple], batch_size: int) -> AsyncIterator[Dict[str, Any]]:
+        items = self.items[collection]
+        keys = list(items.sort_index(sort).descending())
+        for start in range(0, len(keys), batch_size):
+            for key in keys[start:start + batch_size]:
+                if key in items.documents:
+                    yield dict(items.documents[key])
+            # Let other requests run between batches
+            await asyncio.sleep(0)
+
+    async def count(self, collection: str, match: Dict[str, Any]) -> int:
+        if collection == 'social_links':
+            return sum(
+                all(link.get(field) == value for field, value in match.items())
+                for link in self.social_links.values()
+            )
+        items = self.items[collection]
+        allowed = items.matching(match)
+        return len(items.documents) if allowed is None else len(allowed)
+
+    async def facet_counts(self, collection: str, field: str) -> Dict[Any, int]:
+        index = self.items[collection].value_index(field)
+        return {value: len(keys) for value, keys in index.items() if value is not None and keys}
+
+    # Social links
+    async def get_active_social_links(self) -> List[Dict[str, Any]]:
+        links = [dict(link) for link in self.social_links.values() if link.get('is_active')]
+        return sorted(links, key=lambda link: link.get('order', 0))
+
+    async def insert_social_link(self, link: Dict[str, Any]) -> str:
+        link = naive_utc(copy.deepcopy(link))
+        link.setdefault('id', str(uuid.uuid4()))
+        self.social_links[link['id']] = link
+        return link['id']
+
+    async def update_social_link(self, link_id: str, fields: Dict[str, Any]) -> bool:
+        link = self.social_links.get(link_id)
+        if link is None:
+            return False
+        updated = {**link, **naive_utc(copy.deepcopy(fields))}
+        self.social_links[link_id] = updated
+        return updated != link
+
+    # Small named documents
+    async def get_document(self, collection: str, name: str) -> Optional[Dict[str, Any]]:
+        document = self.documents.get(collection, {}).get(name)
+        return copy.deepcopy(document) if document is not None else None
+
+    async def set_fields(self, collection: str, name: str, fields: Dict[str, Any]) -> None:
+        document = self.documents.setdefault(collection, {}).setdefault(name, {'_id': name})
+        document.update(naive_utc(copy.deepcopy(fields)))
+
+    async def increment(self, collection: str, name: str, field: str, fields: Dict[str, Any]) -> None:
+        document = self.documents.setdefault(collection, {}).setdefault(name, {'_id': name})
+        document[field] = document.get(field, 0) + 1
+        document.update(naive_utc(copy.deepcopy(fields)))
+
+    # Locks and rate limits
+    async def acquire_lock(self, name: str, owner: str, now: datetime, expires_at: datetime) -> bool:
+        lock = self.documents.setdefault('locks', {}).get(name)
+        if lock and lock['owner'] != owner and lock['expires_at'] >= now:
+            return False
+        await self.set_fields('locks', name, {'owner': owner, 'acquired_at': now, 'expires_at': expires_at})
+        return True
+
+    async def release_lock(self, name: str, owner: str) -> None:
+        locks = self.documents.get('locks', {})
+        if locks.get(name, {}).get('owner') == owner:
+            del locks[name]
+
+    async def reserve_rate_limit(self, name: str, reserve: int, now: datetime) -> Optional[Dict[str, Any]]:
+        budget = self.documents.get('rate_limits', {}).get(name)
+        if not budget or budget.get('remaining') is None or budget['remaining'] <= reserve:
+            return None
+        if budget.get('blocked_until') and budget['blocked_until'] > now:
+            return None
+        before = copy.deepcopy(budget)
+        budget['remaining'] -= 1
+        return before
+
+    # Sync jobs
+    async def find_active_job(self, source: str) -> Optional[Dict[str, Any]]:
+        job_id = self.active_jobs.get(source)
+        return copy.deepcopy(self.jobs[job_id]) if job_id else None
+
+    async def insert_job(self, job: Dict[str, Any]) -> bool:
+        if job['source'] in self.active_jobs:
+            return False
+        self.jobs[job['_id']] = copy.deepcopy(job)
+        self.active_jobs[job['source']] = job['_id']
+        return True
+
+    async def update_job(self, job_id: str, fields: Dict[str, Any]) -> None:
+        if job_id in self.jobs:
+            self.jobs[job_id].update(copy.deepcopy(fields))
+
+    async def finish_job(self, job_id: str, fields: Dict[str, Any]) -> None:
+        job = self.jobs.get(job_id)
+        if job is None:
+            return
+        job.update(copy.deepcopy(fields))
+        job.pop('active', None)
+        if self.active_jobs.get(job['source']) == job_id:
+            del self.active_jobs[job['source']]
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.jobs.get(job_id)
+        return copy.deepcopy(job) if job else None
@@ -0,0 +1,191 @@
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from datetime import datetime
+from indexes import ensure_indexes, explain_query_shapes
+from storage.base import ITEM_KEYS, Storage
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+def _projection(fields: Optional[List[str]], sort: List[tuple]) -> Optional[Dict[str, int]]:
+    """Mongo projection returning only the given fields plus the sort keys, or everything when None"""
+    if not fields:
+        return None
+    return {'_id': 0, **{field: 1 for field in fields}, **{field: 1 for field, _ in sort}}
+
+def _keyset_filter(sort: List[tuple], after: List[Any]) -> Dict[str, Any]:
+    """Match documents strictly after the given values of a two-key descending sort"""
+    (primary, _), (tiebreak, _) = sort
+    return {'$or': [
+        {primary: {'$lt': after[0]}},
+        {primary: after[0], tiebreak: {'$lt': after[1]}}
+    ]}
+
+class MongoStorage(Storage):
+    """MongoDB through Motor; MONGO_URL and DB_NAME select the database"""
+
+    name = 'mongo'
+
+    def __init__(self):
+        self.client: Optional[AsyncIOMotorClient] = None
+        self.database = None
+
+    async def connect(self):
+        self.client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+        self.database = self.client[os.environ['DB_NAME']]
+        await self.ping()
+
+    async def close(self):
+        if self.client:
+            self.client.close()
+
+    async def ping(self):
+        await self.client.admin.command('ping')
+
+    async def ensure_indexes(self) -> Dict[str, Dict[str, List[str]]]:
+        return await ensure_indexes(self.database)
+
+    async def explain_query_shapes(self) -> List[Dict[str, Any]]:
+        return await explain_query_shapes(self.database)
+
+    # Profile
+    async def get_profile(self) -> Optional[Dict[str, Any]]:
+        return await self.database.profiles.find_one()
+
+    async def insert_profile(self, profile: Dict[str, Any]) -> str:
+        result = await self.database.profiles.insert_one(profile)
+        return str(result.inserted_id)
+
+    async def replace_profile(self, profile: Dict[str, Any]) -> bool:
+        result = await self.database.profiles.replace_one({}, profile, upsert=True)
+        return result.modified_count > 0 or result.upserted_id is not None
+
+    # Synced collections
+    async def find_items(self, collection: str, sort: List[tuple], match: Dict[str, Any],
+                         fields: Optional[List[str]] = None, limit: Optional[int] = None,
+                         after: Optional[List[Any]] = None) -> List[Dict[str, Any]]:
+        query = dict(match)
+        if after:
+            query.update(_keyset_filter(sort, after))
+        cursor = self.database[collection].find(query, _projection(fields, sort)).sort(sort)
+        if limit:
+            cursor = cursor.limit(limit)
+        return await cursor.to_list(length=None)
+
+    async def get_content_hashes(self, collection: str, keys: List[Any]) -> Dict[Any, Optional[str]]:
+        key = ITEM_KEYS[collection]
+        cursor = self.database[collection].find({key: {'$in': keys}}, {key: 1, 'content_hash': 1})
+        return {doc[key]: doc.get('content_hash') async for doc in cursor}
+
+    async def upsert_items(self, collection: str, documents: List[Dict[str, Any]],
+                           keep: Tuple[str, ...] = ()) -> None:
+        key = ITEM_KEYS[collection]
+        insert_only = ('id',) + keep
+        operations = []
+        for document in documents:
+            content = {k: v for k, v in document.items() if k not in insert_only}
+            on_insert = {k: document[k] for k in insert_only if k in document}
+            operations.append(UpdateOne(
+                {key: document[key]},
+                {'$set': content, '$setOnInsert': on_insert},
+                upsert=True
+            ))
+        if operations:
+            await self.database[collection].bulk_write(operations, ordered=False)
+
+    async def iter_items(self, collection: str, sort: List[tuple], batch_size: int) -> AsyncIterator[Dict[str, Any]]:
+        cursor = self.database[collection].find({}, {'_id': 0}).sort(sort).batch_size(batch_size)
+        async for document in cursor:
+            yield document
+
+    async def count(self, collection: str, match: Dict[str, Any]) -> int:
+        return await self.database[collection].count_documents(match)
+
+    async def facet_counts(self, collection: str, field: str) -> Dict[Any, int]:
+        # $unwind passes scalar values through as one element
+        pipeline = [
+            {'$match': {field: {'$ne': None}}},
+            {'$unwind': f'${field}'},
+            {'$group': {'_id': f'${field}', 'count': {'$sum': 1}}},
+        ]
+        cursor = self.database[collection].aggregate(pipeline)
+        return {group['_id']: group['count'] async for group in cursor}
+
+    # Social links
+    async def get_active_social_links(self) -> List[Dict[str, Any]]:
+        cursor = self.database.social_links.find({'is_active': True}).sort('order', 1)
+        return await cursor.to_list(length=None)
+
+    async def insert_social_link(self, link: Dict[str, Any]) -> str:
+        result = await self.database.social_links.insert_one(link)
+        return str(result.inserted_id)
+
+    async def update_social_link(self, link_id: str, fields: Dict[str, Any]) -> bool:
+        result = await self.database.social_links.update_one({'id': link_id}, {'$set': fields})
+        return result.modified_count > 0
+
+    # Small named documents
+    async def get_document(self, collection: str, name: str) -> Optional[Dict[str, Any]]:
+        return await self.database[collection].find_one({'_id': name})
+
+    async def set_fields(self, collection: str, name: str, fields: Dict[str, Any]) -> None:
+        await self.database[collection].update_one({'_id': name}, {'$set': fields}, upsert=True)
+
+    async def increment(self, collection: str, name: str, field: str, fields: Dict[str, Any]) -> None:
+        await self.database[collection].update_one(
+            {'_id': name}, {'$inc': {field: 1}, '$set': fields}, upsert=True
+        )
+
+    # Locks and rate limits
+    async def acquire_lock(self, name: str, owner: str, now: datetime, expires_at: datetime) -> bool:
+        try:
+            # The filter only matches a free, expired or already-owned lock; otherwise
+            # the upsert collides on _id and another worker holds the lock.
+            await self.database.locks.update_one(
+                {'_id': name, '$or': [{'expires_at': {'$lt': now}}, {'owner': owner}]},
+                {'$set': {'owner': owner, 'acquired_at': now, 'expires_at': expires_at}},
+                upsert=True
+            )
+            return True
+        except DuplicateKeyError:
+            return False
+
+    async def release_lock(self, name: str, owner: str) -> None:
+        await self.database.locks.delete_one({'_id': name, 'owner': owner})
+
+    async def reserve_rate_limit(self, name: str, reserve: int, now: datetime) -> Optional[Dict[str, Any]]:
+        return await self.database.rate_limits.find_one_and_update(
+            {
+                '_id': name,
+                'remaining': {'$gt': reserve},
+                'blocked_until': {'$not': {'$gt': now}}
+            },
+            {'$inc': {'remaining': -1}},
+            return_document=ReturnDocument.BEFORE
+        )
+
+    # Sync jobs
+    async def find_active_job(self, source: str) -> Optional[Dict[str, Any]]:
+        return await self.database.sync_jobs.find_one({'source': source, 'active': True})
+
+    async def insert_job(self, job: Dict[str, Any]) -> bool:
+        try:
+            # The unique partial index on active jobs rejects a second one per source
+            await self.database.sync_jobs.insert_one(job)
+            return True
+        except DuplicateKeyError:
+            return False
+
+    async def update_job(self, job_id: str, fields: Dict[str, Any]) -> None:
+        await self.database.sync_jobs.update_one({'_id': job_id}, {'$set': fields})
+
+    async def finish_job(self, job_id: str, fields: Dict[str, Any]) -> None:
+        await self.database.sync_jobs.update_one(
+            {'_id': job_id}, {'$set': fields, '$unset': {'active': ''}}
+        )
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self.database.sync_jobs.find_one({'_id': job_id})
@@ -0,0 +1,494 @@
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from datetime import datetime
+from storage.base import ITEM_KEYS, Storage, naive_utc, select_fields
+import asyncio
+import json
+import os
+import sqlite3
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Columns copied out of each document so they can be filtered, sorted and indexed
+# List fields get a side table of (value, sort key, key) rows so a contains
+# filter walks an index in sort order
+ITEM_TABLES = {
+    'projects': {
+        'columns': {'github_id': 'INTEGER PRIMARY KEY', 'id': 'TEXT NOT NULL',
+                    'updated_at': 'TEXT', 'is_featured': 'INTEGER', 'content_hash': 'TEXT',
+                    'language': 'TEXT', 'stargazers_count': 'INTEGER', 'score': 'REAL'},
+        'lists': {'topics': {'table': 'projects_topics', 'columns': {'updated_at': 'TEXT', 'github_id': 'INTEGER NOT NULL'}}},
+        'indexes': {
+            'projects_id': 'UNIQUE INDEX projects_id ON projects(id)',
+            'projects_updated_at_github_id':
+                'INDEX projects_updated_at_github_id ON projects(updated_at DESC, github_id DESC)',
+            'projects_is_featured_updated_at_github_id':
+                'INDEX projects_is_featured_updated_at_github_id ON projects(is_featured, updated_at DESC, github_id DESC)',
+            'projects_score_github_id': 'INDEX projects_score_github_id ON projects(score DESC, github_id DESC)',
+            'projects_is_featured_score_github_id':
+                'INDEX projects_is_featured_score_github_id ON projects(is_featured, score DESC, github_id DESC)',
+            'projects_language_updated_at_github_id_stargazers_count':
+                'INDEX projects_language_updated_at_github_id_stargazers_count '
+                'ON projects(language, updated_at DESC, github_id DESC, stargazers_count)',
+            'projects_topics_value_updated_at_github_id':
+                'INDEX projects_topics_value_updated_at_github_id '
+                'ON projects_topics(value, updated_at DESC, github_id DESC)',
+            'projects_topics_github_id': 'INDEX projects_topics_github_id ON projects_topics(github_id)',
+        },
+    },
+    'videos': {
+        'columns': {'youtube_id': 'TEXT PRIMARY KEY', 'id': 'TEXT NOT NULL',
+                    'published_at': 'TEXT', 'is_featured': 'INTEGER', 'content_hash': 'TEXT'},
+        'indexes': {
+            'videos_id': 'UNIQUE INDEX videos_id ON videos(id)',
+            'videos_published_at_youtube_id':
+                'INDEX videos_published_at_youtube_id ON videos(published_at DESC, youtube_id DESC)',
+            'videos_is_featured_published_at_youtube_id':
+                'INDEX videos_is_featured_published_at_youtube_id ON videos(is_featured, published_at DESC, youtube_id DESC)',
+        },
+    },
+}
+
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS social_links (id TEXT PRIMARY KEY, is_active INTEGER, "order" INTEGER, doc TEXT NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS social_links_is_active_order ON social_links(is_active, "order")',
+    # Small named documents: profile, data_versions, sync_metadata, locks, rate_limits, stats
+    'CREATE TABLE IF NOT EXISTS documents (collection TEXT NOT NULL, name TEXT NOT NULL, doc TEXT NOT NULL, '
+    'PRIMARY KEY (collection, name))',
+    'CREATE TABLE IF NOT EXISTS sync_jobs (id TEXT PRIMARY KEY, source TEXT NOT NULL, active INTEGER, doc TEXT NOT NULL)',
+    # At most one active job per source across all workers
+    'CREATE UNIQUE INDEX IF NOT EXISTS sync_jobs_source_active ON sync_jobs(source) WHERE active = 1',
+]
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {'$date': naive_utc(value).isoformat(timespec='microseconds')}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _object_hook(value: Dict[str, Any]) -> Any:
+    if len(value) == 1 and '$date' in value:
+        return datetime.fromisoformat(value['$date'])
+    return value
+
+def _dumps(document: Dict[str, Any]) -> str:
+    return json.dumps(document, default=_default, separators=(',', ':'))
+
+def _loads(text: str) -> Dict[str, Any]:
+    return json.loads(text, object_hook=_object_hook)
+
+def _column_value(value: Any) -> Any:
+    """Column form of a document value; fixed-width ISO datetimes sort as text"""
+    if isinstance(value, datetime):
+        return naive_utc(value).isoformat(timespec='microseconds')
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+class SQLiteStorage(Storage):
+    """SQLite file (SQLITE_PATH) in WAL mode for single-node deployments
+
+    Queries run on the event loop: against a local file with indexes they
+    take microseconds, less than handing them to a thread would cost. The
+    SQL text of each query shape is fixed, so sqlite3's statement cache
+    reuses the prepared statements. Read-modify-write operations take an
+    IMMEDIATE transaction, which keeps them atomic across worker processes.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self):
+        self.path = os.environ.get('SQLITE_PATH', 'portfolio.db')
+        self.connection: Optional[sqlite3.Connection] = None
+
+    async def connect(self):
+        # Autocommit; transactions are opened explicitly where needed
+        self.connection = sqlite3.connect(
+            self.path, isolation_level=None, check_same_thread=False, cached_statements=256
+        )
+        for pragma in ('journal_mode=WAL', 'synchronous=NORMAL', 'busy_timeout=5000',
+                       'temp_store=MEMORY', 'cache_size=-16000'):
+            self.connection.execute(f'PRAGMA {pragma}')
+        self._create_schema()
+
+    async def close(self):
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+    async def ping(self):
+        self.connection.execute('SELECT 1').fetchone()
+
+    @contextmanager
+    def _transaction(self):
+        self.connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except BaseException:
+            self.connection.execute('ROLLBACK')
+            raise
+        self.connection.execute('COMMIT')
+
+    def _create_schema(self):
+        with self._transaction():
+            for collection, table in ITEM_TABLES.items():
+                columns = ', '.join(f'{name} {kind}' for name, kind in table['columns'].items())
+                self.connection.execute(f'CREATE TABLE IF NOT EXISTS {collection} ({columns}, doc TEXT NOT NULL)')
+                key = ITEM_KEYS[collection]
+                existing = {row[1] for row in self.connection.execute(f'PRAGMA table_info({collection})')}
+                for name, kind in table['columns'].items():
+                    if name not in existing:
+                        # Columns added after the table was created are filled from the stored documents
+                        self.connection.execute(f'ALTER TABLE {collection} ADD COLUMN {name} {kind}')
+                        rows = self.connection.execute(f'SELECT {key}, doc FROM {collection}').fetchall()
+                        self.connection.executemany(
+                            f'UPDATE {collection} SET {name} = ? WHERE {key} = ?',
+                            [(_column_value(_loads(doc).get(name)), value) for value, doc in rows]
+                        )
+                for field, side in table.get('lists', {}).items():
+                    created = not self.connection.execute(
+                        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (side['table'],)
+                    ).fetchone()
+                    if created:
+                        columns = ', '.join(f'{name} {kind}' for name, kind in side['columns'].items())
+                        self.connection.execute(f'CREATE TABLE {side["table"]} (value TEXT NOT NULL, {columns})')
+                        documents = [_loads(row[0]) for row in self.connection.execute(f'SELECT doc FROM {collection}')]
+                        self._write_lists(collection, documents)
+            for statement in SCHEMA:
+                self.connection.execute(statement)
+
+    async def ensure_indexes(self) -> Dict[str, Dict[str, List[str]]]:
+        report = {}
+        with self._transaction():
+            existing = {row[0] for row in self.connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+            for collection, table in ITEM_TABLES.items():
+                result = {'created': [], 'rebuilt': [], 'unchanged': [], 'dropped': [], 'failed': []}
+                for name, definition in table['indexes'].items():
+                    if name in existing:
+                        result['unchanged'].append(name)
+                        continue
+                    try:
+                        self.connection.execute(f'CREATE {definition}')
+                        result['created'].append(name)
+                    except sqlite3.Error as e:
+                        logger.error(f"Error creating index {name}: {str(e)}")
+                        result['failed'].append(name)
+                report[collection] = result
+        return report
+
+    def _query_shapes(self) -> List[Tuple[str, str, str, tuple]]:
+        shapes = []
+        for collection, sort in (('projects', [('updated_at', -1), ('github_id', -1)]),
+                                 ('videos', [('published_at', -1), ('youtube_id', -1)])):
+            sample_after = [datetime(2100, 1, 1), 0]
+            variants = [('all', {}, None), ('featured', {'is_featured': True}, None), ('page', {}, sample_after)]
+            if collection == 'projects':
+                variants += [
+                    ('language', {'language': '', 'stargazers_count': {'$gte': 0}}, None),
+                    ('topic', {'topics': '', 'stargazers_count': {'$gte': 0}}, sample_after),
+                ]
+            for name, match, after in variants:
+                sql, params = self._select(collection, sort, match, after, 100)
+                shapes.append((f'{collection}.{name}', collection, sql, params))
+            if collection == 'projects':
+                for name, match in (('score', {}), ('featured_score', {'is_featured': True})):
+                    sql, params = self._select(collection, [('score', -1), ('github_id', -1)], match, [1.0, 0], 100)
+                    shapes.append((f'{collection}.{name}', collection, sql, params))
+            key = ITEM_KEYS[collection]
+            shapes.append((f'{collection}.upsert', collection, f'SELECT doc FROM {collection} WHERE {key} = ?', (0,)))
+        shapes.append(('social_links.active', 'social_links',
+                       'SELECT doc FROM social_links WHERE is_active = 1 ORDER BY "order"', ()))
+        return shapes
+
+    async def explain_query_shapes(self) -> List[Dict[str, Any]]:
+        results = []
+        for name, collection, sql, params in self._query_shapes():
+            plan = [row[3] for row in self.connection.execute(f'EXPLAIN QUERY PLAN {sql}', params)]
+            indexes = [detail.split(' INDEX ')[1].split(' ')[0] for detail in plan if ' INDEX ' in detail]
+            results.append({
+                'query': name,
+                'collection': collection,
+                'stages': plan,
+                'indexes': indexes,
+                'collection_scan': any(
+                    detail.startswith('SCAN') and 'INDEX' not in detail and 'PRIMARY KEY' not in detail
+                    for detail in plan
+                )
+            })
+        return results
+
+    # Named documents
+    def _get(self, collection: str, name: str) -> Optional[Dict[str, Any]]:
+        row = self.connection.execute(
+            'SELECT doc FROM documents WHERE collection = ? AND name = ?', (collection, name)
+        ).fetchone()
+        return _loads(row[0]) if row else None
+
+    def _put(self, collection: str, name: str, document: Dict[str, Any]):
+        self.connection.execute(
+            'INSERT INTO documents (collection, name, doc) VALUES (?, ?, ?) '
+            'ON CONFLICT (collection, name) DO UPDATE SET doc = excluded.doc',
+            (collection, name, _dumps(document))
+        )
+
+    async def get_document(self, collection: str, name: str) -> Optional[Dict[str, Any]]:
+        return self._get(collection, name)
+
+    async def set_fields(self, collection: str, name: str, fields: Dict[str, Any]) -> None:
+        with self._transaction():
+            document = self._get(collection, name) or {'_id': name}
+            document.update(fields)
+            self._put(collection, name, document)
+
+    async def increment(self, collection: str, name: str, field: str, fields: Dict[str, Any]) -> None:
+        with self._transaction():
+            document = self._get(collection, name) or {'_id': name}
+            document[field] = document.get(field, 0) + 1
+            document.update(fields)
+            self._put(collection, name, document)
+
+    # Profile
+    async def get_profile(self) -> Optional[Dict[str, Any]]:
+        return self._get('profiles', 'profile')
+
+    async def insert_profile(self, profile: Dict[str, Any]) -> str:
+        self._put('profiles', 'profile', profile)
+        return 'profile'
+
+    async def replace_profile(self, profile: Dict[str, Any]) -> bool:
+        with self._transaction():
+            changed = self._get('profiles', 'profile') != _loads(_dumps(profile))
+            self._put('profiles', 'profile', profile)
+        return changed
+
+    # Synced collections
+    @staticmethod
+    def _match_clause(collection: str, field: str, value: Any) -> Tuple[str, Any]:
+        """WHERE clause and parameter matching one field of a row of the collection's own table"""
+        table = ITEM_TABLES[collection]
+        if field in table.get('lists', {}):
+            # A side table that is not in this sort order: probe it per row
+            side, key = table['lists'][field]['table'], ITEM_KEYS[collection]
+            return (f'EXISTS (SELECT 1 FROM {side} WHERE {side}.{key} = {collection}.{key} '
+                    f'AND {side}.value = ?)'), _column_value(value)
+        if field not in table['columns']:
+            raise ValueError(f"{collection}.{field} is not a column")
+        if isinstance(value, dict):
+            return f'{collection}.{field} >= ?', _column_value(value['$gte'])
+        return f'{collection}.{field} = ?', _column_value(value)
+
+    def _select(self, collection: str, sort: List[tuple], match: Dict[str, Any],
+                after: Optional[List[Any]], limit: Optional[int]) -> Tuple[str, tuple]:
+        lists = ITEM_TABLES[collection].get('lists', {})
+        (primary, _), (tiebreak, _) = sort
+        # The table the sort keys are read from: a list side table when filtering on its values
+        source = collection
+        clauses, params = [], []
+        for field, value in match.items():
+            if field in lists and source == collection and primary in lists[field]['columns']:
+                source = lists[field]['table']
+                clauses.append(f'{source}.value = ?')
+                params.append(_column_value(value))
+            else:
+                clause, value = self._match_clause(collection, field, value)
+                clauses.append(clause)
+                params.append(value)
+        if after:
+            clauses.append(f'({source}.{primary}, {source}.{tiebreak}) < (?, ?)')
+            params.extend(_column_value(value) for value in after)
+        sql = f'SELECT {collection}.doc FROM {source}'
+        if source != collection:
+            sql += f' JOIN {collection} ON {collection}.{tiebreak} = {source}.{tiebreak}'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += f' ORDER BY {source}.{primary} DESC, {source}.{tiebreak} DESC'
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        return sql, tuple(params)
+
+    async def find_items(self, collection: str, sort: List[tuple], match: Dict[str, Any],
+                         fields: Optional[List[str]] = None, limit: Optional[int] = None,
+                         after: Optional[List[Any]] = None) -> List[Dict[str, Any]]:
+        sql, params = self._select(collection, sort, match, after, limit)
+        return [select_fields(_loads(row[0]), fields, sort) for row in self.connection.execute(sql, params)]
+
+    async def get_content_hashes(self, collection: str, keys: List[Any]) -> Dict[Any, Optional[str]]:
+        key = ITEM_KEYS[collection]
+        hashes = {}
+        # Chunked to stay under SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.connection.execute(
+                f'SELECT {key}, content_hash FROM {collection} WHERE {key} IN ({placeholders})', chunk
+            )
+            hashes.update(rows)
+        return hashes
+
+    async def upsert_items(self, collection: str, documents: List[Dict[str, Any]],
+                           keep: Tuple[str, ...] = ()) -> None:
+        columns = list(ITEM_TABLES[collection]['columns'])
+        key = ITEM_KEYS[collection]
+        updates = ', '.join(f'{name} = excluded.{name}' for name in columns if name not in (key, 'id') + keep)
+        # The stored id and kept fields win on conflict, also inside the document
+        kept = ''.join(
+            f", '$.{field}', json(coalesce({collection}.doc -> '$.{field}', excluded.doc -> '$.{field}'))"
+            for field in keep
+        )
+        sql = (
+            f'INSERT INTO {collection} ({", ".join(columns)}, doc) VALUES ({", ".join("?" * (len(columns) + 1))}) '
+            f'ON CONFLICT ({key}) DO UPDATE SET {updates}, '
+            f"doc = json_set(excluded.doc, '$.id', {collection}.id{kept})"
+        )
+        rows = [
+            tuple(_column_value(document.get(name)) for name in columns) + (_dumps(document),)
+            for document in documents
+        ]
+        with self._transaction():
+            self.connection.executemany(sql, rows)
+            self._write_lists(collection, documents)
+
+    def _write_lists(self, collection: str, documents: List[Dict[str, Any]]):
+        """Replace the side table rows of the given documents' list fields"""
+        key = ITEM_KEYS[collection]
+        for field, side in ITEM_TABLES[collection].get('lists', {}).items():
+            columns = list(side['columns'])
+            self.connection.executemany(
+                f'DELETE FROM {side["table"]} WHERE {key} = ?', [(document[key],) for document in documents]
+            )
+            self.connection.executemany(
+                f'INSERT INTO {side["table"]} (value, {", ".join(columns)}) '
+                f'VALUES ({", ".join("?" * (len(columns) + 1))})',
+                [
+                    (value,) + tuple(_column_value(document.get(name)) for name in columns)
+                    for document in documents for value in set(document.get(field) or [])
+                ]
+            )
+
+    async def iter_items(self, collection: str, sort: List[tuple], batch_size: int) -> AsyncIterator[Dict[str, Any]]:
+        after = None
+        while True:
+            batch = await self.find_items(collection, sort, {}, limit=batch_size, after=after)
+            for document in batch:
+                document.pop('_id', None)
+                yield document
+            if len(batch) < batch_size:
+                return
+            after = [batch[-1][field] for field, _ in sort]
+            await asyncio.sleep(0)
+
+    async def count(self, collection: str, match: Dict[str, Any]) -> int:
+        if collection in ITEM_TABLES:
+            conditions = [self._match_clause(collection, field, value) for field, value in match.items()]
+        else:
+            conditions = [(f'"{field}" = ?', _column_value(value)) for field, value in match.items()]
+        sql = f'SELECT COUNT(*) FROM {collection}'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(clause for clause, _ in conditions)
+        return self.connection.execute(sql, tuple(value for _, value in conditions)).fetchone()[0]
+
+    async def facet_counts(self, collection: str, field: str) -> Dict[Any, int]:
+        table = ITEM_TABLES[collection]
+        if field in table.get('lists', {}):
+            sql = f'SELECT value, COUNT(*) FROM {table["lists"][field]["table"]} GROUP BY value'
+        elif field in table['columns']:
+            sql = f'SELECT {field}, COUNT(*) FROM {collection} WHERE {field} IS NOT NULL GROUP BY {field}'
+        else:
+            raise ValueError(f"{collection}.{field} is not a column")
+        return dict(self.connection.execute(sql))
+
+    # Social links
+    async def get_active_social_links(self) -> List[Dict[str, Any]]:
+        rows = self.connection.execute('SELECT doc FROM social_links WHERE is_active = 1 ORDER BY "order"')
+        return [_loads(row[0]) for row in rows]
+
+    async def insert_social_link(self, link: Dict[str, Any]) -> str:
+        link = {**link, 'id': link.get('id') or str(uuid.uuid4())}
+        self.connection.execute(
+            'INSERT INTO social_links (id, is_active, "order", doc) VALUES (?, ?, ?, ?)',
+            (link['id'], _column_value(link.get('is_active')), link.get('order'), _dumps(link))
+        )
+        return link['id']
+
+    async def update_social_link(self, link_id: str, fields: Dict[str, Any]) -> bool:
+        with self._transaction():
+            row = self.connection.execute('SELECT doc FROM social_links WHERE id = ?', (link_id,)).fetchone()
+            if not row:
+                return False
+            link = _loads(row[0])
+            updated = {**link, **_loads(_dumps(fields))}
+            self.connection.execute(
+                'UPDATE social_links SET is_active = ?, "order" = ?, doc = ? WHERE id = ?',
+                (_column_value(updated.get('is_active')), updated.get('order'), _dumps(updated), link_id)
+            )
+        return updated != link
+
+    # Locks and rate limits
+    async def acquire_lock(self, name: str, owner: str, now: datetime, expires_at: datetime) -> bool:
+        with self._transaction():
+            lock = self._get('locks', name)
+            if lock and lock['owner'] != owner and lock['expires_at'] >= now:
+                return False
+            self._put('locks', name, {'_id': name, 'owner': owner, 'acquired_at': now, 'expires_at': expires_at})
+        return True
+
+    async def release_lock(self, name: str, owner: str) -> None:
+        with self._transaction():
+            lock = self._get('locks', name)
+            if lock and lock['owner'] == owner:
+                self.connection.execute(
+                    'DELETE FROM documents WHERE collection = ? AND name = ?', ('locks', name)
+                )
+
+    async def reserve_rate_limit(self, name: str, reserve: int, now: datetime) -> Optional[Dict[str, Any]]:
+        with self._transaction():
+            budget = self._get('rate_limits', name)
+            if not budget or budget.get('remaining') is None or budget['remaining'] <= reserve:
+                return None
+            if budget.get('blocked_until') and budget['blocked_until'] > now:
+                return None
+            self._put('rate_limits', name, {**budget, 'remaining': budget['remaining'] - 1})
+        return budget
+
+    # Sync jobs
+    async def find_active_job(self, source: str) -> Optional[Dict[str, Any]]:
+        row = self.connection.execute(
+            'SELECT doc FROM sync_jobs WHERE source = ? AND active = 1', (source,)
+        ).fetchone()
+        return _loads(row[0]) if row else None
+
+    async def insert_job(self, job: Dict[str, Any]) -> bool:
+        try:
+            self.connection.execute(
+                'INSERT INTO sync_jobs (id, source, active, doc) VALUES (?, ?, 1, ?)',
+                (job['_id'], job['source'], _dumps(job))
+            )
+            return True
+        except sqlite3.IntegrityError:
+            return False
+
+    def _update_job(self, job_id: str, fields: Dict[str, Any], finish: bool):
+        with self._transaction():
+            row = self.connection.execute('SELECT doc FROM sync_jobs WHERE id = ?', (job_id,)).fetchone()
+            if not row:
+                return
+            job = {**_loads(row[0]), **fields}
+            if finish:
+                job.pop('active', None)
+                self.connection.execute(
+                    'UPDATE sync_jobs SET active = NULL, doc = ? WHERE id = ?', (_dumps(job), job_id)
+                )
+            else:
+                self.connection.execute('UPDATE sync_jobs SET doc = ? WHERE id = ?', (_dumps(job), job_id))
+
+    async def update_job(self, job_id: str, fields: Dict[str, Any]) -> None:
+        self._update_job(job_id, fields, finish=False)
+
+    async def finish_job(self, job_id: str, fields: Dict[str, Any]) -> None:
+        self._update_job(job_id, fields, finish=True)
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self.connection.execute('SELECT doc FROM sync_jobs WHERE id = ?', (job_id,)).fetchone()
+        return _loads(row[0]) if row else None
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Fault-injecting stand-in for the parts of the GitHub API the backend uses.
+Point the backend at it to exercise concurrent pagination, the circuit
+breaker and the rate limit budget without touching api.github.com.
+
+Run from backend/: python tools/github_stub.py [port]
+Then start the backend with GITHUB_API_URL=http://localhost:8765
+
+Repositories are the same on every request and pages carry an ETag, so
+repeated syncs exercise the unchanged, delta-write and 304 paths; change
+the repository count to make the next sync see a change, e.g.
+    curl -X PUT 'localhost:8765/_settings?repos=1000'
+
+Faults are switched at runtime, e.g.
+    curl -X PUT 'localhost:8765/_faults?mode=error'
+    curl -X PUT 'localhost:8765/_faults?mode=flaky&failure_rate=0.5'
+    curl -X PUT 'localhost:8765/_faults?mode=slow&latency=15'
+    curl -X PUT 'localhost:8765/_faults?mode=rate_limit'
+    curl -X PUT 'localhost:8765/_faults?mode=none'
+"""
+
+import sys
+import json
+import time
+import hashlib
+import random
+import asyncio
+from typing import Optional
+from datetime import datetime, timedelta
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+MODES = ('none', 'error', 'flaky', 'slow', 'rate_limit')
+
+app = FastAPI(title="GitHub API stub")
+settings = {'repos': 250}
+faults = {'mode': 'none', 'failure_rate': 0.5, 'latency': 15.0}
+requests_seen = {'total': 0, 'failed': 0}
+
+def make_repo(i: int) -> dict:
+    return {
+        'id': 1000 + i,
+        'name': f"stub-repo-{i}",
+        'description': f"Stub repository {i}",
+        'language': ('Python', 'TypeScript', 'Go')[i % 3],
+        'html_url': f"https://github.com/stub/stub-repo-{i}",
+        'created_at': '2024-01-01T00:00:00Z',
+        'updated_at': f"{datetime(2025, 1, 1) + timedelta(hours=i):%Y-%m-%dT%H:%M:%SZ}",
+        'stargazers_count': i % 17,
+        'forks_count': i % 7,
+        'topics': ['ai'] if i % 5 == 0 else [],
+        'fork': False,
+        'archived': False
+    }
+
+@app.put("/_settings")
+async def set_settings(repos: Optional[int] = None):
+    if repos is not None:
+        settings['repos'] = repos
+    return settings
+
+@app.get("/_settings")
+async def get_settings():
+    return settings
+
+@app.put("/_faults")
+async def set_faults(mode: str = 'none', failure_rate: Optional[float] = None,
+                     latency: Optional[float] = None):
+    if mode not in MODES:
+        return JSONResponse(status_code=400, content={'detail': f"mode must be one of {', '.join(MODES)}"})
+    faults['mode'] = mode
+    for name, value in (('failure_rate', failure_rate), ('latency', latency)):
+        if value is not None:
+            faults[name] = value
+    return {'faults': faults, 'requests': requests_seen}
+
+@app.get("/_faults")
+async def get_faults():
+    return {'faults': faults, 'requests': requests_seen}
+
+@app.middleware("http")
+async def inject_faults(request: Request, call_next):
+    if request.url.path.startswith(('/_faults', '/_settings')):
+        return await call_next(request)
+    requests_seen['total'] += 1
+    mode = faults['mode']
+    reset = str(int(time.time()) + 3600)
+
+    if mode == 'slow':
+        await asyncio.sleep(faults['latency'])
+    elif mode == 'error' or (mode == 'flaky' and random.random() < faults['failure_rate']):
+        requests_seen['failed'] += 1
+        return JSONResponse(status_code=503, content={'message': 'Service Unavailable'})
+    elif mode == 'rate_limit':
+        requests_seen['failed'] += 1
+        return JSONResponse(
+            status_code=403,
+            content={'message': 'API rate limit exceeded'},
+            headers={'X-RateLimit-Limit': '60', 'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': reset}
+        )
+
+    response = await call_next(request)
+    response.headers.update({'X-RateLimit-Limit': '5000', 'X-RateLimit-Remaining': '4999', 'X-RateLimit-Reset': reset})
+    return response
+
+@app.get("/users/{username}/repos")
+async def list_repos(username: str, request: Request, page: int = 1, per_page: int = 30):
+    # Most recently updated first, as requested by the backend
+    repos = [make_repo(i) for i in reversed(range(settings['repos']))]
+    last_page = max(1, -(-len(repos) // per_page))
+    headers = {}
+    if last_page > 1:
+        last_url = request.url.include_query_params(page=last_page)
+        headers['Link'] = f'<{last_url}>; rel="last"'
+    start = (page - 1) * per_page
+    body = json.dumps(repos[start:start + per_page])
+    headers['ETag'] = f'"{hashlib.sha1(body.encode()).hexdigest()}"'
+    if request.headers.get('If-None-Match') == headers['ETag']:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type='application/json', headers=headers)
+
+@app.get("/users/{username}")
+async def get_user(username: str):
+    return {'login': username, 'public_repos': settings['repos']}
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="127.0.0.1", port=int(sys.argv[1]) if len(sys.argv) > 1 else 8765)
@@ -57,6 +57,23 @@ class BackendTester:
         await self.test_system_sync()
         
         self.print_summary()
+    
+    async def wait_for_jobs(self, client: httpx.AsyncClient, sync_response: httpx.Response,
+                            timeout: float = 120.0) -> List[Dict[str, Any]]:
+        """Poll the jobs a sync endpoint started until each one finishes"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        finished = []
+        for job in sync_response.json().get("jobs", []):
+            while job["status"] == "running":
+                if loop.time() > deadline:
+                    raise TimeoutError(f"{job['source']} sync job {job['id']} still running after {timeout:.0f}s")
+                await asyncio.sleep(1)
+                response = await client.get(f"{self.api_url}/system/jobs/{job['id']}")
+                response.raise_for_status()
+                job = response.json()
+            finished.append(job)
+        return finished
         
     async def test_health_check(self):
         """Test health check and system status endpoints"""
@@ -165,14 +182,15 @@ class BackendTester:
                 print("🔄 Testing manual GitHub sync...")
                 sync_response = await client.post(f"{self.api_url}/projects/sync")
                 
-                if sync_response.status_code == 200:
-                    sync_data = sync_response.json()
-                    print(f"✅ Sync response: {sync_data}")
-                    
-                    if not sync_data.get("success"):
-                        print(f"⚠️  Sync reported failure: {sync_data.get('message')}")
-                        if sync_data.get("errors"):
-                            print(f"🚨 Sync errors: {sync_data.get('errors')}")
+                if sync_response.status_code == 202:
+                    print(f"✅ Sync response: {sync_response.json().get('message')}")
+                    
+                    # The sync runs as a background job; wait for it before reading projects
+                    for job in await self.wait_for_jobs(client, sync_response):
+                        if job["status"] == "failed":
+                            print(f"⚠️  Sync job failed: {job.get('error')}")
+                        else:
+                            print(f"✅ Sync job {job['status']}: {job.get('result')}")
                 else:
                     print(f"❌ Sync failed: HTTP {sync_response.status_code}")
                 
@@ -287,9 +305,9 @@ class BackendTester:
                 print("🔄 Testing video sync...")
                 sync_response = await client.post(f"{self.api_url}/videos/sync")
                 
-                if sync_response.status_code == 200:
-                    sync_data = sync_response.json()
-                    print(f"✅ Video sync: {sync_data}")
+                if sync_response.status_code == 202:
+                    for job in await self.wait_for_jobs(client, sync_response):
+                        print(f"✅ Video sync job {job['status']}: {job.get('error') or job.get('result')}")
                 
                 # Test GET videos
                 response = await client.get(f"{self.api_url}/videos/")
@@ -343,17 +361,23 @@ class BackendTester:
             async with httpx.AsyncClient(timeout=90.0) as client:  # Long timeout for full sync
                 response = await client.post(f"{self.api_url}/system/sync-all")
                 
-                if response.status_code == 200:
+                if response.status_code == 202:
                     sync_data = response.json()
+                    jobs = await self.wait_for_jobs(client, response)
                     
                     print(f"📊 Sync Results:")
-                    print(f"  • Success: {sync_data.get('success')}")
                     print(f"  • Message: {sync_data.get('message')}")
-                    print(f"  • Projects synced: {sync_data.get('projects_synced', 0)}")
-                    print(f"  • Videos synced: {sync_data.get('videos_synced', 0)}")
-                    
-                    if sync_data.get('errors'):
-                        print(f"  • Errors: {sync_data.get('errors')}")
+                    for job in jobs:
+                        print(f"  • {job['source'].title()}: {job['status']}, "
+                              f"{(job.get('result') or {}).get('synced', 0)} synced")
+                        if job.get('error'):
+                            print(f"    Error: {job['error']}")
+                    
+                    failed = [job['source'] for job in jobs if job['status'] == 'failed']
+                    if failed:
+                        self.results["system_sync"]["details"] = f"Sync jobs failed: {failed}"
+                        print(f"❌ System sync failed for: {failed}")
+                        return
                     
                     # Test system stats
                     stats_response = await client.get(f"{self.api_url}/system/stats")
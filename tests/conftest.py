@@ -0,0 +1,41 @@
+import os
+import sys
+
+import pytest
+
+BACKEND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+sys.path.insert(0, BACKEND)
+sys.path.insert(0, os.path.join(BACKEND, 'tools'))
+
+from cache import cache  # noqa: E402
+from database import database  # noqa: E402
+from storage.memory import MemoryStorage  # noqa: E402
+from storage.sqlite import SQLiteStorage  # noqa: E402
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+@pytest.fixture(params=['memory', 'sqlite'])
+async def storage(request, tmp_path, monkeypatch):
+    """Each local engine, empty and with its indexes created"""
+    if request.param == 'sqlite':
+        monkeypatch.setenv('SQLITE_PATH', str(tmp_path / 'portfolio.db'))
+        engine = SQLiteStorage()
+    else:
+        engine = MemoryStorage()
+    await engine.connect()
+    await engine.ensure_indexes()
+    yield engine
+    await engine.close()
+
+@pytest.fixture
+async def memory_database():
+    """The application database over an empty memory engine"""
+    database.storage = MemoryStorage()
+    await database.storage.connect()
+    cache.invalidate()
+    yield database
+    await database.storage.close()
+    database.storage = None
+    cache.invalidate()
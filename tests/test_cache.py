@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from cache import TTLCache
+
+pytestmark = pytest.mark.anyio
+
+async def test_concurrent_misses_share_one_load():
+    cache = TTLCache()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {'value': 1}
+
+    results = await asyncio.gather(*(cache.get_or_load('key', load) for _ in range(10)))
+    assert len(calls) == 1
+    assert results == [{'value': 1}] * 10
+    assert (cache.misses, cache.coalesced) == (1, 9)
+    assert await cache.get_or_load('key', load) == {'value': 1}
+    assert cache.hits == 1
+
+async def test_callers_get_their_own_copy_of_each_document():
+    cache = TTLCache()
+
+    async def load():
+        return [{'id': 'a', 'name': 'cached'}]
+
+    first = await cache.get_or_load('key', load)
+    first[0]['name'] = 'changed'
+    first.append({'id': 'b'})
+    assert await cache.get_or_load('key', load) == [{'id': 'a', 'name': 'cached'}]
+
+async def test_failed_load_is_not_stored():
+    cache = TTLCache()
+
+    async def fail():
+        raise RuntimeError("storage down")
+
+    async def load():
+        return []
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_load('key', fail)
+    assert cache.get('key') == (False, None)
+    assert await cache.get_or_load('key', load) == []
+
+async def test_invalidate_drops_a_prefix_and_loads_started_before_it():
+    cache = TTLCache()
+    cache.set('projects:v1', 'old')
+    cache.set('videos:v1', 'kept')
+    started = asyncio.Event()
+
+    async def slow_load():
+        started.set()
+        await asyncio.sleep(0.01)
+        return 'stale'
+
+    loading = asyncio.create_task(cache.get_or_load('projects:v2', slow_load))
+    await started.wait()
+    cache.invalidate('projects:')
+    assert await loading == 'stale'
+    assert cache.get('projects:v1') == (False, None)
+    # A load that raced the invalidation is returned but not stored
+    assert cache.get('projects:v2') == (False, None)
+    assert cache.get('videos:v1') == (True, 'kept')
+
+async def test_entries_expire_and_least_recently_used_are_evicted():
+    cache = TTLCache(max_entries=2)
+    cache.set('short', 1, ttl=0.001)
+    await asyncio.sleep(0.01)
+    assert cache.get('short') == (False, None)
+
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert cache.get('b') == (False, None)
+    assert cache.get('a') == (True, 1)
+    assert cache.evictions == 1
@@ -0,0 +1,75 @@
+import pytest
+
+from services import circuit_breaker
+from services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Monotonic time the test moves by hand"""
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, 'monotonic', lambda: now[0])
+    return now
+
+@pytest.fixture
+def breaker(monkeypatch, clock):
+    monkeypatch.setenv('GITHUB_BREAKER_MIN_CALLS', '4')
+    monkeypatch.setenv('GITHUB_BREAKER_FAILURE_RATE', '0.5')
+    monkeypatch.setenv('GITHUB_BREAKER_COOLDOWN', '30')
+    return CircuitBreaker('test')
+
+def test_stays_closed_below_min_calls_and_threshold(breaker):
+    for _ in range(3):
+        breaker.record_failure("HTTP 503")
+    # Not enough calls to judge yet
+    assert breaker.state == CLOSED
+    for _ in range(4):
+        breaker.record_success()
+    # 3 failures in 7 calls is under the threshold
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+    breaker.record_failure("HTTP 503")
+    assert breaker.state == OPEN
+
+def test_opens_at_the_failure_rate_and_refuses_calls(breaker, clock):
+    breaker.record_success()
+    for _ in range(3):
+        breaker.record_failure("HTTP 502")
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.status()['retry_at'] is not None
+    clock[0] += 29
+    assert not breaker.allow()
+
+def test_half_open_probe_success_closes(breaker, clock):
+    for _ in range(4):
+        breaker.record_failure("timeout")
+    clock[0] += 30
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    # Only one probe at a time
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.status()['window'] == 0
+
+def test_half_open_probe_failure_reopens_for_another_cooldown(breaker, clock):
+    for _ in range(4):
+        breaker.record_failure("timeout")
+    clock[0] += 30
+    assert breaker.allow()
+    breaker.record_failure("HTTP 500")
+    assert breaker.state == OPEN
+    clock[0] += 29
+    assert not breaker.allow()
+    clock[0] += 1
+    assert breaker.allow()
+
+def test_lost_probe_does_not_wedge_the_breaker(breaker, clock):
+    for _ in range(4):
+        breaker.record_failure("timeout")
+    clock[0] += 30
+    assert breaker.allow()
+    # The probe never reports back; another goes through after a cooldown
+    clock[0] += 30
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
@@ -0,0 +1,251 @@
+"""GitHubService and the projects sync against in-process GitHub stand-ins"""
+
+import asyncio
+from typing import Optional
+
+import httpx
+import pytest
+
+import github_stub
+from database import PROJECT_FACETS, PROJECTS_SORT
+from services import sync_service
+from services.circuit_breaker import CLOSED, OPEN
+from services.github_service import GitHubError, GitHubService, IncompleteFetch
+from services.job_service import JobService
+from services.rate_limit import Throttled
+
+pytestmark = pytest.mark.anyio
+
+def make_repo(i: int) -> dict:
+    return {
+        'id': i,
+        'name': f"repo-{i}",
+        'html_url': f"https://github.com/octocat/repo-{i}",
+        'created_at': '2024-01-01T00:00:00Z',
+        'updated_at': '2025-01-01T00:00:00Z',
+    }
+
+class StubTransport(httpx.AsyncBaseTransport):
+    """The stub app in-process, tracking requests in flight and optionally failing one page"""
+
+    def __init__(self, app, latency: float = 0.0):
+        self.inner = httpx.ASGITransport(app=app)
+        self.latency = latency
+        self.fail_page: Optional[int] = None
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.fail_page is not None and request.url.params.get('page') == str(self.fail_page):
+            return httpx.Response(502, request=request)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            # Hold the request long enough for concurrent ones to overlap
+            await asyncio.sleep(self.latency)
+            return await self.inner.handle_async_request(request)
+        finally:
+            self.in_flight -= 1
+
+@pytest.fixture
+def stub():
+    github_stub.settings.update(repos=250)
+    github_stub.faults.update(mode='none')
+    github_stub.requests_seen.update(total=0, failed=0)
+    return github_stub
+
+@pytest.fixture
+def transport(stub):
+    return StubTransport(stub.app)
+
+@pytest.fixture
+async def github(memory_database, transport, monkeypatch):
+    monkeypatch.setenv('GITHUB_BREAKER_MIN_CALLS', '3')
+    monkeypatch.setenv('GITHUB_BREAKER_COOLDOWN', '0.05')
+    # No pacing sleeps as the budget runs low
+    monkeypatch.setenv('GITHUB_RATE_LIMIT_PACE_BELOW', '0')
+    service = GitHubService()
+    service.client = httpx.AsyncClient(transport=transport, base_url='http://stub')
+    monkeypatch.setattr(sync_service, 'github_service', service)
+    yield service
+    await service.close()
+
+async def stored_projects(database):
+    return [project async for project in database.iter_collection('projects', PROJECTS_SORT)]
+
+async def test_revalidates_with_the_last_validators():
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append((request.headers.get('If-None-Match'), request.headers.get('If-Modified-Since')))
+        if request.headers.get('If-None-Match') == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=[make_repo(1)], headers={
+            'ETag': '"v1"', 'Last-Modified': 'Wed, 01 Jan 2025 00:00:00 GMT'
+        })
+
+    service = GitHubService()
+    service.client = httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url='http://github')
+    assert [repo['github_id'] for repo in await service.get_user_repos('octocat')] == [1]
+    assert await service.get_user_repos('octocat') is None
+    assert sent == [(None, None), ('"v1"', 'Wed, 01 Jan 2025 00:00:00 GMT')]
+    await service.close()
+
+async def test_fetches_every_page_then_revalidates(github, stub):
+    pages = []
+
+    async def on_page(repos):
+        pages.append(len(repos))
+
+    repos = await github.get_user_repos('stub', on_page=on_page)
+    assert len(repos) == 250
+    assert sorted(pages) == [50, 100, 100]
+    assert await github.get_user_repos('stub') is None
+
+    stub.settings['repos'] = 260
+    assert len(await github.get_user_repos('stub')) == 260
+
+async def test_later_pages_are_fetched_concurrently(github, stub, transport):
+    stub.settings['repos'] = 1000
+    transport.latency = 0.01
+    github.page_concurrency = 4
+    repos = await github.get_user_repos('stub')
+    assert len({repo['github_id'] for repo in repos}) == 1000
+    assert transport.max_in_flight == 4
+
+async def test_failed_later_page_drops_the_validators(github, transport):
+    transport.fail_page = 3
+    with pytest.raises(IncompleteFetch):
+        await github.get_user_repos('stub')
+    assert github.validators == {}
+
+    # The next fetch gets every page again instead of a 304
+    transport.fail_page = None
+    assert len(await github.get_user_repos('stub')) == 250
+
+async def test_validators_are_kept_once_every_page_is_handled(github):
+    async def fail(repos):
+        raise RuntimeError("storage down")
+
+    with pytest.raises(RuntimeError):
+        await github.get_user_repos('stub', on_page=fail)
+    assert github.validators == {}
+    assert len(await github.get_user_repos('stub')) == 250
+    assert await github.get_user_repos('stub') is None
+
+async def test_breaker_opens_on_failures_and_recovers(github, stub):
+    stub.faults['mode'] = 'error'
+    for _ in range(3):
+        with pytest.raises(GitHubError):
+            await github.get_user_repos('stub')
+    assert github.breaker.state == OPEN
+
+    # Refused without reaching GitHub
+    sent = stub.requests_seen['total']
+    deferred = await github.get_user_repos('stub')
+    assert isinstance(deferred, Throttled)
+    assert stub.requests_seen['total'] == sent
+
+    stub.faults['mode'] = 'none'
+    await asyncio.sleep(0.06)
+    assert len(await github.get_user_repos('stub')) == 250
+    assert github.breaker.state == CLOSED
+
+async def test_exhausted_rate_limit_defers_calls(github, stub, memory_database):
+    stub.faults['mode'] = 'rate_limit'
+    deferred = await github.get_user_repos('stub')
+    assert isinstance(deferred, Throttled)
+    assert deferred.reason == "primary rate limit exhausted"
+    assert (await memory_database.get_rate_limit('github'))['blocked_until'] == deferred.retry_at
+
+    # The stored block defers the next call before it is sent, also for other workers
+    sent = stub.requests_seen['total']
+    assert isinstance(await GitHubService().get_user_repos('stub'), Throttled)
+    assert stub.requests_seen['total'] == sent
+
+async def test_budget_keeps_the_reserve(github, memory_database):
+    await github.get_user_repos('stub')
+    assert (await memory_database.get_rate_limit('github'))['remaining'] == 4999
+
+    await memory_database.update_rate_limit('github', remaining=github.rate_limit.reserve + 1)
+    assert await github.rate_limit.acquire() is None
+    deferred = await github.rate_limit.acquire()
+    assert isinstance(deferred, Throttled)
+    assert deferred.reason == "rate limit budget spent"
+
+async def test_sync_writes_only_changes_and_ranks_the_collection(github, stub, memory_database):
+    stats = await sync_service.sync_github_projects('stub')
+    assert (stats['inserted'], stats['reranked']) == (250, 250)
+    projects = await stored_projects(memory_database)
+    assert sum(p['is_featured'] for p in projects) == 12
+
+    # Unchanged upstream: a 304, nothing written
+    assert await sync_service.sync_github_projects('stub') is None
+
+    stub.settings['repos'] = 260
+    stats = await sync_service.sync_github_projects('stub')
+    assert (stats['inserted'], stats['changed'], stats['unchanged']) == (10, 0, 250)
+    assert sum(p['is_featured'] for p in await stored_projects(memory_database)) == 12
+
+async def test_sync_recounts_summaries_once(github, stub, memory_database, monkeypatch):
+    facet_counts = memory_database.storage.facet_counts
+    queried = []
+
+    async def track(collection, field):
+        queried.append(field)
+        return await facet_counts(collection, field)
+
+    monkeypatch.setattr(memory_database.storage, 'facet_counts', track)
+    await sync_service.sync_github_projects('stub')
+    # Three pages, one refresh: stars plus each facet field, counted once
+    assert len(queried) == 1 + len(PROJECT_FACETS)
+    assert (await memory_database.get_stats())['projects'] == 250
+    facets = await memory_database.get_project_facets()
+    assert (facets['total'], facets['featured']) == (250, 12)
+
+async def test_failed_write_fails_the_sync_and_is_retried_in_full(github, memory_database, monkeypatch):
+    upsert_items = memory_database.storage.upsert_items
+
+    async def fail_once(*args, **kwargs):
+        monkeypatch.setattr(memory_database.storage, 'upsert_items', upsert_items)
+        raise RuntimeError("storage down")
+
+    monkeypatch.setattr(memory_database.storage, 'upsert_items', fail_once)
+    with pytest.raises(RuntimeError):
+        await sync_service.sync_github_projects('stub')
+    # Not marked synced, so the interval does not back off
+    assert await memory_database.get_sync_metadata('projects') is None
+
+    stats = await sync_service.sync_github_projects('stub')
+    assert stats['fetched'] == 250
+    assert len(await stored_projects(memory_database)) == 250
+
+async def test_incomplete_sync_keeps_ranks_and_fails(github, stub, transport, memory_database):
+    await sync_service.sync_github_projects('stub')
+
+    stub.settings['repos'] = 260
+    transport.fail_page = 3
+    with pytest.raises(IncompleteFetch):
+        await sync_service.sync_github_projects('stub')
+    projects = await stored_projects(memory_database)
+    # Pages before the failure are stored and ranked with the rest; nothing lost its rank to the sync
+    assert len(projects) == 260
+    assert all(p['score'] > 0 for p in projects)
+    assert sum(p['is_featured'] for p in projects) == 12
+
+    transport.fail_page = None
+    stats = await sync_service.sync_github_projects('stub')
+    assert stats['fetched'] == 260
+
+async def test_github_errors_fail_the_sync_job(github, stub, memory_database):
+    await memory_database.create_profile({'id': 'profile', 'github_username': 'stub'})
+    stub.faults['mode'] = 'error'
+    jobs = JobService()
+    job, _ = await jobs.enqueue('projects')
+    while job['status'] == 'running':
+        await asyncio.sleep(0.01)
+        job = await jobs.get_job(job['id'])
+    assert job['status'] == 'failed'
+    assert job['error'] == "GitHub API error: 503 - {\"message\":\"Service Unavailable\"}"
+    # A failed sync is not recorded, so the data is not marked fresh
+    assert await memory_database.get_sync_metadata('projects') is None
@@ -0,0 +1,48 @@
+import base64
+import json
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from pagination import decode_cursor, encode_cursor, page_variant
+from routes.projects import PROJECT_CURSOR_TYPES
+from routes.videos import VIDEO_CURSOR_TYPES
+
+def token(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+def test_cursor_round_trips_sort_values():
+    values = [datetime(2025, 7, 1, 12, 30, 15, 123456), 42]
+    assert decode_cursor(encode_cursor(values), PROJECT_CURSOR_TYPES['updated']) == values
+    assert decode_cursor(encode_cursor([0.81, 7]), PROJECT_CURSOR_TYPES['score']) == [0.81, 7]
+    assert decode_cursor(encode_cursor([1, 7]), PROJECT_CURSOR_TYPES['score']) == [1, 7]
+    assert decode_cursor(encode_cursor([values[0], 'abc']), VIDEO_CURSOR_TYPES) == [values[0], 'abc']
+
+def test_no_cursor_is_the_first_page():
+    assert decode_cursor(None, VIDEO_CURSOR_TYPES) is None
+    assert decode_cursor('', VIDEO_CURSOR_TYPES) is None
+
+@pytest.mark.parametrize('cursor, types', [
+    ('not base64!', PROJECT_CURSOR_TYPES['updated']),
+    (token({'a': 1}), PROJECT_CURSOR_TYPES['updated']),
+    (token([{'$date': 'yesterday'}, 1]), PROJECT_CURSOR_TYPES['updated']),
+    # Another sort order's cursor
+    (encode_cursor([0.5, 1]), PROJECT_CURSOR_TYPES['updated']),
+    (encode_cursor([datetime(2025, 1, 1), 1]), PROJECT_CURSOR_TYPES['score']),
+    # Operators, wrong types and wrong lengths never reach a query
+    (token([{'$ne': None}, 1]), PROJECT_CURSOR_TYPES['score']),
+    (token([0.5, '1']), PROJECT_CURSOR_TYPES['score']),
+    (token([True, 1]), PROJECT_CURSOR_TYPES['score']),
+    (token([0.5]), PROJECT_CURSOR_TYPES['score']),
+    (token([0.5, 1, 2]), PROJECT_CURSOR_TYPES['score']),
+    (encode_cursor([datetime(2025, 1, 1), 3]), VIDEO_CURSOR_TYPES),
+])
+def test_malformed_cursor_is_a_bad_request(cursor, types):
+    with pytest.raises(HTTPException) as raised:
+        decode_cursor(cursor, types)
+    assert raised.value.status_code == 400
+
+def test_page_variant_names_every_input():
+    assert page_variant('all', None, 20, None) == 'all:fields=*:limit=20:cursor='
+    assert page_variant('featured', ['name', 'id'], 5, 'abc') == 'featured:fields=name,id:limit=5:cursor=abc'
@@ -0,0 +1,138 @@
+"""Storage contract: every engine must answer these the same way"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+SORT = [('updated_at', -1), ('github_id', -1)]
+SCORE_SORT = [('score', -1), ('github_id', -1)]
+
+def make_project(i: int, **fields) -> dict:
+    project = {
+        'id': f"project-{i}",
+        'github_id': i,
+        'name': f"repo-{i}",
+        'language': ('Python', 'Go', 'Rust')[i % 3],
+        'topics': ['ai', 'cli'] if i % 4 == 0 else ['web'] if i % 2 == 0 else [],
+        'stargazers_count': i * 5,
+        'updated_at': datetime(2025, 1, 1) + timedelta(hours=i // 2),
+        'score': float(i % 7),
+        'is_featured': i % 5 == 0,
+        'content_hash': f"hash-{i}",
+    }
+    project.update(fields)
+    return project
+
+PROJECTS = [make_project(i) for i in range(1, 41)]
+
+def expected(match, sort=SORT):
+    """Brute-force answer: filter in Python, then sort on the sort keys"""
+    found = [p for p in PROJECTS if all(
+        value in p[field] if isinstance(p[field], list)
+        else p[field] >= value['$gte'] if isinstance(value, dict)
+        else p[field] == value
+        for field, value in match.items()
+    )]
+    found.sort(key=lambda p: tuple(p[field] for field, _ in sort), reverse=True)
+    return [p['github_id'] for p in found]
+
+async def page_through(storage, match, sort=SORT, limit=7):
+    ids, after = [], None
+    while True:
+        page = await storage.find_items('projects', sort, match, None, limit + 1, after)
+        ids.extend(p['github_id'] for p in page[:limit])
+        if len(page) <= limit:
+            return ids
+        after = [page[limit - 1][field] for field, _ in sort]
+
+@pytest.fixture
+async def projects(storage):
+    await storage.upsert_items('projects', PROJECTS)
+    return storage
+
+@pytest.mark.parametrize('match', [
+    {},
+    {'is_featured': True},
+    {'language': 'Go'},
+    {'language': 'Go', 'is_featured': False},
+    {'topics': 'ai'},
+    {'topics': 'web', 'language': 'Python'},
+    {'stargazers_count': {'$gte': 100}},
+    {'topics': 'cli', 'stargazers_count': {'$gte': 60}},
+])
+async def test_keyset_pages_match_a_full_sort(projects, match):
+    assert await page_through(projects, match) == expected(match)
+
+async def test_keyset_pages_by_score_with_ties(projects):
+    assert await page_through(projects, {}, SCORE_SORT) == expected({}, SCORE_SORT)
+    assert await page_through(projects, {'topics': 'ai'}, SCORE_SORT) == expected({'topics': 'ai'}, SCORE_SORT)
+
+async def test_find_items_returns_only_selected_fields(projects):
+    page = await projects.find_items('projects', SORT, {}, ['name'], 1)
+    # Sort keys stay so the caller can build a cursor
+    assert set(page[0]) <= {'name', 'updated_at', 'github_id'}
+    assert page[0]['name'] == 'repo-40'
+
+async def test_count_and_facet_counts(projects):
+    assert await projects.count('projects', {}) == len(PROJECTS)
+    assert await projects.count('projects', {'is_featured': True}) == len(expected({'is_featured': True}))
+    assert await projects.count('projects', {'topics': 'ai'}) == len(expected({'topics': 'ai'}))
+    assert await projects.facet_counts('projects', 'language') == {'Python': 13, 'Go': 14, 'Rust': 13}
+    assert await projects.facet_counts('projects', 'topics') == {'ai': 10, 'cli': 10, 'web': 10}
+
+async def test_upsert_keeps_the_stored_id(projects):
+    await projects.upsert_items('projects', [make_project(3, id='other', name='renamed')])
+    stored = {p['github_id']: p async for p in projects.iter_items('projects', SORT, 10)}[3]
+    assert stored['id'] == 'project-3'
+    assert stored['name'] == 'renamed'
+
+async def test_upsert_keep_fields_are_written_on_insert_only(projects):
+    await projects.upsert_items(
+        'projects', [make_project(3, score=0.0, is_featured=True, name='renamed'), make_project(99, score=0.5)],
+        keep=('score', 'is_featured')
+    )
+    stored = {p['github_id']: p async for p in projects.iter_items('projects', SORT, 10)}
+    assert (stored[3]['score'], stored[3]['is_featured'], stored[3]['name']) == (3.0, False, 'renamed')
+    assert stored[99]['score'] == 0.5
+    # The stored value, not the synced one, still drives filters
+    assert 3 not in await page_through(projects, {'is_featured': True})
+
+async def test_upsert_replaces_list_values(projects):
+    await projects.upsert_items('projects', [make_project(4, topics=['cli'])])
+    assert 4 not in await page_through(projects, {'topics': 'ai'})
+    assert 4 in await page_through(projects, {'topics': 'cli'})
+
+async def test_content_hashes_of_existing_keys(projects):
+    assert await projects.get_content_hashes('projects', [1, 2, 999]) == {1: 'hash-1', 2: 'hash-2'}
+
+async def test_one_active_job_per_source(storage):
+    now = datetime(2025, 1, 1)
+    job = {'_id': 'job-1', 'source': 'projects', 'status': 'running', 'active': True,
+           'created_at': now, 'heartbeat_at': now}
+    assert await storage.insert_job(job)
+    assert not await storage.insert_job({**job, '_id': 'job-2'})
+    assert await storage.insert_job({**job, '_id': 'job-3', 'source': 'videos'})
+    assert (await storage.find_active_job('projects'))['_id'] == 'job-1'
+
+    await storage.finish_job('job-1', {'status': 'succeeded'})
+    assert await storage.find_active_job('projects') is None
+    assert (await storage.get_job('job-1'))['status'] == 'succeeded'
+    assert await storage.insert_job({**job, '_id': 'job-2'})
+
+async def test_rate_limit_reservation_keeps_the_reserve(storage):
+    now = datetime(2025, 1, 1)
+    assert await storage.reserve_rate_limit('github', 5, now) is None
+    await storage.set_fields('rate_limits', 'github', {'remaining': 7, 'reset_at': now + timedelta(hours=1)})
+    assert (await storage.reserve_rate_limit('github', 5, now))['remaining'] == 7
+    assert (await storage.reserve_rate_limit('github', 5, now))['remaining'] == 6
+    assert await storage.reserve_rate_limit('github', 5, now) is None
+
+async def test_lock_is_exclusive_until_released_or_expired(storage):
+    now = datetime(2025, 1, 1)
+    assert await storage.acquire_lock('scheduler', 'a', now, now + timedelta(seconds=30))
+    assert not await storage.acquire_lock('scheduler', 'b', now, now + timedelta(seconds=30))
+    assert await storage.acquire_lock('scheduler', 'b', now + timedelta(seconds=31), now + timedelta(seconds=60))
+    await storage.release_lock('scheduler', 'b')
+    assert await storage.acquire_lock('scheduler', 'a', now + timedelta(seconds=32), now + timedelta(seconds=60))